@@ -0,0 +1,197 @@
+import atexit
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis keys
+PENDING_KEY = "account:last_activity:pending"
+THROTTLE_KEY = "account:last_activity:throttle:{user_id}"
+
+
+# ---------------------------
+# Buffers
+# ---------------------------
+class LocalActivityBuffer:
+    """In-process buffer used when Redis is not configured (dev, tests)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[int, float] = {}
+        self._next_allowed: Dict[int, float] = {}
+
+    def record(self, user_id: int, timestamp: float, throttle_seconds: int) -> bool:
+        with self._lock:
+            if self._next_allowed.get(user_id, 0) > timestamp:
+                return False
+            self._next_allowed[user_id] = timestamp + throttle_seconds
+            self._pending[user_id] = timestamp
+            return True
+
+    def drain(self) -> Dict[int, float]:
+        now = time.time()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._next_allowed = {
+                user_id: until for user_id, until in self._next_allowed.items() if until > now
+            }
+        return pending
+
+
+class RedisActivityBuffer:
+    """Buffer shared by every worker: a throttle key per user plus one pending hash."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def record(self, user_id: int, timestamp: float, throttle_seconds: int) -> bool:
+        claimed = self.client.set(
+            THROTTLE_KEY.format(user_id=user_id), 1, nx=True, ex=max(throttle_seconds, 1)
+        )
+        if not claimed:
+            return False
+        self.client.hset(PENDING_KEY, user_id, timestamp)
+        return True
+
+    def drain(self) -> Dict[int, float]:
+        # RENAME is atomic, so writes that land while we read go to a fresh hash.
+        draining = f"{PENDING_KEY}:draining:{uuid.uuid4().hex}"
+        try:
+            self.client.rename(PENDING_KEY, draining)
+        except Exception:
+            # ResponseError "no such key": nothing to flush
+            return {}
+
+        pipe = self.client.pipeline()
+        pipe.hgetall(draining)
+        pipe.delete(draining)
+        data, _ = pipe.execute()
+        return {int(user_id): float(ts) for user_id, ts in data.items()}
+
+
+# ---------------------------
+# Tracker
+# ---------------------------
+class LastActivityTracker:
+    """
+    Records user activity without touching the database on the request path.
+
+    Each user is recorded at most once per ``throttle_seconds``; buffered
+    timestamps are written back by ``flush()`` with a bulk UPDATE that does
+    not fire ``post_save`` signals.
+    """
+
+    def __init__(self, buffer=None, throttle_seconds: int = None, flush_interval: int = None):
+        self.buffer = buffer or LocalActivityBuffer()
+        self.throttle_seconds = (
+            throttle_seconds if throttle_seconds is not None
+            else getattr(settings, "LAST_ACTIVITY_THROTTLE_SECONDS", 60)
+        )
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else getattr(settings, "LAST_ACTIVITY_FLUSH_INTERVAL", 30)
+        )
+        self._flusher: Optional[threading.Thread] = None
+        self._database_name: Optional[str] = None
+        self._flusher_lock = threading.Lock()
+
+    def record(self, user_id: int, when: datetime = None) -> bool:
+        """Buffer an activity timestamp. Returns False when throttled."""
+        timestamp = when.timestamp() if when else time.time()
+        try:
+            recorded = self.buffer.record(user_id, timestamp, self.throttle_seconds)
+        except Exception:
+            logger.exception("Failed to record last activity for user %s", user_id)
+            return False
+
+        if recorded:
+            self._ensure_flusher()
+        return recorded
+
+    def flush(self, batch_size: int = 500) -> int:
+        """Write buffered timestamps to the database. Returns rows written."""
+        pending = self.buffer.drain()
+        if not pending:
+            return 0
+
+        User = get_user_model()
+        users = [
+            User(pk=user_id, last_activity=datetime.fromtimestamp(ts, tz=dt_timezone.utc))
+            for user_id, ts in pending.items()
+        ]
+        User.objects.bulk_update(users, ["last_activity"], batch_size=batch_size)
+        logger.info("Flushed last activity for %d users", len(users))
+        return len(users)
+
+    # Background flusher
+    def _ensure_flusher(self) -> None:
+        if self.flush_interval <= 0 or self._flusher is not None:
+            return
+        with self._flusher_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="last-activity-flusher", daemon=True
+            )
+            self._flusher.start()
+            self._database_name = connection.settings_dict.get("NAME")
+            atexit.register(self._flush_at_exit)
+
+    def _run_flusher(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self._safe_flush()
+
+    def _safe_flush(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Last activity flush failed")
+        finally:
+            connection.close()
+
+    def _flush_at_exit(self) -> None:
+        """
+        Final flush at interpreter exit.
+
+        By then Django may have torn the database down (a test run destroys
+        its database and points the connection back at the real one), so the
+        buffer is dropped unless the original database is still reachable.
+        """
+        if connection.settings_dict.get("NAME") != self._database_name:
+            return
+        try:
+            connection.ensure_connection()
+            usable = connection.is_usable()
+        except Exception:
+            usable = False
+        if not usable:
+            logger.debug("Database unavailable at exit; dropping buffered last activity")
+            return
+        self._safe_flush()
+
+
+_tracker: Optional[LastActivityTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_activity_tracker() -> LastActivityTracker:
+    """Return the per-process tracker, backed by Redis when configured."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                client = get_redis_client()
+                buffer = RedisActivityBuffer(client) if client is not None else LocalActivityBuffer()
+                _tracker = LastActivityTracker(buffer=buffer)
+    return _tracker
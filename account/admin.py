@@ -1,9 +1,22 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from core.pagination import EstimatedCountAdminMixin
+from .models import User, UserProfile, OutboundEmail, OutboundSms, AccountDeletion, DataExport, SearchToken
+from .search import IndexedSearchAdminMixin
+
+
+class UserProfileInline(admin.StackedInline):
+    model = UserProfile
+    can_delete = False
+    fieldsets = (
+        (None, {"fields": ("bio",)}),
+        ("Company & Bank Info", {"fields": ("company_name", "cvr_number", "bank_name", "account_number", "iban", "swift_ibc")}),
+        ("Financial", {"fields": ("hourly_rate", "profit_on_materials", "risk_margin")}),
+    )
+
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(IndexedSearchAdminMixin, EstimatedCountAdminMixin, BaseUserAdmin):
     # Fields to display in the admin list view
     list_display = (
         "user_id",
@@ -20,19 +33,71 @@ class UserAdmin(BaseUserAdmin):
     # Fields to filter by in the admin
     list_filter = ("is_verified", "is_staff", "is_superuser", "created_at")
 
-    # Fields searchable in admin
-    search_fields = ("email", "username", "full_name", "phone", "company_name")
+    # Fields searchable in admin (answered from the search index, see account.search)
+    search_fields = ("email", "username", "full_name", "phone", "profile__company_name")
+    search_kind = SearchToken.KIND_USER
 
     # Fields used when creating/updating a user in admin
     fieldsets = (
         (None, {"fields": ("email", "username", "full_name", "phone", "profile_pic", "profile_pic_url", "country")}),
-        ("Verification", {"fields": ("otp", "otp_expired", "is_verified")}),
+        ("Verification", {"fields": ("is_verified",)}),
         ("Permissions", {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")}),
-        ("Company & Bank Info", {"fields": ("company_name", "cvr_number", "bank_name", "account_number", "iban", "swift_ibc")}),
-        ("Financial", {"fields": ("hourly_rate", "profit_on_materials", "risk_margin")}),
         ("Timestamps", {"fields": ("created_at", "updated_at")}),
     )
 
     readonly_fields = ("created_at", "updated_at")
+    # Company, banking and pricing details (UserProfile)
+    inlines = (UserProfileInline,)
 
     ordering = ("-created_at",)
+
+    # Deleting a user deactivates it and queues the cascade (account.deletion)
+    def delete_model(self, request, obj):
+        from .deletion import request_account_deletion
+
+        request_account_deletion(obj, requested_by=request.user)
+
+    def delete_queryset(self, request, queryset):
+        from .deletion import request_account_deletion
+
+        for user in queryset:
+            request_account_deletion(user, requested_by=request.user)
+        self.message_user(request, "The selected accounts were deactivated; their data is being deleted in the background.")
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("to", "subject", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("to",)
+    readonly_fields = ("created_at", "sent_at", "last_error")
+
+
+@admin.register(OutboundSms)
+class OutboundSmsAdmin(admin.ModelAdmin):
+    list_display = ("phone", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("phone",)
+    readonly_fields = ("created_at", "sent_at", "last_error", "message_id")
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = ("user_id", "email", "status", "rows_deleted", "attempts", "created_at", "finished_at")
+    list_filter = ("status",)
+    search_fields = ("email",)
+    readonly_fields = (
+        "user_id", "email", "requested_by", "status", "progress", "rows_deleted",
+        "attempts", "last_error", "created_at", "started_at", "finished_at",
+    )
+
+
+@admin.register(DataExport)
+class DataExportAdmin(admin.ModelAdmin):
+    list_display = ("user_id", "status", "file_size", "created_at", "finished_at", "expires_at")
+    list_filter = ("status",)
+    exclude = ("token",)
+    readonly_fields = (
+        "user_id", "requested_by", "status", "file_name", "file_size", "row_counts",
+        "last_error", "created_at", "started_at", "finished_at", "expires_at",
+    )
@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis keys (HyperLogLog)
+MINUTE_KEY = "analytics:active:m:{bucket}"
+DAY_KEY = "analytics:active:d:{bucket}"
+
+ONLINE_WINDOW_MINUTES = 5
+MINUTE_KEY_TTL = (ONLINE_WINDOW_MINUTES + 5) * 60
+DAY_KEY_TTL = 32 * 24 * 3600
+
+
+# ---------------------------
+# In-process HyperLogLog
+# ---------------------------
+class HyperLogLog:
+    """
+    Fixed-size distinct counter (``2 ** precision`` one-byte registers).
+
+    Precision 14 uses 16 KB and has ~0.8% standard error, matching Redis.
+    """
+
+    def __init__(self, precision: int = 14):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self.alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add(self, item) -> None:
+        x = int.from_bytes(hashlib.sha1(str(item).encode()).digest()[:8], "big")
+        index = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        estimate = self.alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)  # linear counting for small sets
+        return int(round(estimate))
+
+
+class LocalSketchStore:
+    """In-process stand-in for Redis PFADD/PFCOUNT with key expiry (dev, tests)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sketches: Dict[str, Tuple[HyperLogLog, float]] = {}
+
+    def add(self, entries: Iterable[Tuple[str, int]], member) -> None:
+        now = time.time()
+        with self._lock:
+            for key, ttl in entries:
+                sketch, _ = self._sketches.get(key) or (HyperLogLog(), 0)
+                sketch.add(member)
+                self._sketches[key] = (sketch, now + ttl)
+            self._purge(now)
+
+    def count(self, key_groups: List[List[str]]) -> List[int]:
+        now = time.time()
+        results = []
+        with self._lock:
+            for keys in key_groups:
+                union = HyperLogLog()
+                for key in keys:
+                    entry = self._sketches.get(key)
+                    if entry and entry[1] > now:
+                        union.merge(entry[0])
+                results.append(union.count())
+        return results
+
+    def _purge(self, now: float) -> None:
+        expired = [key for key, (_, expires_at) in self._sketches.items() if expires_at <= now]
+        for key in expired:
+            del self._sketches[key]
+
+
+class RedisSketchStore:
+    """Redis HyperLogLogs shared by every worker."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def add(self, entries: Iterable[Tuple[str, int]], member) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for key, ttl in entries:
+            pipe.pfadd(key, member)
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+    def count(self, key_groups: List[List[str]]) -> List[int]:
+        pipe = self.client.pipeline(transaction=False)
+        for keys in key_groups:
+            pipe.pfcount(*keys)
+        return [int(n) for n in pipe.execute()]
+
+
+# ---------------------------
+# Analytics
+# ---------------------------
+def _minute_bucket(when: datetime) -> str:
+    return when.strftime("%Y%m%d%H%M")
+
+
+def _day_bucket(when: datetime) -> str:
+    return when.strftime("%Y%m%d")
+
+
+class ActivityAnalytics:
+    """
+    Approximate distinct active users per minute and per day (UTC).
+
+    Recording is two HyperLogLog adds; every stat is a fixed number of
+    sketch reads, independent of user count, and never touches the database.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or LocalSketchStore()
+
+    def record(self, user_id: int, when: datetime = None) -> None:
+        when = when or datetime.now(dt_timezone.utc)
+        try:
+            self.store.add(
+                [
+                    (MINUTE_KEY.format(bucket=_minute_bucket(when)), MINUTE_KEY_TTL),
+                    (DAY_KEY.format(bucket=_day_bucket(when)), DAY_KEY_TTL),
+                ],
+                user_id,
+            )
+        except Exception:
+            logger.exception("Failed to record activity analytics for user %s", user_id)
+
+    def stats(self, now: datetime = None) -> Dict[str, int]:
+        now = now or datetime.now(dt_timezone.utc)
+        minutes = [
+            MINUTE_KEY.format(bucket=_minute_bucket(now - timedelta(minutes=i)))
+            for i in range(ONLINE_WINDOW_MINUTES)
+        ]
+        days = [DAY_KEY.format(bucket=_day_bucket(now - timedelta(days=i))) for i in range(30)]
+        online, dau, wau, mau = self.store.count([minutes, days[:1], days[:7], days])
+        return {
+            "online_now": online,
+            "daily_active_users": dau,
+            "weekly_active_users": wau,
+            "monthly_active_users": mau,
+        }
+
+
+_analytics: Optional[ActivityAnalytics] = None
+_analytics_lock = threading.Lock()
+
+
+def get_activity_analytics() -> ActivityAnalytics:
+    """Return the per-process analytics, backed by Redis when configured."""
+    global _analytics
+    if _analytics is None:
+        with _analytics_lock:
+            if _analytics is None:
+                client = get_redis_client()
+                store = RedisSketchStore(client) if client is not None else LocalSketchStore()
+                _analytics = ActivityAnalytics(store=store)
+    return _analytics
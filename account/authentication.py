@@ -0,0 +1,113 @@
+import uuid
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+# Cache keys
+AUTH_USER_CACHE_KEY = "auth:user:{user_id}"
+AUTH_USER_VERSION_KEY = "auth:user:{user_id}:version"
+
+# Columns kept in the cache; everything else on request.user is deferred
+# and loaded from the DB only if a view actually reads it.
+AUTH_USER_FIELDS = ("user_id", "email", "is_active", "is_staff", "is_superuser", "is_verified")
+
+# Saving any of these invalidates the cached entry
+AUTH_INVALIDATING_FIELDS = ("is_active", "is_staff", "is_superuser", "is_verified", "email", "password")
+
+
+def _keys(user_id) -> tuple:
+    return (
+        AUTH_USER_CACHE_KEY.format(user_id=user_id),
+        AUTH_USER_VERSION_KEY.format(user_id=user_id),
+    )
+
+
+def bump_auth_version(user_id) -> None:
+    """
+    Invalidate the cached auth entry for ``user_id``.
+
+    Versions are random tokens rather than counters, so an evicted version key
+    can never come back with a value an old entry was stored under.
+    """
+    _, version_key = _keys(user_id)
+    cache.set(version_key, uuid.uuid4().hex, None)
+
+
+def _current_version(version_key: str) -> str:
+    version = uuid.uuid4().hex
+    if cache.add(version_key, version, None):
+        return version
+    return cache.get(version_key) or version
+
+
+def _build_user(values: Dict[str, Any]):
+    """A User instance with only the auth columns loaded."""
+    # from_db expects values in concrete field order
+    names = [f.attname for f in User._meta.concrete_fields if f.attname in values]
+    db = router.db_for_read(User)
+    user = User.from_db(db, names, [values[name] for name in names])
+    user._load_deferred_together = True
+    return user
+
+
+def load_auth_user(user_id) -> Optional[Any]:
+    """
+    Resolve ``user_id`` to a User with one cache round-trip on a hit.
+
+    The entry stores the version it was built for; a mismatch (or a missing
+    entry) falls back to a single narrow DB query and refills the cache.
+    """
+    entry_key, version_key = _keys(user_id)
+    found = cache.get_many([entry_key, version_key])
+    entry, version = found.get(entry_key), found.get(version_key)
+    if entry is not None and version is not None and entry["version"] == version:
+        return _build_user(entry["fields"])
+
+    if version is None:
+        version = _current_version(version_key)
+    values = (
+        User._base_manager.filter(**{api_settings.USER_ID_FIELD: user_id})
+        .values(*AUTH_USER_FIELDS)
+        .first()
+    )
+    if values is None:
+        return None
+    cache.set(entry_key, {"version": version, "fields": values}, settings.AUTH_USER_CACHE_TTL)
+    return _build_user(values)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that identifies the caller from a versioned cache entry.
+
+    Only the columns auth and permissions need are cached; user saves that
+    touch them bump the user's version (see ``account.signals``).
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares the password hash, which is never cached
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = load_auth_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
@@ -1,6 +1,5 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
 
 User = get_user_model()
 
@@ -14,9 +13,7 @@ class EmailPhoneUsernameBackend(ModelBackend):
             return None
 
         try:
-            user = User.objects.get(
-                Q(email__iexact=username) | Q(phone=username) | Q(username__iexact=username)
-            )
+            user = User.objects.get_by_identifier(username)
         except User.DoesNotExist:
             return None
 
@@ -0,0 +1,243 @@
+import csv
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils.dateparse import parse_datetime
+
+from . import search
+from .models import UserProfile
+
+User = get_user_model()
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+FORMATS = (FORMAT_CSV, FORMAT_NDJSON)
+
+# Columns written by export_users and accepted by import_users
+EXPORT_FIELDS = (
+    "user_id",
+    "email",
+    "phone",
+    "username",
+    "full_name",
+    "country",
+    "bio",
+    "company_name",
+    "is_verified",
+    "is_active",
+    "created_at",
+)
+IMPORT_FIELDS = tuple(f for f in EXPORT_FIELDS if f != "user_id")
+# Of those, the columns stored on UserProfile
+PROFILE_EXPORT_FIELDS = ("bio", "company_name")
+BOOLEAN_FIELDS = ("is_verified", "is_active")
+
+# Same shape as the User.phone validator
+PHONE_RE = re.compile(r"^\+?\d{9,15}$")
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        return fmt
+    return FORMAT_NDJSON if path.endswith((".ndjson", ".jsonl")) else FORMAT_CSV
+
+
+# ---------------------------
+# Export
+# ---------------------------
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def user_export_queryset(queryset):
+    """Users with their profile columns joined in under the flat export names."""
+    return queryset.annotate(**{name: F(f"profile__{name}") for name in PROFILE_EXPORT_FIELDS})
+
+
+def iter_export_rows(queryset, fields=EXPORT_FIELDS, chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+    """Stream users as plain dicts, ``chunk_size`` rows per DB fetch."""
+    for row in queryset.order_by("pk").values(*fields).iterator(chunk_size=chunk_size):
+        yield {name: _plain(value) for name, value in row.items()}
+
+
+def write_rows(stream, rows: Iterable[Dict[str, Any]], fmt: str, fields=EXPORT_FIELDS) -> int:
+    written = 0
+    if fmt == FORMAT_CSV:
+        writer = csv.DictWriter(stream, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps(row) + "\n")
+            written += 1
+    return written
+
+
+# ---------------------------
+# Import
+# ---------------------------
+def read_rows(stream, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per input record without loading the whole file."""
+    if fmt == FORMAT_CSV:
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def clean_row(row: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Normalize one input record into User field values.
+
+    Returns ``(values, raw_password)``; raises ValueError for unusable rows.
+    """
+    values = {}
+    for name in IMPORT_FIELDS:
+        value = row.get(name)
+        if value in ("", None):
+            continue
+        values[name] = _to_bool(value) if name in BOOLEAN_FIELDS else value
+
+    if "email" in values:
+        values["email"] = User.objects.normalize_email(values["email"].strip())
+    if "phone" in values and not PHONE_RE.match(str(values["phone"])):
+        raise ValueError(f"invalid phone {values['phone']!r}")
+    if not any(values.get(f) for f in ("email", "phone", "username")):
+        raise ValueError("no email, phone or username")
+    if "created_at" in values:
+        created_at = parse_datetime(str(values["created_at"]))
+        if created_at is None:
+            raise ValueError(f"invalid created_at {values['created_at']!r}")
+        values["created_at"] = created_at
+    values.setdefault("full_name", "")
+
+    if row.get("password_hash"):
+        values["password"] = row["password_hash"]
+        return values, None
+    return values, row.get("password") or None
+
+
+class UserImporter:
+    """
+    Chunked user import.
+
+    Each chunk skips identifiers that already exist (one query per unique
+    column; emails and usernames compare case-insensitively, as at login),
+    hashes plain passwords on a process pool and inserts with a single
+    ``bulk_create``. ``bulk_create`` sends no model signals, so the
+    per-row counter updates in ``account.signals`` don't run; call
+    ``counters.reconcile()`` once when the import is done. New users are
+    added to the admin search index chunk by chunk.
+    """
+
+    UNIQUE_FIELDS = ("email", "phone", "username")
+    CASE_INSENSITIVE_FIELDS = ("email", "username")
+
+    def __init__(self, chunk_size: int = 2000, workers: int = None):
+        self.chunk_size = chunk_size
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.created = 0
+        self.skipped = 0
+        self.errors: List[str] = []
+
+    def close(self) -> None:
+        self.pool.shutdown()
+
+    def run(self, rows: Iterable[Dict[str, Any]]) -> None:
+        chunk = []
+        for line_no, row in enumerate(rows, start=1):
+            try:
+                chunk.append(clean_row(row))
+            except ValueError as exc:
+                self.errors.append(f"record {line_no}: {exc}")
+                continue
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+
+    @classmethod
+    def _key(cls, field, value):
+        # login matches emails and usernames case-insensitively
+        # (UserManager.get_by_identifier), so duplicates must too
+        return str(value).lower() if field in cls.CASE_INSENSITIVE_FIELDS else value
+
+    def _existing(self, field, wanted):
+        if not wanted:
+            return set()
+        if field not in self.CASE_INSENSITIVE_FIELDS:
+            return set(User.objects.filter(**{f"{field}__in": wanted}).values_list(field, flat=True))
+        # lower(email) / lower(username) use the functional indexes
+        return set(
+            User.objects.annotate(key=Lower(field)).filter(key__in=wanted).values_list("key", flat=True)
+        )
+
+    def _drop_existing(self, chunk):
+        fresh = []
+        seen = {field: set() for field in self.UNIQUE_FIELDS}
+        existing = {
+            field: self._existing(
+                field, {self._key(field, values[field]) for values, _ in chunk if values.get(field)}
+            )
+            for field in self.UNIQUE_FIELDS
+        }
+
+        for values, password in chunk:
+            keys = {f: self._key(f, values[f]) for f in self.UNIQUE_FIELDS if values.get(f)}
+            if any(v in existing[f] or v in seen[f] for f, v in keys.items()):
+                self.skipped += 1
+                continue
+            for f, v in keys.items():
+                seen[f].add(v)
+            fresh.append((values, password))
+        return fresh
+
+    def _import_chunk(self, chunk) -> None:
+        chunk = self._drop_existing(chunk)
+        if not chunk:
+            return
+
+        to_hash = [password for _, password in chunk if password]
+        hashed = iter(self.pool.map(make_password, to_hash, chunksize=64))
+
+        users, profiles = [], []
+        for values, password in chunk:
+            if password:
+                values["password"] = next(hashed)
+            elif "password" not in values:
+                values["password"] = make_password(None)  # unusable
+            profiles.append({f: values.pop(f) for f in PROFILE_EXPORT_FIELDS if f in values})
+            users.append(User(**values))
+
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=self.chunk_size)
+            UserProfile.objects.bulk_create(
+                [UserProfile(user=user, **values) for user, values in zip(users, profiles) if values],
+                batch_size=self.chunk_size,
+            )
+            search.index_users(user.pk for user in users)
+        self.created += len(users)
@@ -0,0 +1,96 @@
+from decimal import Decimal
+from typing import Dict
+
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Counter names
+TOTAL_USERS = "total_users"
+TOTAL_VERIFIED = "total_verified"
+TOTAL_UNVERIFIED = "total_unverified"
+TOTAL_EARNINGS = "total_earnings"  # cents
+
+COUNTER_NAMES = (TOTAL_USERS, TOTAL_VERIFIED, TOTAL_UNVERIFIED, TOTAL_EARNINGS)
+
+
+def to_cents(amount) -> int:
+    """Convert a price to integer cents."""
+    return int((Decimal(amount or 0) * 100).to_integral_value())
+
+
+def from_cents(cents: int) -> Decimal:
+    return (Decimal(cents) / 100).quantize(Decimal("0.01"))
+
+
+def apply_deltas(deltas: Dict[str, int]) -> None:
+    """Atomically add each delta to its counter (one UPDATE per non-zero delta)."""
+    from .models import DashboardCounter
+
+    for name, delta in deltas.items():
+        if not delta:
+            continue
+        counter = DashboardCounter.objects.filter(name=name)
+        if not counter.update(value=F("value") + delta, updated_at=timezone.now()):
+            # Counter row missing (fresh database): create it, reconciliation fixes the value.
+            DashboardCounter.objects.get_or_create(name=name)
+            counter.update(value=F("value") + delta, updated_at=timezone.now())
+
+
+def get_counters() -> Dict[str, int]:
+    """Return every counter in a single query; missing counters read as 0."""
+    from .models import DashboardCounter
+
+    values = dict(
+        DashboardCounter.objects.filter(name__in=COUNTER_NAMES).values_list("name", "value")
+    )
+    return {name: values.get(name, 0) for name in COUNTER_NAMES}
+
+
+def compute_counters() -> Dict[str, int]:
+    """Recompute every counter from the source tables (expensive, reconciliation only)."""
+    from django.contrib.auth import get_user_model
+    from subscription.models import UserSubscription
+
+    User = get_user_model()
+    totals = User.objects.aggregate(
+        total=models.Count("pk"),
+        verified=models.Count("pk", filter=models.Q(is_verified=True)),
+    )
+    earnings = UserSubscription.objects.filter(active=True).aggregate(
+        total=models.Sum("plan__price")
+    )["total"]
+
+    return {
+        TOTAL_USERS: totals["total"],
+        TOTAL_VERIFIED: totals["verified"],
+        TOTAL_UNVERIFIED: totals["total"] - totals["verified"],
+        TOTAL_EARNINGS: to_cents(earnings),
+    }
+
+
+@transaction.atomic
+def reconcile() -> Dict[str, Dict[str, int]]:
+    """
+    Overwrite the counters with freshly computed values.
+
+    Counter rows are locked first, so deltas from concurrent saves either land
+    before the recount (and are included in it) or wait and apply on top.
+    Returns ``{name: {"before": .., "after": ..}}`` for counters that drifted.
+    """
+    from .models import DashboardCounter
+
+    for name in COUNTER_NAMES:
+        DashboardCounter.objects.get_or_create(name=name)
+    before = dict(
+        DashboardCounter.objects.select_for_update()
+        .filter(name__in=COUNTER_NAMES)
+        .values_list("name", "value")
+    )
+
+    drift = {}
+    for name, value in compute_counters().items():
+        if before.get(name) != value:
+            DashboardCounter.objects.filter(name=name).update(value=value, updated_at=timezone.now())
+            drift[name] = {"before": before.get(name), "after": value}
+    return drift
@@ -0,0 +1,155 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, router, transaction
+from django.utils import timezone
+
+from . import counters
+from .authentication import bump_auth_version
+from .models import AccountDeletion
+from .presence import get_presence
+
+logger = logging.getLogger(__name__)
+
+# Rows removed in batches before the user row itself: (progress label, model, FK to the user)
+DELETION_STEPS = (
+    ("resources", "supplychain.Resource", "supervisor_id"),
+    ("suppliers", "supplychain.Supplier", "supervisor_id"),
+    ("share_thoughts", "privacy.ShareThoughts", "user_id"),
+    ("subscriptions", "subscription.UserSubscription", "user_id"),
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # One worker: deletions run one at a time so they never compete with each other for locks.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="account-deletion")
+    return _executor
+
+
+# ---------------------------
+# Requesting
+# ---------------------------
+def request_account_deletion(user, requested_by=None) -> AccountDeletion:
+    """
+    Deactivate ``user`` now and queue the removal of their data.
+
+    Cached tokens stop working as soon as the transaction commits; rows are
+    deleted afterwards by the background worker. Returns the existing job if
+    one is already queued or running for this user.
+    """
+    User = get_user_model()
+    with transaction.atomic():
+        job = AccountDeletion.objects.filter(
+            user_id=user.pk, status__in=[AccountDeletion.PENDING, AccountDeletion.RUNNING]
+        ).first()
+        if job is not None:
+            return job
+
+        # update() skips the post_save handlers; auth and presence are handled below.
+        User._base_manager.filter(pk=user.pk).update(is_active=False)
+        job = AccountDeletion.objects.create(
+            user_id=user.pk,
+            email=user.email,
+            requested_by=getattr(requested_by, "pk", requested_by),
+        )
+
+    user_id, job_id = user.pk, job.pk
+
+    def after_commit():
+        bump_auth_version(user_id)
+        get_presence().remove(user_id)
+        _get_executor().submit(_run, job_id)
+
+    transaction.on_commit(after_commit)
+    return job
+
+
+# ---------------------------
+# Running
+# ---------------------------
+def _delete_batch(model, field: str, user_id: int, batch_size: int) -> int:
+    pks = list(
+        model._base_manager.filter(**{field: user_id}).order_by("pk").values_list("pk", flat=True)[:batch_size]
+    )
+    if not pks:
+        return 0
+    # Plain DELETE ... WHERE pk IN (...): no per-row signals or cascade
+    # collection. The dashboard counters are reconciled once at the end.
+    with transaction.atomic():
+        return model._base_manager.filter(pk__in=pks)._raw_delete(router.db_for_write(model))
+
+
+def run_account_deletion(job_id: int, batch_size: int = None, resume: bool = False) -> Optional[AccountDeletion]:
+    """
+    Work off one deletion job. Returns the job, or None if it was not claimable.
+
+    Each batch commits on its own, so locks are held briefly and an
+    interrupted job can be resumed (``resume=True`` also claims RUNNING jobs).
+    """
+    batch_size = batch_size or settings.ACCOUNT_DELETION_BATCH_SIZE
+    claimable = [AccountDeletion.PENDING, AccountDeletion.FAILED]
+    if resume:
+        claimable.append(AccountDeletion.RUNNING)
+
+    claimed = AccountDeletion.objects.filter(pk=job_id, status__in=claimable).update(
+        status=AccountDeletion.RUNNING, started_at=timezone.now(), last_error=None
+    )
+    if not claimed:
+        return None
+
+    job = AccountDeletion.objects.get(pk=job_id)
+    AccountDeletion.objects.filter(pk=job_id).update(attempts=job.attempts + 1)
+    try:
+        for label, model_label, field in DELETION_STEPS:
+            model = apps.get_model(model_label)
+            while True:
+                deleted = _delete_batch(model, field, job.user_id, batch_size)
+                if not deleted:
+                    break
+                job.progress[label] = job.progress.get(label, 0) + deleted
+                job.rows_deleted += deleted
+                AccountDeletion.objects.filter(pk=job_id).update(
+                    progress=job.progress, rows_deleted=job.rows_deleted
+                )
+
+        User = get_user_model()
+        user = User._base_manager.filter(pk=job.user_id).first()
+        if user is not None:
+            user.delete()  # dependents are gone; the remaining cascade is tiny
+            job.progress["user"] = 1
+            job.rows_deleted += 1
+
+        counters.reconcile()
+    except Exception as exc:
+        logger.exception("Account deletion %s failed", job_id)
+        AccountDeletion.objects.filter(pk=job_id).update(
+            status=AccountDeletion.FAILED, last_error=str(exc), progress=job.progress,
+            rows_deleted=job.rows_deleted,
+        )
+        raise
+
+    AccountDeletion.objects.filter(pk=job_id).update(
+        status=AccountDeletion.DONE, progress=job.progress, rows_deleted=job.rows_deleted,
+        finished_at=timezone.now(),
+    )
+    job.refresh_from_db()
+    logger.info("Deleted user %s (%d rows)", job.user_id, job.rows_deleted)
+    return job
+
+
+def _run(job_id: int) -> None:
+    close_old_connections()
+    try:
+        run_account_deletion(job_id)
+    except Exception:
+        pass  # logged and recorded on the job; process_account_deletions retries it
+    finally:
+        close_old_connections()
@@ -0,0 +1,88 @@
+import uuid
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import RawJSON
+
+# Cache keys
+USER_DOCUMENT_KEY = "user:document:{user_id}"
+USER_DOCUMENT_VERSION_KEY = "user:document:{user_id}:version"
+# Bumped when any plan changes, since every subscriber's document embeds plan data
+PLANS_VERSION_KEY = "user:document:plans:version"
+
+# User saves limited to these columns leave the document unchanged
+USER_DOCUMENT_IGNORED_FIELDS = ("last_login", "last_activity", "password")
+
+
+def _keys(user_id) -> tuple:
+    return (
+        USER_DOCUMENT_KEY.format(user_id=user_id),
+        USER_DOCUMENT_VERSION_KEY.format(user_id=user_id),
+        PLANS_VERSION_KEY,
+    )
+
+
+def bump_user_document(user_id) -> None:
+    """Invalidate the cached document of ``user_id`` (random token, see bump_auth_version)."""
+    cache.set(USER_DOCUMENT_VERSION_KEY.format(user_id=user_id), uuid.uuid4().hex, None)
+
+
+def bump_plans_version() -> None:
+    """Invalidate every cached user document at once."""
+    cache.set(PLANS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _current_version(version_key: str, known: Optional[str]) -> str:
+    if known is not None:
+        return known
+    version = uuid.uuid4().hex
+    if cache.add(version_key, version, None):
+        return version
+    return cache.get(version_key) or version
+
+
+def render_user_document(user_id) -> Optional[bytes]:
+    """Serialize a freshly loaded user (two queries: user + profile, subscriptions)."""
+    from .serializers import UserSerializer, subscriptions_prefetch
+
+    user = (
+        get_user_model().objects.select_related("profile")
+        .prefetch_related(subscriptions_prefetch())
+        .filter(pk=user_id)
+        .first()
+    )
+    if user is None:
+        return None
+    return JSONRenderer().render(UserSerializer(user).data)
+
+
+def get_user_document(user) -> Optional[RawJSON]:
+    """
+    ``UserSerializer(user).data`` as pre-rendered JSON, from one cache round-trip on a hit.
+
+    Entries store the (user, plans) versions they were rendered for; user,
+    profile and subscription saves bump the user's version and plan saves the
+    shared one (see ``account.signals``), so a stale entry is never served.
+    """
+    entry_key, version_key, plans_key = _keys(user.pk)
+    found = cache.get_many([entry_key, version_key, plans_key])
+    entry = found.get(entry_key)
+    version = (found.get(version_key), found.get(plans_key))
+    if entry is not None and None not in version and entry["version"] == version:
+        return RawJSON(entry["content"])
+
+    # Versions are read before the user is loaded, so a save that lands in
+    # between leaves this entry already stale.
+    version = (
+        _current_version(version_key, version[0]),
+        _current_version(plans_key, version[1]),
+    )
+    content = render_user_document(user.pk)
+    if content is None:
+        return None
+    cache.set(entry_key, {"version": version, "content": content}, settings.USER_DOCUMENT_CACHE_TTL)
+    return RawJSON(content)
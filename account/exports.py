@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import secrets
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .bulk import iter_export_rows
+from .models import DataExport
+
+logger = logging.getLogger(__name__)
+
+# Never exported
+EXCLUDED_USER_FIELDS = ("password",)
+
+# Files in the archive: (name, model, FK to the user, fields or None for every column)
+EXPORT_SETS = (
+    ("profile_details.ndjson", "account.UserProfile", "user_id", None),
+    ("suppliers.ndjson", "supplychain.Supplier", "supervisor_id", None),
+    ("resources.ndjson", "supplychain.Resource", "supervisor_id", None),
+    (
+        "subscriptions.ndjson",
+        "subscription.UserSubscription",
+        "user_id",
+        ("id", "plan__name", "plan__price", "start_date", "end_date", "active", "created_at"),
+    ),
+    ("share_thoughts.ndjson", "privacy.ShareThoughts", "user_id", None),
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="data-export")
+    return _executor
+
+
+def _columns(model, exclude=()) -> tuple:
+    return tuple(f.attname for f in model._meta.concrete_fields if f.attname not in exclude)
+
+
+def _to_json(row) -> str:
+    # MultiSelectField values come back as lists; anything else unusual as str
+    return json.dumps(row, default=lambda value: list(value) if isinstance(value, (set, tuple)) else str(value))
+
+
+def export_path(export: DataExport) -> str:
+    return os.path.join(settings.DATA_EXPORT_ROOT, export.file_name)
+
+
+# ---------------------------
+# Building
+# ---------------------------
+def write_archive(user_id: int, path: str, chunk_size: int = 2000) -> Dict[str, int]:
+    """
+    Write the user's data to ``path`` as a zip of NDJSON files.
+
+    Each related set is read with ``iterator()`` and written line by line into
+    a compressed zip entry, so memory use does not grow with the row count.
+    Returns ``{file name: rows}``.
+    """
+    User = get_user_model()
+    counts = {}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        sets = [("profile.ndjson", User, "pk", _columns(User, EXCLUDED_USER_FIELDS))]
+        for name, model_label, field, fields in EXPORT_SETS:
+            model = apps.get_model(model_label)
+            sets.append((name, model, field, fields or _columns(model)))
+
+        for name, model, field, fields in sets:
+            rows = 0
+            queryset = model._base_manager.filter(**{field: user_id})
+            with archive.open(name, "w", force_zip64=True) as entry:
+                for row in iter_export_rows(queryset, fields=fields, chunk_size=chunk_size):
+                    entry.write((_to_json(row) + "\n").encode())
+                    rows += 1
+            counts[name] = rows
+    return counts
+
+
+def claimable_exports():
+    """Pending and failed exports, plus running ones whose lease has expired."""
+    stale = timezone.now() - timedelta(minutes=settings.DATA_EXPORT_LEASE_MINUTES)
+    return DataExport.objects.filter(
+        Q(status__in=[DataExport.PENDING, DataExport.FAILED])
+        | Q(status=DataExport.RUNNING, started_at__lt=stale)
+        | Q(status=DataExport.RUNNING, started_at__isnull=True)
+    )
+
+
+def run_data_export(export_id: int) -> Optional[DataExport]:
+    """
+    Build one export. Returns it, or None if it was not claimable.
+
+    A run that dies mid-way (worker recycled) leaves the export RUNNING; it
+    is claimed again once ``DATA_EXPORT_LEASE_MINUTES`` have passed.
+    """
+    claimed = claimable_exports().filter(pk=export_id).update(
+        status=DataExport.RUNNING, started_at=timezone.now(), last_error=None
+    )
+    if not claimed:
+        return None
+
+    export = DataExport.objects.get(pk=export_id)
+    os.makedirs(settings.DATA_EXPORT_ROOT, exist_ok=True)
+    export.file_name = f"user-{export.user_id}-{export.pk}.zip"
+    path = export_path(export)
+    # per run, so a reclaimed export never writes into a stale run's file
+    partial = f"{path}.{secrets.token_hex(4)}.part"
+    try:
+        counts = write_archive(export.user_id, partial)
+        os.replace(partial, path)
+    except Exception as exc:
+        logger.exception("Data export %s failed", export_id)
+        if os.path.exists(partial):
+            os.remove(partial)
+        DataExport.objects.filter(pk=export_id).update(status=DataExport.FAILED, last_error=str(exc))
+        raise
+
+    now = timezone.now()
+    export.status = DataExport.DONE
+    export.row_counts = counts
+    export.file_size = os.path.getsize(path)
+    export.finished_at = now
+    export.expires_at = now + timedelta(hours=settings.DATA_EXPORT_TTL_HOURS)
+    export.save(update_fields=["status", "file_name", "row_counts", "file_size", "finished_at", "expires_at"])
+    return export
+
+
+def _run(export_id: int) -> None:
+    close_old_connections()
+    try:
+        run_data_export(export_id)
+    except Exception:
+        pass  # logged and recorded on the export; process_data_exports retries it
+    finally:
+        close_old_connections()
+
+
+# ---------------------------
+# Requesting / serving
+# ---------------------------
+def request_data_export(user_id: int, requested_by=None) -> DataExport:
+    """Queue an export; a pending or running one for the same user is reused."""
+    export = DataExport.objects.filter(
+        user_id=user_id, status__in=[DataExport.PENDING, DataExport.RUNNING]
+    ).first()
+    if export is not None:
+        return export
+
+    export = DataExport.objects.create(
+        user_id=user_id,
+        requested_by=getattr(requested_by, "pk", requested_by),
+        token=secrets.token_urlsafe(32),
+    )
+    export_id = export.pk
+    transaction.on_commit(lambda: _get_executor().submit(_run, export_id))
+    return export
+
+
+def get_downloadable(token: str) -> Optional[DataExport]:
+    export = DataExport.objects.filter(token=token, status=DataExport.DONE).first()
+    if export is None or export.expires_at <= timezone.now():
+        return None
+    if not os.path.exists(export_path(export)):
+        return None
+    return export
+
+
+def purge_expired() -> int:
+    """Delete archives past ``expires_at``. Returns how many were removed."""
+    removed = 0
+    expired = DataExport.objects.filter(status=DataExport.DONE, expires_at__lte=timezone.now())
+    for export in expired.exclude(file_name=""):
+        path = export_path(export)
+        if os.path.exists(path):
+            os.remove(path)
+        removed += 1
+    expired.update(file_name="", file_size=0)
+    return removed
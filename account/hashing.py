@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-in requests right now. Please retry shortly."
+    default_code = "hashing_busy"
+
+
+class PasswordHasherPool:
+    """
+    Bounded pool for password hashing (PBKDF2 by default).
+
+    At most ``workers`` hashes run at once, so a login burst cannot take every
+    core from other requests. Callers beyond ``max_pending`` queued hashes get
+    ``HashingBusy`` (503) instead of waiting indefinitely.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HashingBusy()
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+_pool: Optional[PasswordHasherPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_hasher_pool() -> PasswordHasherPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PasswordHasherPool(
+                    workers=settings.PASSWORD_HASHING_WORKERS,
+                    max_pending=settings.PASSWORD_HASHING_MAX_PENDING,
+                )
+    return _pool
+
+
+async def amake_password(raw_password: str) -> str:
+    return await get_hasher_pool().run(hashers.make_password, raw_password)
+
+
+async def acheck_password(user, raw_password: str) -> bool:
+    """
+    Async ``user.check_password`` that hashes on the bounded pool.
+
+    Like the sync version, a hash made with outdated hasher settings is
+    upgraded on success.
+    """
+    needs_upgrade = []
+
+    def check():
+        return hashers.check_password(raw_password, user.password, setter=needs_upgrade.append)
+
+    valid = await get_hasher_pool().run(check)
+    if valid and needs_upgrade:
+        user.password = await amake_password(raw_password)
+        await user.asave(update_fields=["password"])
+    return valid
@@ -0,0 +1,186 @@
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, features
+
+from .documents import bump_user_document
+from .presence import forget_display_row
+
+logger = logging.getLogger(__name__)
+
+# Square derivatives generated for every uploaded profile picture (pixels)
+DERIVATIVE_SIZES = {
+    "avatar": 256,
+    "thumbnail": 64,
+}
+DERIVATIVE_DIR = "profile/derivatives"
+
+if features.check("webp"):
+    DERIVATIVE_FORMAT, DERIVATIVE_EXT = "WEBP", "webp"
+else:
+    DERIVATIVE_FORMAT, DERIVATIVE_EXT = "JPEG", "jpg"
+
+# Pillow releases the GIL while resizing and encoding, so a small thread pool
+# keeps this work off request threads without a separate worker process.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSING_WORKERS, thread_name_prefix="profile-images"
+        )
+    return _executor
+
+
+# ---------------------------
+# Rendering (no Django access)
+# ---------------------------
+def _encode(img: Image.Image, fmt: str, **options) -> bytes:
+    out = BytesIO()
+    img.save(out, format=fmt, **options)
+    return out.getvalue()
+
+
+def strip_metadata(data: bytes) -> Optional[bytes]:
+    """
+    Re-save JPEG/PNG bytes without EXIF or text chunks (GPS, device info).
+
+    JPEGs keep their quantization tables, so pixels are not re-compressed.
+    Returns None for formats left untouched.
+    """
+    with Image.open(BytesIO(data)) as img:
+        if img.format == "JPEG":
+            return _encode(img, "JPEG", quality="keep", optimize=True)
+        if img.format == "PNG":
+            return _encode(img, "PNG", optimize=True)
+    return None
+
+
+def render_derivatives(data: bytes) -> Dict[str, bytes]:
+    """Return ``{size name: encoded bytes}`` for every entry in DERIVATIVE_SIZES."""
+    with Image.open(BytesIO(data)) as img:
+        img.seek(0)  # first frame of animated GIFs
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha and DERIVATIVE_FORMAT == "WEBP" else "RGB")
+
+        rendered = {}
+        for name, size in DERIVATIVE_SIZES.items():
+            thumb = ImageOps.fit(img, (size, size), Image.LANCZOS)
+            rendered[name] = _encode(thumb, DERIVATIVE_FORMAT, quality=80)
+        return rendered
+
+
+# ---------------------------
+# Storage
+# ---------------------------
+def derivative_name(user_id: int, run_id: str, size_name: str) -> str:
+    # Upload names are chosen by users and repeat across accounts, so they
+    # never go into derivative names
+    return f"{DERIVATIVE_DIR}/{user_id}_{run_id}_{size_name}.{DERIVATIVE_EXT}"
+
+
+def delete_files(names) -> None:
+    """Remove files written by this module that no row references any more."""
+    for name in names:
+        try:
+            default_storage.delete(name)
+        except Exception:
+            logger.exception(f"Could not delete profile picture file {name}")
+
+
+def process_profile_picture(user_id: int) -> Dict[str, str]:
+    """
+    Strip metadata from a user's uploaded picture and store its derivatives.
+
+    Returns the ``{size name: storage name}`` mapping saved on the user. If the
+    picture was replaced meanwhile, nothing is recorded and the new files are
+    removed. Only files written by this run, or the user's previous
+    derivatives, are ever deleted.
+    """
+    from .models import User
+
+    row = (
+        User.objects.filter(pk=user_id).values_list("profile_pic", "profile_pic_derivatives").first()
+    )
+    source_name, previous = row or (None, None)
+    if not source_name or source_name == User._meta.get_field("profile_pic").default:
+        return {}
+
+    with default_storage.open(source_name, "rb") as f:
+        data = f.read()
+
+    # The stripped copy gets a new name (storage never overwrites), so the
+    # original stays readable until the row points at the copy.
+    picture_name = source_name
+    stripped = strip_metadata(data)
+    if stripped is not None and stripped != data:
+        picture_name = default_storage.save(source_name, ContentFile(stripped))
+
+    run_id = uuid.uuid4().hex
+    derivatives = {
+        size_name: default_storage.save(derivative_name(user_id, run_id, size_name), ContentFile(content))
+        for size_name, content in render_derivatives(data).items()
+    }
+
+    updated = User.objects.filter(
+        pk=user_id, profile_pic=source_name, profile_pic_derivatives=previous or {}
+    ).update(profile_pic=picture_name, profile_pic_derivatives=derivatives)
+    if not updated:
+        logger.info(f"Profile picture of user {user_id} changed while processing; discarded")
+        discarded = list(derivatives.values())
+        if picture_name != source_name:
+            discarded.append(picture_name)
+        delete_files(discarded)
+        return {}
+    if picture_name != source_name:
+        default_storage.delete(source_name)
+    delete_files((previous or {}).values())
+    # update() sends no post_save
+    forget_display_row(user_id)
+    bump_user_document(user_id)
+    return derivatives
+
+
+def _run(user_id: int) -> None:
+    close_old_connections()
+    try:
+        process_profile_picture(user_id)
+    except Exception:
+        logger.exception(f"Profile picture processing failed for user {user_id}")
+    finally:
+        close_old_connections()
+
+
+def schedule_profile_picture(user_id: int) -> None:
+    """Process the user's picture in the background once the upload commits."""
+    transaction.on_commit(lambda: _get_executor().submit(_run, user_id))
+
+
+def profile_picture_urls(user) -> Tuple[Optional[str], Dict[str, Optional[str]]]:
+    """
+    ``(original URL, {size name: URL})`` for a user.
+
+    Sizes not generated yet (or for external pictures) fall back to the original.
+    """
+    original = None
+    if user.profile_pic and getattr(user.profile_pic, "url", None):
+        original = user.profile_pic.url
+    elif user.profile_pic_url:
+        original = user.profile_pic_url
+
+    derivatives = user.profile_pic_derivatives or {}
+    sizes = {
+        size_name: default_storage.url(derivatives[size_name]) if size_name in derivatives else original
+        for size_name in DERIVATIVE_SIZES
+    }
+    return original, sizes
@@ -0,0 +1,109 @@
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import jwt
+import requests
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+APPLE_JWKS_URL = "https://appleid.apple.com/auth/keys"
+APPLE_ISSUER = "https://appleid.apple.com"
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def fetch_jwks(url: str, timeout=(3.05, 5)) -> Tuple[Dict[str, Any], Optional[int]]:
+    """Download a JWKS document. Returns ``(jwks, max_age)`` from Cache-Control."""
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+    return response.json(), int(match.group(1)) if match else None
+
+
+class JWKSCache:
+    """
+    Process-wide cache of a provider's public signing keys.
+
+    - Keys are kept for the ``max-age`` the provider sends (``default_max_age``
+      otherwise). Once expired, tokens keep verifying against the cached keys
+      while a background thread refetches them.
+    - An unknown ``kid`` (key rotation) triggers a single refetch shared by
+      concurrent callers, at most once per ``min_refresh_interval`` so forged
+      kids cannot be used to hammer the provider.
+    """
+
+    def __init__(self, url: str, fetcher: Callable = None, default_max_age: int = 3600,
+                 min_refresh_interval: int = 60):
+        self.url = url
+        self.fetcher = fetcher or fetch_jwks
+        self.default_max_age = default_max_age
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get_signing_key(self, kid: str):
+        now = time.monotonic()
+        key = self._keys.get(kid)
+        if key is not None:
+            if now >= self._expires_at:
+                self._refresh_in_background()
+            return key
+
+        with self._lock:
+            key = self._keys.get(kid)
+            if key is None and time.monotonic() - self._last_fetch >= self.min_refresh_interval:
+                self._refresh()
+                key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return key
+
+    def decode(self, token: str, **kwargs) -> Dict[str, Any]:
+        """Verify ``token`` against the cached keys and return its claims."""
+        header = jwt.get_unverified_header(token)
+        key = self.get_signing_key(header.get("kid"))
+        return jwt.decode(token, key=key, algorithms=["RS256"], **kwargs)
+
+    # Internals
+    def _refresh(self) -> None:
+        self._last_fetch = time.monotonic()
+        jwks, max_age = self.fetcher(self.url)
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            try:
+                keys[jwk["kid"]] = jwt.PyJWK(jwk).key
+            except (KeyError, jwt.PyJWKError) as e:
+                logger.warning(f"Skipping unusable JWK from {self.url}: {e}")
+        self._keys = keys
+        self._expires_at = time.monotonic() + (max_age if max_age is not None else self.default_max_age)
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            recently_fetched = time.monotonic() - self._last_fetch < self.min_refresh_interval
+            if self._refreshing or recently_fetched:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                with self._lock:
+                    self._refresh()
+            except Exception:
+                logger.exception(f"Background JWKS refresh failed for {self.url}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+
+google_jwks = JWKSCache(GOOGLE_JWKS_URL)
+apple_jwks = JWKSCache(APPLE_JWKS_URL)
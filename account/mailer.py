@@ -0,0 +1,112 @@
+import logging
+from datetime import timedelta
+from typing import Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+
+
+def _default_from_email() -> str:
+    from_email = getattr(settings, "EMAIL_HOST_USER", None) or getattr(
+        settings, "DEFAULT_FROM_EMAIL", None
+    )
+    if not from_email:
+        raise ImproperlyConfigured(
+            "Sender email not configured. Set EMAIL_HOST_USER or DEFAULT_FROM_EMAIL in settings."
+        )
+    return from_email
+
+
+def enqueue_email(subject: str, body: str, to: str, from_email: str = None) -> OutboundEmail:
+    """Queue an email; it is sent by the outbox worker, never on the request path."""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        to=to,
+        from_email=from_email or _default_from_email(),
+    )
+
+
+def _claim_batch(batch_size: int):
+    """Lock a batch of due emails; other workers skip locked rows."""
+    return list(
+        OutboundEmail.objects.select_for_update(skip_locked=True)
+        .filter(status=OutboundEmail.PENDING, next_attempt_at__lte=timezone.now())
+        .order_by("next_attempt_at")[:batch_size]
+    )
+
+
+def _mark_failed_attempt(email: OutboundEmail, exc: Exception) -> None:
+    email.attempts += 1
+    email.last_error = str(exc)
+    if email.attempts >= MAX_ATTEMPTS:
+        email.status = OutboundEmail.FAILED
+        logger.error("Giving up on email %s to %s: %s", email.pk, email.to, exc)
+    else:
+        # Exponential backoff: 30s, 1m, 2m, 4m, ...
+        email.next_attempt_at = timezone.now() + timedelta(
+            seconds=RETRY_BASE_SECONDS * 2 ** (email.attempts - 1)
+        )
+    email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+
+
+def send_pending(batch_size: int = 50) -> Tuple[int, int]:
+    """
+    Send one batch of due emails over a single backend connection.
+
+    Returns ``(sent, failed)``. Failed messages are rescheduled with backoff.
+    """
+    backend = getattr(settings, "EMAIL_OUTBOX_BACKEND", None)
+    sent = failed = 0
+
+    with transaction.atomic():
+        batch = _claim_batch(batch_size)
+        if not batch:
+            return 0, 0
+
+        connection = get_connection(backend=backend, fail_silently=False)
+        try:
+            connection.open()
+        except Exception as exc:
+            logger.exception("Could not open email connection")
+            for email in batch:
+                _mark_failed_attempt(email, exc)
+            return 0, len(batch)
+
+        try:
+            for email in batch:
+                message = EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=email.from_email,
+                    to=[email.to],
+                    connection=connection,
+                )
+                try:
+                    connection.send_messages([message])
+                except Exception as exc:
+                    logger.warning("Sending email %s to %s failed: %s", email.pk, email.to, exc)
+                    _mark_failed_attempt(email, exc)
+                    failed += 1
+                    continue
+
+                email.status = OutboundEmail.SENT
+                email.sent_at = timezone.now()
+                email.attempts += 1
+                email.save(update_fields=["status", "sent_at", "attempts"])
+                sent += 1
+        finally:
+            connection.close()
+
+    logger.info("Outbox batch: %d sent, %d failed", sent, failed)
+    return sent, failed
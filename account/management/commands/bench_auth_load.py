@@ -0,0 +1,151 @@
+import asyncio
+import json
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.urls import path
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+
+from account.documents import get_user_document
+from account.serializers import LoginSerializer
+from account.utils import generate_tokens_for_user
+from account.views import AsyncLoginView, UpdateProfileView
+from core.utils import ResponseHandler
+
+User = get_user_model()
+
+BENCH_EMAIL = "bench.auth@bench.local"
+BENCH_PASSWORD = "bench-password-123"
+
+
+class SyncLoginView(APIView):
+    """Baseline only: AsyncLoginView hashing on the request thread, as login used to."""
+
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = LoginSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.authenticate()
+        return ResponseHandler.success(
+            message="Login successful",
+            data={"user": get_user_document(user), "tokens": generate_tokens_for_user(user)},
+        )
+
+
+# URLconf used while the benchmark runs (ROOT_URLCONF points at this module)
+urlpatterns = [
+    path("sync/login/", SyncLoginView.as_view()),
+    path("async/login/", AsyncLoginView.as_view()),
+    path("read/", UpdateProfileView.as_view()),
+]
+
+
+async def _request(app, method, path, body=b"", headers=()):
+    """Send one request through the ASGI app and return the status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()  # the client never disconnects
+
+    status = None
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive mixed login and read traffic through the ASGI app, once with the "
+        "sync baseline login view and once with AsyncLoginView, and report login "
+        "throughput and read latency for each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=16, help="Concurrent login clients.")
+        parser.add_argument("--readers", type=int, default=8, help="Concurrent read clients.")
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per mode.")
+
+    def handle(self, *args, **options):
+        User.objects.filter(email=BENCH_EMAIL).delete()
+        user = User.objects.create_user(email=BENCH_EMAIL, password=BENCH_PASSWORD, full_name="Bench")
+        token = generate_tokens_for_user(user)["access"]
+        try:
+            with override_settings(ROOT_URLCONF=__name__, ALLOWED_HOSTS=["testserver"]):
+                app = get_asgi_application()
+                self.stdout.write(
+                    f"{'mode':>6} {'logins/s':>9} {'reads/s':>9} {'read p50 ms':>12} "
+                    f"{'read p95 ms':>12} {'errors':>7}"
+                )
+                for mode in ("sync", "async"):
+                    result = asyncio.run(self._run(app, mode, token, options))
+                    self.stdout.write(
+                        f"{mode:>6} {result['logins'] / options['duration']:>9.1f} "
+                        f"{len(result['reads']) / options['duration']:>9.1f} "
+                        f"{statistics.median(result['reads']):>12.1f} "
+                        f"{statistics.quantiles(result['reads'], n=20)[-1]:>12.1f} "
+                        f"{result['errors']:>7}"
+                    )
+        finally:
+            user.delete()
+
+    async def _run(self, app, mode, token, options):
+        stop = time.monotonic() + options["duration"]
+        result = {"logins": 0, "reads": [], "errors": 0}
+        login_body = json.dumps({"email": BENCH_EMAIL, "password": BENCH_PASSWORD}).encode()
+        auth = [(b"authorization", f"Bearer {token}".encode())]
+
+        async def login_client():
+            while time.monotonic() < stop:
+                status = await _request(app, "POST", f"/{mode}/login/", login_body)
+                if status == 200:
+                    result["logins"] += 1
+                else:
+                    result["errors"] += 1
+
+        async def read_client():
+            while time.monotonic() < stop:
+                start = time.perf_counter()
+                status = await _request(app, "GET", "/read/", headers=auth)
+                result["reads"].append((time.perf_counter() - start) * 1000)
+                if status != 200:
+                    result["errors"] += 1
+
+        await asyncio.gather(
+            *(login_client() for _ in range(options["logins"])),
+            *(read_client() for _ in range(options["readers"])),
+        )
+        return result
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from account import counters
+from account.services import DashboardService, dashboard_totals, simple_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the dashboard/stats getters from concurrent threads and report "
+        "requests/s vs. DB queries/s. With the cache, queries/s should stay flat "
+        "as the thread count grows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", default="1,4,16,32", help="Comma separated thread counts.")
+        parser.add_argument("--duration", type=float, default=3.0, help="Seconds per run.")
+        parser.add_argument("--soft-ttl", type=int, default=1, help="Soft TTL used during the run.")
+        parser.add_argument("--no-cache", action="store_true", help="Call the uncached loaders directly.")
+
+    def handle(self, *args, **options):
+        dashboard_totals.soft_ttl = simple_stats.soft_ttl = options["soft_ttl"]
+        self.stdout.write(f"{'threads':>8} {'req/s':>10} {'queries/s':>10}")
+
+        for threads in [int(t) for t in options["threads"].split(",")]:
+            cache.delete_many([dashboard_totals.key, simple_stats.key])
+            requests, queries = self._run(threads, options["duration"], options["no_cache"])
+            self.stdout.write(
+                f"{threads:>8} {requests / options['duration']:>10.0f} "
+                f"{queries / options['duration']:>10.1f}"
+            )
+
+    def _run(self, threads, duration, no_cache):
+        stop = time.monotonic() + duration
+        totals = {"requests": 0, "queries": 0}
+        lock = threading.Lock()
+
+        def worker():
+            requests = queries = 0
+
+            def count_query(execute, sql, params, many, context):
+                nonlocal queries
+                queries += 1
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(count_query):
+                while time.monotonic() < stop:
+                    if no_cache:
+                        counters.get_counters()
+                        simple_stats.compute()
+                    else:
+                        DashboardService.get_totals()
+                        DashboardService.get_simple_stats()
+                    requests += 1
+            connection.close()
+            with lock:
+                totals["requests"] += requests
+                totals["queries"] += queries
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        return totals["requests"], totals["queries"]
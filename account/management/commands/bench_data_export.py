@@ -0,0 +1,92 @@
+import datetime
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from account.exports import write_archive
+from privacy.models import ShareThoughts
+from supplychain.models import Resource, Supplier
+
+User = get_user_model()
+
+BENCH_EMAIL = "bench.export@bench.local"
+
+
+def _naive_export(user_id):
+    """What a view would do: load every related set, then serialize it in one go."""
+    user = User.objects.get(pk=user_id)
+    return json.dumps({
+        "suppliers": list(Supplier.objects.filter(supervisor_id=user.pk).values()),
+        "resources": list(Resource.objects.filter(supervisor_id=user.pk).values()),
+        "share_thoughts": list(ShareThoughts.objects.filter(user_id=user.pk).values()),
+    }, default=str)
+
+
+def _measure(func):
+    """Wall time of an untraced run, then peak memory of a traced one (tracing is slow)."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+class Command(BaseCommand):
+    help = (
+        "Export a user with many related rows, streaming to a zip of NDJSON files "
+        "and, for comparison, building the whole document in memory. Reports time "
+        "and peak Python memory for each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000, help="Related rows for the bench user.")
+        parser.add_argument("--skip-naive", action="store_true", help="Only run the streaming export.")
+
+    def handle(self, *args, **options):
+        User.objects.filter(email=BENCH_EMAIL).delete()
+        user = User.objects.create_user(email=BENCH_EMAIL, password=None, full_name="Bench Export")
+        try:
+            self._seed(user, options["rows"])
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "export.zip")
+                counts = {}
+                elapsed, peak = _measure(lambda: counts.update(write_archive(user.pk, path)))
+                rows = sum(counts.values())
+                self.stdout.write(
+                    f"stream: {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s), "
+                    f"peak {peak / 1e6:.1f} MB, archive {os.path.getsize(path) / 1e6:.1f} MB"
+                )
+            if not options["skip_naive"]:
+                elapsed, peak = _measure(lambda: _naive_export(user.pk))
+                self.stdout.write(f"naive:  {elapsed:.2f}s, peak {peak / 1e6:.1f} MB")
+        finally:
+            for model, field in ((Resource, "supervisor"), (Supplier, "supervisor"), (ShareThoughts, "user")):
+                model.objects.filter(**{field: user}).delete()
+            user.delete()
+
+    def _seed(self, user, total):
+        per_set = {Supplier: total * 2 // 5, Resource: total * 2 // 5}
+        per_set[ShareThoughts] = total - sum(per_set.values())
+        builders = {
+            Supplier: lambda i: Supplier(
+                supervisor=user, supplier_name=f"Supplier {i}", supplier_email=f"s{i}@bench.local",
+                materials_supplied="timber, steel, concrete",
+            ),
+            Resource: lambda i: Resource(
+                supervisor=user, name=f"Resource {i}", role="Carpenter", days=["Monday", "Friday"],
+                start_time=datetime.time(8), end_time=datetime.time(16),
+            ),
+            ShareThoughts: lambda i: ShareThoughts(user=user, thoughts=f"Thought number {i} " * 4),
+        }
+        for model, count in per_set.items():
+            for start in range(0, count, 5000):
+                model.objects.bulk_create([builders[model](i) for i in range(start, min(start + 5000, count))])
+        self.stdout.write(f"Seeded {total} related rows")
@@ -0,0 +1,99 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Grow the user table in steps and time login identifier lookups at each "
+        "size. Indexed lookups should stay flat; --compare also times the old "
+        "iexact OR query. Everything runs in one transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma separated row counts.")
+        parser.add_argument("--lookups", type=int, default=200, help="Lookups timed per size.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="bulk_create batch size.")
+        parser.add_argument("--compare", action="store_true", help="Also time the iexact OR query.")
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(s) for s in options["sizes"].split(","))
+        header = f"{'rows':>10} {'email ms':>10} {'phone ms':>10} {'username ms':>12}"
+        if options["compare"]:
+            header += f" {'iexact OR ms':>13}"
+        self.stdout.write(header)
+
+        with transaction.atomic():
+            created = 0
+            for size in sizes:
+                self._grow(created, size, options["batch_size"])
+                created = max(created, size)
+                ids = random.sample(range(created), min(options["lookups"], created))
+
+                row = f"{created:>10}"
+                row += f" {self._time(lambda i: User.objects.get_by_identifier(self._email(i).upper()), ids):>10.3f}"
+                row += f" {self._time(lambda i: User.objects.get_by_identifier(self._phone(i)), ids):>10.3f}"
+                row += f" {self._time(lambda i: User.objects.get_by_identifier(self._username(i)), ids):>12.3f}"
+                if options["compare"]:
+                    row += f" {self._time(self._iexact_or, ids):>13.3f}"
+                self.stdout.write(row)
+
+            plan = (
+                User.objects.alias(identifier_lower=Lower("email"))
+                .filter(identifier_lower=self._email(0))
+                .explain()
+            )
+            self.stdout.write(f"\nEmail lookup plan:\n{plan}")
+
+            transaction.set_rollback(True)
+
+    # Data
+    @staticmethod
+    def _email(i):
+        return f"bench.login.{i}@bench.local"
+
+    @staticmethod
+    def _phone(i):
+        return f"+99{i:010d}"
+
+    @staticmethod
+    def _username(i):
+        return f"benchlogin{i}"
+
+    def _grow(self, start, stop, batch_size):
+        for offset in range(start, stop, batch_size):
+            User.objects.bulk_create([
+                User(
+                    email=self._email(i),
+                    phone=self._phone(i),
+                    username=self._username(i),
+                    full_name="Bench User",
+                    password="!",
+                )
+                for i in range(offset, min(offset + batch_size, stop))
+            ])
+
+    # Timing
+    def _iexact_or(self, i):
+        identifier = self._email(i).upper()
+        return User.objects.filter(
+            Q(email__iexact=identifier) | Q(phone=identifier) | Q(username__iexact=identifier)
+        ).first()
+
+    @staticmethod
+    def _time(lookup, ids):
+        timings = []
+        for i in ids:
+            start = time.perf_counter()
+            user = lookup(i)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert user is not None
+        return statistics.median(timings)
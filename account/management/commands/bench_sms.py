@@ -0,0 +1,73 @@
+import time
+
+from django.apps.registry import Apps
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+
+from account.models import OutboundSms
+from account.sms import FakeTransport, SmsDispatcher
+
+BENCH_TABLE = "bench_sms_outbox"
+
+
+def _scratch_model():
+    """A copy of ``OutboundSms`` on its own table, registered outside the project's app registry."""
+    attrs = {field.name: field.clone() for field in OutboundSms._meta.local_fields}
+    attrs["__module__"] = __name__
+    attrs["Meta"] = type("Meta", (), {
+        "app_label": "account",
+        "db_table": BENCH_TABLE,
+        "apps": Apps(),
+        "indexes": [models.Index(fields=["status", "next_attempt_at"], name=f"{BENCH_TABLE}_due_idx")],
+    })
+    return type("BenchSms", (models.Model,), attrs)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure SMS outbox throughput offline against the fake transport. "
+        "Runs against a scratch copy of the outbox table that is dropped afterwards, "
+        "so real queued messages are never read or touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=2000)
+        parser.add_argument("--distinct-bodies", type=int, default=20,
+                            help="Number of distinct bodies (identical bodies are batched).")
+        parser.add_argument("--latency", type=float, default=0.05, help="Fake provider latency (s).")
+        parser.add_argument("--rate", type=float, default=50, help="Provider calls per second.")
+
+    def handle(self, *args, **options):
+        transport = FakeTransport(latency=options["latency"])
+        model = _scratch_model()
+        dispatcher = SmsDispatcher(transport, rate_per_second=options["rate"], model=model)
+
+        if BENCH_TABLE in connection.introspection.table_names():
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        try:
+            start = time.perf_counter()
+            with transaction.atomic():
+                for i in range(options["messages"]):
+                    model.objects.create(
+                        phone=f"+4520{i:06d}", body=f"Announcement #{i % options['distinct_bodies']}"
+                    )
+            enqueued = time.perf_counter() - start
+            while any(dispatcher.send_pending()):
+                pass
+            elapsed = time.perf_counter() - start
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
+
+        self.stdout.write(f"messages:          {options['messages']}")
+        self.stdout.write(f"provider calls:    {len(transport.calls)}")
+        self.stdout.write(f"enqueue time:      {enqueued * 1000:.1f} ms")
+        self.stdout.write(f"total time:        {elapsed:.2f} s")
+        self.stdout.write(f"throughput:        {options['messages'] / elapsed:.0f} msg/s")
+        self.stdout.write(
+            f"unbatched estimate: {options['messages'] * options['latency']:.1f} s "
+            f"(one call per message, {options['latency'] * 1000:.0f} ms each)"
+        )
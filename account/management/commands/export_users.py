@@ -0,0 +1,32 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from account.bulk import FORMATS, detect_format, iter_export_rows, user_export_queryset, write_rows
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Stream users to CSV or NDJSON in constant memory (password hashes are never exported)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", nargs="?", default="-", help="File path, or - for stdout.")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults from the file extension (csv).")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows per DB fetch.")
+        parser.add_argument("--verified-only", action="store_true")
+
+    def handle(self, *args, **options):
+        fmt = detect_format(options["output"], options["format"])
+        queryset = user_export_queryset(User.objects.all())
+        if options["verified_only"]:
+            queryset = queryset.filter(is_verified=True)
+        rows = iter_export_rows(queryset, chunk_size=options["chunk_size"])
+
+        if options["output"] == "-":
+            write_rows(sys.stdout, rows, fmt)
+            return
+        with open(options["output"], "w", newline="", encoding="utf-8") as f:
+            written = write_rows(f, rows, fmt)
+        self.stderr.write(f"Exported {written} users to {options['output']}")
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from account.activity import get_activity_tracker
+
+
+class Command(BaseCommand):
+    help = (
+        "Write buffered last-activity timestamps to the database. "
+        "Only useful with Redis; the in-process buffer is flushed by each worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and flush every N seconds (0 = flush once and exit).",
+        )
+
+    def handle(self, *args, **options):
+        tracker = get_activity_tracker()
+        interval = options["interval"]
+
+        while True:
+            flushed = tracker.flush()
+            self.stdout.write(f"Flushed last activity for {flushed} users")
+            if interval <= 0:
+                break
+            time.sleep(interval)
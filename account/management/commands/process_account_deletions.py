@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from account.deletion import run_account_deletion
+from account.models import AccountDeletion
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued account deletions (retry failed ones, or resume jobs "
+        "interrupted by a restart with --resume)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--job-id", type=int, action="append", help="Only these jobs (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows deleted per transaction.")
+        parser.add_argument("--resume", action="store_true", help="Also pick up jobs left RUNNING.")
+
+    def handle(self, *args, **options):
+        statuses = [AccountDeletion.PENDING, AccountDeletion.FAILED]
+        if options["resume"]:
+            statuses.append(AccountDeletion.RUNNING)
+        qs = AccountDeletion.objects.filter(status__in=statuses)
+        if options["job_id"]:
+            qs = qs.filter(pk__in=options["job_id"])
+
+        done = failed = 0
+        for job_id in qs.values_list("pk", flat=True):
+            try:
+                job = run_account_deletion(job_id, batch_size=options["batch_size"], resume=options["resume"])
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"Job {job_id}: {exc}")
+                continue
+            if job is not None:
+                done += 1
+                self.stdout.write(f"Job {job_id}: deleted user {job.user_id} ({job.rows_deleted} rows) {job.progress}")
+        self.stdout.write(f"Completed {done}, failed {failed}")
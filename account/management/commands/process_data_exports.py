@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from account.exports import claimable_exports, purge_expired, run_data_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Build pending, failed and abandoned (running past the lease) personal-data "
+        "exports and remove expired archives."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--job-id", type=int, action="append", help="Only these exports (repeatable).")
+        parser.add_argument("--purge-only", action="store_true", help="Only remove expired archives.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Removed {purge_expired()} expired archives")
+        if options["purge_only"]:
+            return
+
+        qs = claimable_exports()
+        if options["job_id"]:
+            qs = qs.filter(pk__in=options["job_id"])
+
+        done = failed = 0
+        for export_id in qs.values_list("pk", flat=True):
+            try:
+                export = run_data_export(export_id)
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"Export {export_id}: {exc}")
+                continue
+            if export is not None:
+                done += 1
+                self.stdout.write(f"Export {export_id}: {export.file_size} bytes {export.row_counts}")
+        self.stdout.write(f"Completed {done}, failed {failed}")
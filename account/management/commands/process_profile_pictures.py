@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from account.images import process_profile_picture
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate profile picture derivatives for users that don't have them yet "
+        "(backfill, or retry after a failed background run)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int, action="append", help="Only these users (repeatable).")
+        parser.add_argument("--all", action="store_true", help="Regenerate for every user with an upload.")
+
+    def handle(self, *args, **options):
+        default_pic = User._meta.get_field("profile_pic").default
+        qs = User.objects.exclude(profile_pic__in=["", default_pic]).exclude(profile_pic__isnull=True)
+        if options["user_id"]:
+            qs = qs.filter(pk__in=options["user_id"])
+        elif not options["all"]:
+            qs = qs.filter(profile_pic_derivatives={})
+
+        done = failed = 0
+        for user_id in qs.values_list("pk", flat=True).iterator():
+            try:
+                process_profile_picture(user_id)
+                done += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"User {user_id}: {exc}")
+        self.stdout.write(f"Processed {done}, failed {failed}")
@@ -0,0 +1,35 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from account import search
+from account.models import SearchToken
+
+
+class Command(BaseCommand):
+    help = "Rebuild the admin search index of users and offers (after imports or a schema change)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", action="store_true", help="Only users.")
+        parser.add_argument("--offers", action="store_true", help="Only offers.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        both = not options["users"] and not options["offers"]
+        targets = []
+        if both or options["users"]:
+            targets.append((SearchToken.KIND_USER, get_user_model(), search.index_users))
+        if both or options["offers"]:
+            targets.append((SearchToken.KIND_OFFER, apps.get_model("supplychain", "Task"), search.index_offers))
+
+        batch_size = options["batch_size"]
+        for kind, model, index in targets:
+            ids = list(model._base_manager.order_by("pk").values_list("pk", flat=True))
+            for start in range(0, len(ids), batch_size):
+                index(ids[start:start + batch_size])
+            # drop rows of objects deleted while signals were not running
+            indexed = set(SearchToken.objects.filter(kind=kind).values_list("object_id", flat=True).distinct())
+            stale = list(indexed - {str(pk) for pk in ids})
+            for start in range(0, len(stale), batch_size):
+                search.remove(kind, stale[start:start + batch_size])
+            self.stdout.write(f"Indexed {len(ids)} {kind}s")
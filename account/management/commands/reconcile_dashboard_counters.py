@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from account import counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute dashboard counters from the source tables and fix any drift. "
+        "Run periodically (e.g. hourly from cron or a systemd timer)."
+    )
+
+    def handle(self, *args, **options):
+        drift = counters.reconcile()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Dashboard counters are in sync."))
+            return
+        for name, values in drift.items():
+            self.stdout.write(f"{name}: {values['before']} -> {values['after']}")
+        self.stdout.write(self.style.WARNING(f"Reconciled {len(drift)} drifted counter(s)."))
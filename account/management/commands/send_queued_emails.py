@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from account.mailer import send_pending
+
+
+class Command(BaseCommand):
+    help = "Drain the outbound email queue, reusing one backend connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep polling every N seconds when the queue is empty (0 = drain once and exit).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_pending(batch_size=options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+                continue
+            if options["interval"] <= 0:
+                break
+            time.sleep(options["interval"])
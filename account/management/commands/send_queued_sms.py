@@ -0,0 +1,33 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from account.sms import get_sms_dispatcher
+
+
+class Command(BaseCommand):
+    help = "Drain the outbound SMS queue, batching identical bodies and rate limiting provider calls."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep polling every N seconds when the queue is empty (0 = drain once and exit).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            dispatcher = get_sms_dispatcher()
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+        while True:
+            sent, failed = dispatcher.send_pending(batch_size=options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+                continue
+            if options["interval"] <= 0:
+                break
+            time.sleep(options["interval"])
@@ -1,6 +1,25 @@
+import re
+
 from django.contrib.auth.base_user import BaseUserManager
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
+# Same shape as the User.phone validator
+PHONE_RE = re.compile(r"^\+?\d{9,15}$")
+
+IDENTIFIER_EMAIL = "email"
+IDENTIFIER_PHONE = "phone"
+IDENTIFIER_USERNAME = "username"
+
+
+def identifier_type(identifier: str) -> str:
+    """Classify a login identifier as an email, phone number or username."""
+    if "@" in identifier:
+        return IDENTIFIER_EMAIL
+    if PHONE_RE.match(identifier):
+        return IDENTIFIER_PHONE
+    return IDENTIFIER_USERNAME
+
 
 class UserManager(BaseUserManager):
     def _create_user(self, email=None, phone=None, username=None, password=None, **extra_fields):
@@ -30,3 +49,43 @@ class UserManager(BaseUserManager):
             raise ValueError(_("Superuser must have is_staff=True and is_superuser=True"))
 
         return self._create_user(email, phone, username, password, **extra_fields)
+
+    def _lookup(self, kind, identifier):
+        if kind == IDENTIFIER_PHONE:
+            qs = self.filter(phone=identifier)
+        else:
+            # Matches the lower(email) / lower(username) functional indexes
+            qs = self.alias(identifier_lower=Lower(kind)).filter(identifier_lower=identifier.lower())
+        return qs.order_by("pk")
+
+    def get_by_identifier(self, identifier: str):
+        """
+        Resolve an email, phone or username to a user with one indexed query.
+
+        Emails and usernames match case-insensitively. A phone-shaped
+        identifier with no matching phone is retried as a username. Raises
+        ``DoesNotExist`` when nothing matches, like ``get()``.
+        """
+        identifier = (identifier or "").strip()
+        user = None
+        if identifier:
+            kind = identifier_type(identifier)
+            user = self._lookup(kind, identifier).first()
+            if user is None and kind == IDENTIFIER_PHONE:
+                user = self._lookup(IDENTIFIER_USERNAME, identifier).first()
+        if user is None:
+            raise self.model.DoesNotExist(f"No user matches {identifier!r}")
+        return user
+
+    async def aget_by_identifier(self, identifier: str):
+        """Async ``get_by_identifier``."""
+        identifier = (identifier or "").strip()
+        user = None
+        if identifier:
+            kind = identifier_type(identifier)
+            user = await self._lookup(kind, identifier).afirst()
+            if user is None and kind == IDENTIFIER_PHONE:
+                user = await self._lookup(IDENTIFIER_USERNAME, identifier).afirst()
+        if user is None:
+            raise self.model.DoesNotExist(f"No user matches {identifier!r}")
+        return user
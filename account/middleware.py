@@ -1,11 +1,27 @@
-from django.utils import timezone
+from .activity import get_activity_tracker
+from .analytics import get_activity_analytics
+from .presence import get_presence
+
 
 class LastActivityMiddleware:
+    """
+    Buffer the caller's activity timestamp instead of saving the user row.
+
+    Runs after the view so users authenticated by DRF (JWT) are seen too;
+    the buffered timestamps are written back in bulk by the activity tracker.
+    The same throttled hits feed the active-user sketches and the presence
+    index, which is enough for the 5-minute online window as long as the
+    throttle stays below it.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        if request.user.is_authenticated:
-            request.user.last_activity = timezone.now()
-            request.user.save(update_fields=["last_activity"])
-        return self.get_response(request)
+        response = self.get_response(request)
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            if get_activity_tracker().record(user.pk):
+                get_activity_analytics().record(user.pk)
+                get_presence().touch(user.pk)
+        return response
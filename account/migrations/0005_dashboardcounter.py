@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:13
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    User = apps.get_model('account', 'User')
+    UserSubscription = apps.get_model('subscription', 'UserSubscription')
+    DashboardCounter = apps.get_model('account', 'DashboardCounter')
+
+    total = User.objects.count()
+    verified = User.objects.filter(is_verified=True).count()
+    earnings = UserSubscription.objects.filter(active=True).aggregate(
+        total=models.Sum('plan__price')
+    )['total'] or Decimal('0')
+
+    values = {
+        'total_users': total,
+        'total_verified': verified,
+        'total_unverified': total - verified,
+        'total_earnings': int(earnings * 100),
+    }
+    for name, value in values.items():
+        DashboardCounter.objects.update_or_create(name=name, defaults={'value': value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0004_user_last_activity'),
+        ('subscription', '0003_alter_usersubscription_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard counter',
+                'verbose_name_plural': 'Dashboard counters',
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:17
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0005_dashboardcounter'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='otp',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='otp_expired',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0009_user_user_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='profile_pic_derivatives',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
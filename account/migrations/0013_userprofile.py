@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0012_dataexport'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserProfile',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('bio', models.TextField(blank=True, max_length=255, null=True)),
+                ('company_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('cvr_number', models.IntegerField(blank=True, null=True, unique=True)),
+                ('bank_name', models.CharField(blank=True, max_length=155, null=True)),
+                ('account_number', models.IntegerField(blank=True, null=True)),
+                ('iban', models.CharField(blank=True, max_length=255, null=True)),
+                ('swift_ibc', models.CharField(blank=True, max_length=255, null=True)),
+                ('hourly_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('profit_on_materials', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('risk_margin', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'User profile',
+                'verbose_name_plural': 'User profiles',
+            },
+        ),
+    ]
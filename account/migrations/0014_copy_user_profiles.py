@@ -0,0 +1,55 @@
+from django.db import migrations
+from django.db.models import Q
+
+PROFILE_FIELDS = (
+    "bio",
+    "company_name",
+    "cvr_number",
+    "bank_name",
+    "account_number",
+    "iban",
+    "swift_ibc",
+    "hourly_rate",
+    "profit_on_materials",
+    "risk_margin",
+)
+BATCH_SIZE = 2000
+
+
+def copy_profiles(apps, schema_editor):
+    """Create a UserProfile for every user with at least one profile column set."""
+    User = apps.get_model("account", "User")
+    UserProfile = apps.get_model("account", "UserProfile")
+
+    has_profile = Q()
+    for field in PROFILE_FIELDS:
+        has_profile |= Q(**{f"{field}__isnull": False})
+
+    rows = User.objects.filter(has_profile).order_by("pk").values("pk", *PROFILE_FIELDS)
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(UserProfile(user_id=row.pop("pk"), **row))
+        if len(batch) >= BATCH_SIZE:
+            UserProfile.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        UserProfile.objects.bulk_create(batch)
+
+
+def copy_back(apps, schema_editor):
+    User = apps.get_model("account", "User")
+    UserProfile = apps.get_model("account", "UserProfile")
+
+    for row in UserProfile.objects.order_by("pk").values("user_id", *PROFILE_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        User.objects.filter(pk=row.pop("user_id")).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0013_userprofile'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_profiles, copy_back),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0014_copy_user_profiles'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='account_number',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='bank_name',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='bio',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='company_name',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='cvr_number',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='hourly_rate',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='iban',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='profit_on_materials',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='risk_margin',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='swift_ibc',
+        ),
+    ]
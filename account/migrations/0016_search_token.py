@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0015_remove_user_profile_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('user', 'User'), ('offer', 'Offer')], max_length=10)),
+                ('object_id', models.CharField(max_length=36)),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'object_id'], name='search_token_object_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'token', 'object_id'), name='search_token_unique')],
+            },
+        ),
+    ]
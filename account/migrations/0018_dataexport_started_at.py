@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0017_outboundsms'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataexport',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
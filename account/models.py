@@ -1,9 +1,11 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.utils import timezone
 from django.core.validators import RegexValidator
 from .managers import UserManager
-from .utils import generate_otp, get_otp_expiry, validate_image
+from .utils import validate_image
+from . import otp as otp_store
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -11,6 +13,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ["-created_at"]
+        indexes = [
+            # Case-insensitive identifier lookups (UserManager.get_by_identifier)
+            models.Index(Lower("email"), name="user_email_lower_idx"),
+            models.Index(Lower("username"), name="user_username_lower_idx"),
+            # Keyset pagination on (-created_at, -pk)
+            models.Index(fields=["created_at", "user_id"], name="user_created_at_idx"),
+        ]
         
 
     user_id = models.AutoField(primary_key=True)
@@ -33,30 +42,16 @@ class User(AbstractBaseUser, PermissionsMixin):
         validators=[validate_image],
     )
     profile_pic_url = models.URLField(max_length=200, blank=True, null=True)
+    # {size name: storage name}, filled in by account.images after upload
+    profile_pic_derivatives = models.JSONField(default=dict, blank=True)
     country = models.CharField(max_length=100, blank=True, null=True)
 
-    otp = models.CharField(max_length=6, blank=True, null=True)
-    otp_expired = models.DateTimeField(blank=True, null=True)
-
     is_verified = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
-    
-    bio = models.TextField(max_length=255, blank=True, null=True)
-    
-    company_name = models.CharField(max_length=255, null=True, blank=True)
-    cvr_number = models.IntegerField(unique=True, null=True, blank=True)
-    
-    bank_name = models.CharField(max_length=155, null=True, blank=True)
-    account_number = models.IntegerField(null=True, blank=True)
-    
-    iban = models.CharField(max_length=255, null=True, blank=True)
-    swift_ibc = models.CharField(max_length=255, blank=True, null=True)
-    
-    hourly_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
-    profit_on_materials = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
-    risk_margin = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+
+    # Bio, company, banking and pricing details live in UserProfile (user.profile)
 
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
@@ -76,9 +71,261 @@ class User(AbstractBaseUser, PermissionsMixin):
     def get_full_name(self):
         return self.full_name
 
-    def set_otp(self, otp: str = None, expiry_minutes: int = 30) -> None:
-        self.otp = otp or generate_otp()
-        self.otp_expired = get_otp_expiry(expiry_minutes)
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Instances built from the auth cache (account.authentication) have most
+        # columns deferred; load them all on first access instead of one by one.
+        if fields is not None and getattr(self, "_load_deferred_together", False):
+            fields = set(fields) | self.get_deferred_fields()
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+    def set_otp(self, purpose: str = otp_store.PURPOSE_VERIFY_EMAIL, otp: str = None,
+                expiry_minutes: int = otp_store.DEFAULT_EXPIRY_MINUTES) -> str:
+        """Issue a new OTP for this user's email and return the plain code."""
+        return otp_store.issue_otp(purpose, self.email, code=otp, expiry_minutes=expiry_minutes)
+
+    def is_otp_valid(self, otp: str, purpose: str = otp_store.PURPOSE_VERIFY_EMAIL) -> bool:
+        """Check and consume an OTP issued by ``set_otp``."""
+        return otp_store.verify_otp(purpose, self.email, otp)
+
+
+class UserProfile(models.Model):
+    """
+    Rarely read company, banking and pricing details of a user.
+
+    Kept out of the user row so authentication, activity updates and
+    dashboard scans only touch the narrow table. The row is created on the
+    first write (``account.serializers.save_profile``); users without one
+    read as all-empty.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="profile")
+
+    bio = models.TextField(max_length=255, blank=True, null=True)
+
+    company_name = models.CharField(max_length=255, null=True, blank=True)
+    cvr_number = models.IntegerField(unique=True, null=True, blank=True)
+
+    bank_name = models.CharField(max_length=155, null=True, blank=True)
+    account_number = models.IntegerField(null=True, blank=True)
+
+    iban = models.CharField(max_length=255, null=True, blank=True)
+    swift_ibc = models.CharField(max_length=255, blank=True, null=True)
+
+    hourly_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    profit_on_materials = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    risk_margin = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "User profile"
+        verbose_name_plural = "User profiles"
+
+    def __str__(self):
+        return f"Profile of user {self.user_id}"
+
+class DashboardCounter(models.Model):
+    """
+    Incrementally maintained dashboard totals.
+
+    Updated with deltas from ``account.signals`` and periodically reconciled
+    against the source tables by ``reconcile_dashboard_counters``.
+    Earnings are stored in cents so every counter is an integer.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Dashboard counter"
+        verbose_name_plural = "Dashboard counters"
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
 
-    def is_otp_valid(self, otp: str) -> bool:
-        return self.otp == otp and self.otp_expired and timezone.now() <= self.otp_expired
+
+class OutboundEmail(models.Model):
+    """Durable outbox drained by ``manage.py send_queued_emails``."""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.EmailField()
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["next_attempt_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+
+class OutboundSms(models.Model):
+    """Durable SMS outbox drained by ``manage.py send_queued_sms``."""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+    phone = models.CharField(max_length=20)
+    body = models.TextField()
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, null=True)
+    message_id = models.CharField(max_length=64, blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["next_attempt_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.to} - {self.subject} ({self.status})"
+
+
+class AccountDeletion(models.Model):
+    """
+    Background deletion of one user and their dependent rows.
+
+    Created by ``account.deletion.request_account_deletion`` and worked off by
+    the deletion worker (or ``manage.py process_account_deletions``).
+    ``user_id`` is a plain integer so the job outlives the user row.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    user_id = models.BigIntegerField(db_index=True)
+    email = models.EmailField(blank=True, null=True)
+    requested_by = models.BigIntegerField(null=True, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    progress = models.JSONField(default=dict, blank=True)  # {step: rows deleted}
+    rows_deleted = models.PositiveBigIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Deletion of user {self.user_id} ({self.status})"
+
+
+class DataExport(models.Model):
+    """
+    Personal-data export of one account, built off the request path by
+    ``account.exports`` into a zip of NDJSON files under DATA_EXPORT_ROOT.
+
+    The finished archive is downloaded with ``token`` until ``expires_at``.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    user_id = models.BigIntegerField(db_index=True)
+    requested_by = models.BigIntegerField(null=True, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    token = models.CharField(max_length=64, unique=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    file_size = models.PositiveBigIntegerField(default=0)
+    row_counts = models.JSONField(default=dict, blank=True)  # {file in the zip: rows}
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)  # lease start of the current run
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "expires_at"]),
+        ]
+
+    def __str__(self):
+        return f"Data export of user {self.user_id} ({self.status})"
+
+
+class SearchToken(models.Model):
+    """
+    Inverted index row for the admin search (``account.search``).
+
+    One row per (indexed object, token); tokens are lower-cased words and
+    their prefixes, so a search term is a single indexed equality lookup on
+    any database backend.
+    """
+    KIND_USER = "user"
+    KIND_OFFER = "offer"
+
+    KIND_CHOICES = [
+        (KIND_USER, "User"),
+        (KIND_OFFER, "Offer"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.CharField(max_length=36)  # user pk, or offer UUID
+    token = models.CharField(max_length=64)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "token", "object_id"], name="search_token_unique"),
+        ]
+        indexes = [
+            # Removing / re-indexing one object
+            models.Index(fields=["kind", "object_id"], name="search_token_object_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.token}"
@@ -0,0 +1,86 @@
+import hashlib
+
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .utils import generate_otp
+
+# Purposes
+PURPOSE_VERIFY_EMAIL = "verify_email"
+PURPOSE_RESET_PASSWORD = "reset_password"
+
+DEFAULT_EXPIRY_MINUTES = 30
+MAX_ATTEMPTS = 5
+
+# Cache keys
+OTP_KEY = "otp:{purpose}:{identifier}"
+OTP_ATTEMPTS_KEY = "otp:{purpose}:{identifier}:attempts"
+
+
+def _normalize(identifier: str) -> str:
+    return (identifier or "").strip().lower()
+
+
+def _identifier_key(identifier: str) -> str:
+    # Keep raw emails/phones out of cache keys.
+    return hashlib.sha256(_normalize(identifier).encode()).hexdigest()[:32]
+
+
+def _hash_code(purpose: str, identifier: str, code: str) -> str:
+    return salted_hmac("account.otp", f"{purpose}:{_normalize(identifier)}:{code}").hexdigest()
+
+
+def _keys(purpose: str, identifier: str):
+    ident = _identifier_key(identifier)
+    return (
+        OTP_KEY.format(purpose=purpose, identifier=ident),
+        OTP_ATTEMPTS_KEY.format(purpose=purpose, identifier=ident),
+    )
+
+
+def issue_otp(purpose: str, identifier: str, code: str = None,
+              expiry_minutes: int = DEFAULT_EXPIRY_MINUTES) -> str:
+    """
+    Store a hashed OTP for (purpose, identifier) and return the plain code.
+
+    The entry expires on its own after ``expiry_minutes``; issuing a new code
+    replaces the previous one and resets the attempt counter.
+    """
+    ttl = expiry_minutes * 60
+    code = code or generate_otp()
+    otp_key, attempts_key = _keys(purpose, identifier)
+    cache.set(otp_key, {"hash": _hash_code(purpose, identifier, code)}, ttl)
+    cache.set(attempts_key, 0, ttl)
+    return code
+
+
+def verify_otp(purpose: str, identifier: str, code: str) -> bool:
+    """
+    Check and consume an OTP. Wrong codes count towards ``MAX_ATTEMPTS``,
+    after which the OTP is revoked and a new one has to be requested.
+    """
+    if not identifier or not code:
+        return False
+
+    otp_key, attempts_key = _keys(purpose, identifier)
+    entry = cache.get(otp_key)
+    if entry is None:
+        return False
+
+    if not constant_time_compare(entry["hash"], _hash_code(purpose, identifier, code)):
+        try:
+            attempts = cache.incr(attempts_key)
+        except ValueError:
+            attempts = MAX_ATTEMPTS
+        if attempts >= MAX_ATTEMPTS:
+            revoke_otp(purpose, identifier)
+        return False
+
+    # delete() returns False if a concurrent request consumed it first.
+    consumed = cache.delete(otp_key)
+    cache.delete(attempts_key)
+    return consumed
+
+
+def revoke_otp(purpose: str, identifier: str) -> None:
+    cache.delete_many(_keys(purpose, identifier))
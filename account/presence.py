@@ -0,0 +1,233 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis key (ZSET user_id -> last seen unix time)
+PRESENCE_KEY = "account:presence"
+# Django cache key for the fields shown next to an online user
+DISPLAY_CACHE_KEY = "account:presence:display:{user_id}"
+
+DISPLAY_FIELDS = ("user_id", "email", "username", "full_name", "profile_pic", "profile_pic_url", "profile_pic_derivatives")
+
+
+# ---------------------------
+# Indexes
+# ---------------------------
+class LocalPresenceIndex:
+    """In-process score-ordered index used when Redis is not configured (dev, tests)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scores: Dict[int, float] = {}
+        self._entries: List[Tuple[float, int]] = []  # sorted by (score, user_id)
+
+    def touch(self, user_id: int, timestamp: float, trim_before: float) -> None:
+        with self._lock:
+            self._discard(user_id)
+            self._scores[user_id] = timestamp
+            bisect.insort(self._entries, (timestamp, user_id))
+            self._trim(trim_before)
+
+    def remove(self, user_id: int) -> None:
+        with self._lock:
+            self._discard(user_id)
+
+    def count(self, since: float) -> int:
+        with self._lock:
+            return len(self._entries) - bisect.bisect_left(self._entries, (since, -1))
+
+    def range(self, since: float, offset: int, limit: int) -> List[Tuple[int, float]]:
+        """Most recent first."""
+        with self._lock:
+            start = bisect.bisect_left(self._entries, (since, -1))
+            newest = self._entries[start:][::-1]
+            return [(user_id, score) for score, user_id in newest[offset:offset + limit]]
+
+    def trim(self, before: float) -> int:
+        with self._lock:
+            return self._trim(before)
+
+    def _discard(self, user_id: int) -> None:
+        score = self._scores.pop(user_id, None)
+        if score is not None:
+            del self._entries[bisect.bisect_left(self._entries, (score, user_id))]
+
+    def _trim(self, before: float) -> int:
+        cut = bisect.bisect_left(self._entries, (before, -1))
+        for _, user_id in self._entries[:cut]:
+            del self._scores[user_id]
+        del self._entries[:cut]
+        return cut
+
+
+class RedisPresenceIndex:
+    """Sorted set shared by every worker; old members are trimmed on each write."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def touch(self, user_id: int, timestamp: float, trim_before: float) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zadd(PRESENCE_KEY, {user_id: timestamp})
+        pipe.zremrangebyscore(PRESENCE_KEY, "-inf", f"({trim_before}")
+        pipe.execute()
+
+    def remove(self, user_id: int) -> None:
+        self.client.zrem(PRESENCE_KEY, user_id)
+
+    def count(self, since: float) -> int:
+        return int(self.client.zcount(PRESENCE_KEY, since, "+inf"))
+
+    def range(self, since: float, offset: int, limit: int) -> List[Tuple[int, float]]:
+        rows = self.client.zrevrangebyscore(
+            PRESENCE_KEY, "+inf", since, start=offset, num=limit, withscores=True
+        )
+        return [(int(user_id), float(score)) for user_id, score in rows]
+
+    def trim(self, before: float) -> int:
+        return int(self.client.zremrangebyscore(PRESENCE_KEY, "-inf", f"({before}"))
+
+
+# ---------------------------
+# Display fields
+# ---------------------------
+def _display_row(user) -> Dict[str, Any]:
+    from .images import profile_picture_urls
+
+    _, sizes = profile_picture_urls(user)
+    return {
+        "user_id": user.user_id,
+        "email": user.email,
+        "username": user.username,
+        "full_name": user.full_name,
+        "avatar": sizes.get("thumbnail"),
+    }
+
+
+def load_display_rows(user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Display fields for ``user_ids`` from the cache, loading misses in one query."""
+    keys = {user_id: DISPLAY_CACHE_KEY.format(user_id=user_id) for user_id in user_ids}
+    cached = cache.get_many(list(keys.values()))
+    rows = {user_id: cached[key] for user_id, key in keys.items() if key in cached}
+
+    missing = [user_id for user_id in user_ids if user_id not in rows]
+    if missing:
+        User = get_user_model()
+        loaded = {
+            user.pk: _display_row(user)
+            for user in User.objects.filter(pk__in=missing).only(*DISPLAY_FIELDS).order_by()
+        }
+        cache.set_many(
+            {keys[user_id]: row for user_id, row in loaded.items()},
+            settings.PRESENCE_DISPLAY_CACHE_TTL,
+        )
+        rows.update(loaded)
+    return rows
+
+
+def forget_display_row(user_id: int) -> None:
+    cache.delete(DISPLAY_CACHE_KEY.format(user_id=user_id))
+
+
+# ---------------------------
+# Presence
+# ---------------------------
+class OnlineUsers:
+    """
+    Sequence view of the users seen since ``since`` (most recent first).
+
+    ``len()`` is one ZCOUNT and slicing one ZREVRANGEBYSCORE, so it can be
+    handed to DRF's LimitOffsetPagination like a queryset.
+    """
+
+    def __init__(self, presence: "Presence", since: float):
+        self.presence = presence
+        self.since = since
+
+    def count(self) -> int:
+        return self.presence.index.count(self.since)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice) or item.step not in (None, 1):
+            raise TypeError("OnlineUsers only supports contiguous slices")
+        offset = item.start or 0
+        limit = (item.stop - offset) if item.stop is not None else self.count() - offset
+        if limit <= 0:
+            return []
+        entries = self.presence.index.range(self.since, offset, limit)
+        rows = load_display_rows([user_id for user_id, _ in entries])
+        return [
+            {**rows[user_id], "last_seen": last_seen}
+            for user_id, last_seen in entries
+            if user_id in rows
+        ]
+
+
+class Presence:
+    """
+    Who is online: user_id -> last seen, ordered by time.
+
+    Fed by ``LastActivityMiddleware`` with the same throttling as
+    ``last_activity``, so "last seen" is accurate to the throttle interval.
+    Entries older than ``retention_seconds`` are dropped on write.
+    """
+
+    def __init__(self, index=None, retention_seconds: int = None):
+        self.index = index or LocalPresenceIndex()
+        self.retention_seconds = (
+            retention_seconds if retention_seconds is not None
+            else getattr(settings, "PRESENCE_RETENTION_SECONDS", 3600)
+        )
+
+    def touch(self, user_id: int, timestamp: float = None) -> None:
+        timestamp = timestamp if timestamp is not None else time.time()
+        try:
+            self.index.touch(user_id, timestamp, timestamp - self.retention_seconds)
+        except Exception:
+            logger.exception("Failed to record presence for user %s", user_id)
+
+    def remove(self, user_id: int) -> None:
+        self.index.remove(user_id)
+        forget_display_row(user_id)
+
+    def since(self, minutes: float) -> float:
+        minutes = min(minutes, self.retention_seconds / 60)
+        return time.time() - minutes * 60
+
+    def count(self, minutes: float = 5) -> int:
+        return self.index.count(self.since(minutes))
+
+    def online(self, minutes: float = 5) -> OnlineUsers:
+        return OnlineUsers(self, self.since(minutes))
+
+    def trim(self) -> int:
+        return self.index.trim(time.time() - self.retention_seconds)
+
+
+_presence: Optional[Presence] = None
+_presence_lock = threading.Lock()
+
+
+def get_presence() -> Presence:
+    """Return the per-process presence index, backed by Redis when configured."""
+    global _presence
+    if _presence is None:
+        with _presence_lock:
+            if _presence is None:
+                client = get_redis_client()
+                index = RedisPresenceIndex(client) if client is not None else LocalPresenceIndex()
+                _presence = Presence(index=index)
+    return _presence
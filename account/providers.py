@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Cache keys
+PROVIDER_RESPONSE_CACHE_KEY = "social:{provider}:{token_hash}"
+
+
+class ProviderLatency:
+    """Thread-safe per-provider request counters and latency totals."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _stats_for(self, provider: str) -> Dict[str, float]:
+        return self._stats.setdefault(
+            provider, {"requests": 0, "errors": 0, "cache_hits": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+
+    def observe(self, provider: str, seconds: float, ok: bool) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            stats = self._stats_for(provider)
+            stats["requests"] += 1
+            stats["errors"] += 0 if ok else 1
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+
+    def cache_hit(self, provider: str) -> None:
+        with self._lock:
+            self._stats_for(provider)["cache_hits"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                provider: {
+                    **stats,
+                    "avg_ms": round(stats["total_ms"] / stats["requests"], 2) if stats["requests"] else 0.0,
+                }
+                for provider, stats in self._stats.items()
+            }
+
+
+class ProviderClient:
+    """
+    Shared HTTP client for social login providers.
+
+    One keep-alive connection pool per process, strict connect/read timeouts,
+    latency metrics per provider, and an optional short-lived cache of
+    successful responses keyed by a hash of the access token (never the token).
+    """
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 5, pool_size: int = 10):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.metrics = ProviderLatency()
+
+    def get_json(self, provider: str, url: str, access_token: str = None, params: dict = None,
+                 token_param: str = None, cache_ttl: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        GET ``url`` and return the decoded JSON, or None on any failure.
+
+        The token is sent as a Bearer header, or as the ``token_param`` query
+        parameter when given. With ``cache_ttl``, successful responses are
+        cached for that many seconds so repeated logins skip the round-trip.
+        """
+        cache_key = None
+        if cache_ttl and access_token:
+            token_hash = hashlib.sha256(access_token.encode()).hexdigest()
+            cache_key = PROVIDER_RESPONSE_CACHE_KEY.format(provider=provider, token_hash=token_hash)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self.metrics.cache_hit(provider)
+                return cached
+
+        headers = {}
+        params = dict(params or {})
+        if access_token and token_param:
+            params[token_param] = access_token
+        elif access_token:
+            headers["Authorization"] = f"Bearer {access_token}"
+
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+            data = response.json()
+            ok = response.ok
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"{provider} request failed: {e}")
+            return None
+        finally:
+            self.metrics.observe(provider, time.perf_counter() - start, ok)
+
+        if not ok:
+            logger.info(f"{provider} responded with {response.status_code}")
+            return None
+        if cache_key:
+            cache.set(cache_key, data, cache_ttl)
+        return data
+
+
+_client: Optional[ProviderClient] = None
+_client_lock = threading.Lock()
+
+
+def get_provider_client() -> ProviderClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ProviderClient(
+                    connect_timeout=settings.SOCIAL_PROVIDER_CONNECT_TIMEOUT,
+                    read_timeout=settings.SOCIAL_PROVIDER_READ_TIMEOUT,
+                )
+    return _client
+
+
+def get_provider_metrics() -> Dict[str, Dict[str, float]]:
+    """Per-provider latency metrics for this process."""
+    return get_provider_client().metrics.snapshot()
@@ -0,0 +1,206 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import SearchToken
+
+KIND_USER = SearchToken.KIND_USER
+KIND_OFFER = SearchToken.KIND_OFFER
+
+MIN_PREFIX_LENGTH = 2
+MAX_TOKEN_LENGTH = 20  # words are indexed by prefixes up to this length
+EXACT_WORD_BONUS = 2   # a whole-word match outranks a prefix of a longer word
+MAX_EMAIL_TOKEN_LENGTH = 64
+
+WORD_RE = re.compile(r"[^\W_]+")
+PHONE_QUERY_RE = re.compile(r"^[\d\s()+.-]+$")
+DOMAIN_QUERY_RE = re.compile(r"^[a-z0-9-]+(\.[a-z0-9-]+)*\.[a-z]{2,}$")
+
+# (field, weight, kind of value) per indexed object
+USER_FIELDS = (
+    ("email", 8, "email"),
+    ("username", 6, "text"),
+    ("full_name", 5, "text"),
+    ("phone", 4, "phone"),
+    ("profile__company_name", 3, "text"),
+)
+OFFER_FIELDS = (
+    ("customer_name", 5, "text"),
+    ("phone_number", 4, "phone"),
+    ("address", 2, "text"),
+)
+
+
+# ---------------------------
+# Tokenizing
+# ---------------------------
+def _prefixes(word: str) -> Iterable[Tuple[str, bool]]:
+    """``(token, is whole word)`` for every indexed prefix of ``word``."""
+    word = word[:MAX_TOKEN_LENGTH]
+    for length in range(MIN_PREFIX_LENGTH, len(word) + 1):
+        yield word[:length], length == len(word)
+
+
+def _value_tokens(value, kind: str) -> Iterable[Tuple[str, bool]]:
+    if not value:
+        return
+    value = str(value).lower()
+    if kind == "phone":
+        # "+45 1234 5678" is found by "4512...", "1234..." and "5678..."
+        groups = re.findall(r"\d+", value)
+        for start in range(len(groups)):
+            yield from _prefixes("".join(groups[start:]))
+        return
+    if kind == "email" and "@" in value:
+        local, _, domain = value.partition("@")
+        # "john@", "john@exa", ... "john@example.com"
+        address = value[:MAX_EMAIL_TOKEN_LENGTH]
+        for length in range(len(local) + 1, len(address) + 1):
+            yield address[:length], length == len(value)
+        yield domain[:MAX_EMAIL_TOKEN_LENGTH], True  # whole domain only; its prefixes would match everyone
+        if "." in local:
+            yield local[:MAX_EMAIL_TOKEN_LENGTH], True  # "john.smith" is a domain-looking query
+        value = local
+    for word in WORD_RE.findall(value):
+        yield from _prefixes(word)
+
+
+def document_tokens(values: Dict[str, object], fields) -> Dict[str, int]:
+    """``{token: weight}`` for one object, keeping each token's best weight."""
+    tokens: Dict[str, int] = {}
+    for field, weight, kind in fields:
+        for token, whole in _value_tokens(values.get(field), kind):
+            score = weight * EXACT_WORD_BONUS if whole else weight
+            if score > tokens.get(token, 0):
+                tokens[token] = score
+    return tokens
+
+
+def query_terms(query: str) -> List[str]:
+    query = query.strip().lower().lstrip("@")
+    if not query:
+        return []
+    if " " not in query and ("@" in query or DOMAIN_QUERY_RE.match(query)):
+        # an address prefix ("john@exa") or a whole domain / dotted local part
+        return [query[:MAX_EMAIL_TOKEN_LENGTH]]
+    if PHONE_QUERY_RE.match(query) and sum(c.isdigit() for c in query) >= MIN_PREFIX_LENGTH:
+        return [re.sub(r"\D", "", query)[:MAX_TOKEN_LENGTH]]
+    terms = [word[:MAX_TOKEN_LENGTH] for word in WORD_RE.findall(query)]
+    return sorted({term for term in terms if len(term) >= MIN_PREFIX_LENGTH})
+
+
+# ---------------------------
+# Indexing
+# ---------------------------
+def _offer_model():
+    return apps.get_model("supplychain", "Task")
+
+
+def _replace(kind: str, documents: Dict[str, Dict[str, int]]) -> None:
+    """Swap the index rows of ``documents`` ({object_id: {token: weight}})."""
+    with transaction.atomic():
+        SearchToken.objects.filter(kind=kind, object_id__in=list(documents)).delete()
+        SearchToken.objects.bulk_create(
+            [
+                SearchToken(kind=kind, object_id=object_id, token=token, weight=weight)
+                for object_id, tokens in documents.items()
+                for token, weight in tokens.items()
+            ],
+            batch_size=5000,
+        )
+
+
+def index_users(user_ids: Iterable[int]) -> None:
+    user_ids = list(user_ids)
+    User = get_user_model()
+    rows = User.objects.filter(pk__in=user_ids).values("pk", *(f for f, _, _ in USER_FIELDS))
+    documents = {str(row["pk"]): document_tokens(row, USER_FIELDS) for row in rows}
+    missing = {str(pk) for pk in user_ids} - set(documents)
+    if missing:
+        remove(KIND_USER, missing)
+    _replace(KIND_USER, documents)
+
+
+def index_offer_rows(rows: Iterable[dict]) -> None:
+    """Index offers from already loaded rows (``id`` plus the OFFER_FIELDS columns)."""
+    _replace(KIND_OFFER, {str(row["id"]): document_tokens(row, OFFER_FIELDS) for row in rows})
+
+
+def index_offers(offer_ids: Iterable) -> None:
+    offer_ids = [str(pk) for pk in offer_ids]
+    rows = list(_offer_model().objects.filter(pk__in=offer_ids).values("id", *(f for f, _, _ in OFFER_FIELDS)))
+    missing = set(offer_ids) - {str(row["id"]) for row in rows}
+    if missing:
+        remove(KIND_OFFER, missing)
+    index_offer_rows(rows)
+
+
+def remove(kind: str, object_ids: Iterable) -> None:
+    SearchToken.objects.filter(kind=kind, object_id__in=[str(pk) for pk in object_ids]).delete()
+
+
+def schedule_user_index(user_id: int) -> None:
+    transaction.on_commit(lambda: index_users([user_id]))
+
+
+# ---------------------------
+# Searching
+# ---------------------------
+def search_ids(kind: str, query: str, limit: int = 20) -> List[Tuple[str, int]]:
+    """
+    ``[(object_id, score)]`` best first. Every term must match.
+
+    One grouped query over the postings of the query terms; its cost depends
+    on how many objects share those tokens, not on the table size.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+    rows = (
+        SearchToken.objects.filter(kind=kind, token__in=terms)
+        .values("object_id")
+        .annotate(matched=Count("token"), score=Sum("weight"))
+        .filter(matched=len(terms))
+        .order_by("-score", "object_id")[:limit]
+    )
+    return [(row["object_id"], row["score"]) for row in rows]
+
+
+def _ranked(ids_scores, rows: Dict[str, dict]) -> List[dict]:
+    return [{**rows[object_id], "score": score} for object_id, score in ids_scores if object_id in rows]
+
+
+def search(query: str, limit: int = 10) -> Dict[str, List[dict]]:
+    """Ranked users and offers matching ``query`` with their display fields."""
+    User = get_user_model()
+    user_hits = search_ids(KIND_USER, query, limit)
+    users = {
+        str(row["user_id"]): row
+        for row in User.objects.filter(pk__in=[int(pk) for pk, _ in user_hits])
+        .values("user_id", "email", "username", "full_name", "phone")
+    }
+
+    offer_hits = search_ids(KIND_OFFER, query, limit)
+    offers = {
+        str(row["id"]): {**row, "id": str(row["id"])}
+        for row in _offer_model().objects.filter(pk__in=[pk for pk, _ in offer_hits])
+        .values("id", "customer_name", "phone_number", "address", "status", "created_at")
+    }
+    return {"users": _ranked(user_hits, users), "offers": _ranked(offer_hits, offers)}
+
+
+class IndexedSearchAdminMixin:
+    """ModelAdmin mixin answering the changelist search box from the search index."""
+
+    search_kind: Optional[str] = None
+    search_limit = 500
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        ids = [object_id for object_id, _ in search_ids(self.search_kind, search_term, self.search_limit)]
+        return queryset.filter(pk__in=ids), False
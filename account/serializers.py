@@ -1,18 +1,99 @@
 from rest_framework import serializers
-from .models import User
+from .models import User, UserProfile
 from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
-from django.utils import timezone
 from django.contrib.auth import get_user_model
-from .utils import generate_otp, get_otp_expiry, send_otp_email, generate_tokens_for_user
+from django.db import models, transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from subscription.models import UserSubscription
+from .utils import send_otp_email, generate_tokens_for_user
+from .images import delete_files, profile_picture_urls, schedule_profile_picture
+from .hashing import acheck_password
+from . import otp as otp_store
 
 
 from rest_framework.exceptions import ValidationError
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+
+def subscriptions_prefetch() -> Prefetch:
+    """Subscriptions with their plans for a whole set of users in one query."""
+    return Prefetch("subscriptions", queryset=UserSubscription.objects.select_related("plan"))
+
+
+# UserProfile columns exposed as flat fields of the user payload
+PROFILE_FIELDS = (
+    "bio",
+    "company_name",
+    "cvr_number",
+    "bank_name",
+    "account_number",
+    "iban",
+    "swift_ibc",
+    "hourly_rate",
+    "profit_on_materials",
+    "risk_margin",
+)
+
+
+def save_profile(user, values) -> UserProfile:
+    """Write profile columns, creating the user's profile row on first use."""
+    profile, _ = UserProfile.objects.update_or_create(user=user, defaults=values)
+    user.profile = profile
+    return profile
+
+
+class _ProfileColumns(serializers.ModelSerializer):
+    """Builds UserProfile fields that read and write through ``user.profile``."""
+
+    class Meta:
+        model = UserProfile
+        fields = PROFILE_FIELDS
+
+    def build_field(self, field_name, info, model_class, nested_depth):
+        field_class, field_kwargs = super().build_field(field_name, info, model_class, nested_depth)
+        field_kwargs["source"] = f"profile.{field_name}"
+        return field_class, field_kwargs
+
+
+class ProfileFieldsMixin:
+    """
+    Lets a User ModelSerializer list PROFILE_FIELDS in ``Meta.fields``.
+
+    Users without a profile row read those fields as null; select_related
+    or prefetch ``profile`` when serializing many users.
+    """
+
+    def get_field_names(self, declared_fields, info):
+        names = super().get_field_names(declared_fields, info)
+        return [name for name in names if name not in PROFILE_FIELDS]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields.update(_ProfileColumns().get_fields())
+        return {name: fields[name] for name in self.Meta.fields}
+
+    def update(self, instance, validated_data):
+        profile_values = validated_data.pop("profile", None)
+        user = super().update(instance, validated_data)
+        if profile_values:
+            save_profile(user, profile_values)
+        return user
+
+
+class UserListSerializer(serializers.ListSerializer):
+    """Loads subscriptions (and profiles) for every user on the page before serializing rows."""
+
+    def to_representation(self, data):
+        users = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        prefetch_related_objects(users, subscriptions_prefetch(), "profile")
+        return super().to_representation(users)
+
+
+class UserSerializer(ProfileFieldsMixin, serializers.ModelSerializer):
     profile_picture = serializers.SerializerMethodField()
+    profile_pictures = serializers.SerializerMethodField()
     subscriptions = serializers.SerializerMethodField()
 
     class Meta:
@@ -24,6 +105,7 @@ class UserSerializer(serializers.ModelSerializer):
             "username",
             "full_name",
             "profile_picture",  # always returns the best available image
+            "profile_pictures", # per-size URLs (avatar, thumbnail)
             "profile_pic",      # actual ImageField
             "profile_pic_url",  # external URL for social login
             "country",
@@ -43,6 +125,7 @@ class UserSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["user_id", "is_verified", "created_at", "updated_at"]
+        list_serializer_class = UserListSerializer
 
     def get_profile_picture(self, obj):
         """Return local profile_pic if exists, otherwise use profile_pic_url."""
@@ -52,8 +135,14 @@ class UserSerializer(serializers.ModelSerializer):
             return obj.profile_pic_url
         return None
 
+    def get_profile_pictures(self, obj):
+        """Small derivatives for list/mobile views; the original until they are ready."""
+        _, sizes = profile_picture_urls(obj)
+        return sizes
+
     def get_subscriptions(self, obj):
-        """Return serialized subscriptions."""
+        """Return serialized subscriptions (no query if already prefetched)."""
+        prefetch_related_objects([obj], subscriptions_prefetch())
         return [
             {
                 "plan_name": s.plan.name,
@@ -62,12 +151,12 @@ class UserSerializer(serializers.ModelSerializer):
                 "end_date": s.end_date,
                 "active": s.active,
             }
-            for s in obj.subscriptions.select_related("plan").all()
+            for s in obj.subscriptions.all()
         ]
 
 
 
-class UpdateProfileSerializer(serializers.ModelSerializer):
+class UpdateProfileSerializer(ProfileFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -95,6 +184,19 @@ class UpdateProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["user_id","is_verified", "created_at", "updated_at"]
 
+    def update(self, instance, validated_data):
+        new_picture = "profile_pic" in validated_data
+        if new_picture:
+            stale = list((instance.profile_pic_derivatives or {}).values())
+            instance.profile_pic_derivatives = {}
+            if stale:
+                transaction.on_commit(lambda: delete_files(stale))
+        user = super().update(instance, validated_data)
+        if new_picture and user.profile_pic:
+            # Resizing runs in the background; the response doesn't wait for it
+            schedule_profile_picture(user.pk)
+        return user
+
     # def validate_username(self, value):
     #     user = self.context['request'].user
     #     if User.objects.exclude(pk=user.pk).filter(username=value).exists():
@@ -119,28 +221,41 @@ class SignupSerialzier(serializers.Serializer):
     def create(self, validated_data):
         validated_data.pop("confirm_password")
         password = validated_data.pop("password")
+        # The async signup view passes a hash computed on the hashing pool
+        password_hash = validated_data.pop("password_hash", None)
         user = User(**validated_data)
-        user.password = make_password(password)
+        user.password = password_hash or make_password(password)
+        user.save()
 
         # Generate OTP
-        user.otp = generate_otp()
-        user.otp_expired = get_otp_expiry()
-        user.save()
+        code = user.set_otp(otp_store.PURPOSE_VERIFY_EMAIL)
 
         # Send SMS
-        message = f"Your verification code is {user.otp}. It expires in 30 minutes."
+        message = f"Your verification code is {code}. It expires in 30 minutes."
         send_otp_email(user.email, message)
 
         return user
     
     
+def _resolve_otp_user(purpose, otp, email):
+    """
+    Verify an OTP against the store and return its user, or None.
+
+    Codes are keyed by (purpose, email) so wrong guesses count towards the
+    email's attempt limit.
+    """
+    if not otp_store.verify_otp(purpose, email, otp):
+        return None
+    return User.objects.filter(email__iexact=email).first()
+
+
 class VerifyOTPSerializer(serializers.Serializer):
     otp = serializers.CharField(max_length=6, write_only=True)
+    email = serializers.EmailField()
 
     def validate(self, data):
-        try:
-            user = User.objects.get(otp=data["otp"], otp_expired__gte=timezone.now())
-        except User.DoesNotExist:
+        user = _resolve_otp_user(otp_store.PURPOSE_VERIFY_EMAIL, data["otp"], data["email"])
+        if user is None:
             raise serializers.ValidationError({"otp": "Invalid or expired OTP."})
 
         if user.is_verified:
@@ -154,9 +269,7 @@ class VerifyOTPSerializer(serializers.Serializer):
         from django.db import transaction
         with transaction.atomic():
             user.is_verified = True
-            user.otp = None
-            user.otp_expired = None
-            user.save(update_fields=["is_verified", "otp", "otp_expired"])
+            user.save(update_fields=["is_verified"])
         return user
     
     
@@ -180,12 +293,10 @@ class ResendVerifyOTPSerializer(serializers.Serializer):
         user = self.validated_data["user"]
 
         # Generate new OTP
-        user.otp = generate_otp()
-        user.otp_expired = get_otp_expiry()
-        user.save(update_fields=["otp", "otp_expired"])
+        code = user.set_otp(otp_store.PURPOSE_VERIFY_EMAIL)
 
         # Send SMS
-        message = f"Your new verification code is {user.otp}. It expires in 30 minutes."
+        message = f"Your new verification code is {code}. It expires in 30 minutes."
         send_otp_email(user.email, message)
 
         return user
@@ -205,15 +316,32 @@ class LoginSerializer(serializers.Serializer):
                 "password": "Password is required."
             })
 
-        user = User.objects.filter(email__iexact=email).first()
-        if not user or not user.check_password(password):
+        return attrs
+
+    # Credentials are checked outside validate() so the async view can hash
+    # on the bounded pool (account.hashing) instead of a request thread.
+    @staticmethod
+    def _check_user(user, password_ok):
+        if not user or not password_ok:
             raise serializers.ValidationError({"detail": "Invalid credentials."})
 
         if not user.is_active:
             raise serializers.ValidationError({"detail": "This account is inactive."})
+        return user
 
-        attrs['user'] = user
-        return attrs
+    def authenticate(self):
+        try:
+            user = User.objects.get_by_identifier(self.validated_data["email"])
+        except User.DoesNotExist:
+            return self._check_user(None, False)
+        return self._check_user(user, user.check_password(self.validated_data["password"]))
+
+    async def aauthenticate(self):
+        try:
+            user = await User.objects.aget_by_identifier(self.validated_data["email"])
+        except User.DoesNotExist:
+            return self._check_user(None, False)
+        return self._check_user(user, await acheck_password(user, self.validated_data["password"]))
 
 
 
@@ -222,7 +350,7 @@ class ForgetPasswordSerializer(serializers.Serializer):
 
     def validate_email(self, value):
         try:
-            user = User.objects.only('email', 'otp', 'otp_expired').get(email=value)
+            user = User.objects.only('user_id', 'email').get(email=value)
         except User.DoesNotExist:
             raise serializers.ValidationError("user account not found.")
 
@@ -231,31 +359,25 @@ class ForgetPasswordSerializer(serializers.Serializer):
 
     def save(self):
         user = self.context['user']
-        user.set_otp()
-        user.save(update_fields=['otp', 'otp_expired'])
-        send_otp_email(user.email, user.otp)
+        code = user.set_otp(otp_store.PURPOSE_RESET_PASSWORD)
+        send_otp_email(user.email, code)
         return user
 
 
 class VerifyForgetPasswordOTPSerializer(serializers.Serializer):
     otp = serializers.CharField(max_length=6, write_only=True)
+    email = serializers.EmailField()
 
-    def validate_otp(self, value):
-        try:
-            user = User.objects.only(
-                'user_id', 'email', 'otp', 'otp_expired', 'is_verified'
-            ).get(otp=value)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Invalid or expired OTP.")
+    def validate(self, attrs):
+        user = _resolve_otp_user(otp_store.PURPOSE_RESET_PASSWORD, attrs["otp"], attrs["email"])
+        if user is None:
+            raise serializers.ValidationError({"otp": "Invalid or expired OTP."})
 
         if not user.is_verified:
-            raise serializers.ValidationError("user account is not verified. Please, verify your email first.")
-
-        if user.otp_expired is None or user.otp_expired < timezone.now():
-            raise serializers.ValidationError("OTP has expired.")
+            raise serializers.ValidationError({"otp": "user account is not verified. Please, verify your email first."})
 
         self.context['user'] = user
-        return value
+        return attrs
 
     def create_access_token(self):
         user = self.context['user']
@@ -294,9 +416,12 @@ class ResetPasswordSerializer(serializers.Serializer):
         attrs["user"] = user
         return attrs
 
-    def save(self):
+    def save(self, password_hash=None):
         user = self.validated_data["user"]
-        user.set_password(self.validated_data["new_password"])
+        if password_hash:
+            user.password = password_hash
+        else:
+            user.set_password(self.validated_data["new_password"])
         user.save(update_fields=["password"])
         return user
     
@@ -311,5 +436,6 @@ class DashboardSerializer(serializers.Serializer):
     users = serializers.ListField(child=serializers.DictField())
 
 
-
-
+# personal-data export
+class DataExportRequestSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField(required=False, allow_null=True, min_value=1)
@@ -1,41 +1,80 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
-from django.db import models
+from django.utils import timezone
 
-from .signals import (
-    TOTAL_USERS_CACHE_KEY,
-    TOTAL_EARNINGS_CACHE_KEY,
-    TOTAL_VERIFIED_CACHE_KEY,
-    TOTAL_UNVERIFIED_CACHE_KEY
-)
+from core.cache import CachedValue
+from . import counters
 
 User = get_user_model()
 
+# Counters are cheap to read but shared by every admin request; serve them
+# from cache and let one worker refresh them once they are a minute old.
+dashboard_totals = CachedValue("dashboard:totals", counters.get_counters, soft_ttl=60, hard_ttl=600)
+
+
+def _compute_simple_stats():
+    from supplychain.models import Task
+
+    online_threshold = timezone.now() - timedelta(minutes=5)
+    return {
+        "active_users": User.objects.filter(is_active=True).count(),
+        "offers_created": Task.objects.count(),
+        "online_users": User.objects.filter(last_activity__gte=online_threshold).count(),
+    }
+
+
+simple_stats = CachedValue("stats:simple", _compute_simple_stats, soft_ttl=30, hard_ttl=300)
+
+
 class DashboardService:
+    """Dashboard totals come from the incrementally maintained counters, never a live COUNT."""
+
+    @staticmethod
+    def get_totals():
+        totals = dashboard_totals.get()
+        return {
+            "total_users": totals[counters.TOTAL_USERS],
+            "total_verified": totals[counters.TOTAL_VERIFIED],
+            "total_unverified": totals[counters.TOTAL_UNVERIFIED],
+            "total_earnings": counters.from_cents(totals[counters.TOTAL_EARNINGS]),
+        }
+
     @staticmethod
     def get_total_users():
-        return cache.get(TOTAL_USERS_CACHE_KEY) or User.objects.count()
+        return dashboard_totals.get()[counters.TOTAL_USERS]
 
     @staticmethod
     def get_total_earnings():
-        from subscription.models import UserSubscription
-        return cache.get(TOTAL_EARNINGS_CACHE_KEY) or UserSubscription.objects.filter(active=True).aggregate(total=models.Sum("plan__price"))["total"] or 0
+        return counters.from_cents(dashboard_totals.get()[counters.TOTAL_EARNINGS])
 
     @staticmethod
     def get_total_verified():
-        return cache.get(TOTAL_VERIFIED_CACHE_KEY) or User.objects.filter(is_verified=True).count()
+        return dashboard_totals.get()[counters.TOTAL_VERIFIED]
 
     @staticmethod
     def get_total_unverified():
-        return cache.get(TOTAL_UNVERIFIED_CACHE_KEY) or User.objects.filter(is_verified=False).count()
+        return dashboard_totals.get()[counters.TOTAL_UNVERIFIED]
+
+    @staticmethod
+    def get_simple_stats():
+        return simple_stats.get()
+
+    @staticmethod
+    def get_activity_stats():
+        from .analytics import get_activity_analytics
+
+        return get_activity_analytics().stats()
 
     @staticmethod
     def get_users_queryset():
-        return User.objects.all().order_by("-created_at")
+        return User.objects.select_related("profile").order_by("-created_at")
 
     @staticmethod
     def get_user_by_id(user_id):
-        return User.objects.prefetch_related("subscriptions__plan").filter(user_id=user_id).first()
+        from .serializers import subscriptions_prefetch
+
+        return User.objects.select_related("profile").prefetch_related(subscriptions_prefetch()).filter(user_id=user_id).first()
     
     
     
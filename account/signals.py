@@ -1,41 +1,229 @@
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from django.core.cache import cache
 from django.contrib.auth import get_user_model
-from subscription.models import UserSubscription
+from subscription.models import SubscriptionPlan, UserSubscription
 
-from django.db import models
+from . import counters
+from .authentication import AUTH_INVALIDATING_FIELDS, bump_auth_version
+from .presence import DISPLAY_FIELDS, forget_display_row, get_presence
+from .documents import USER_DOCUMENT_IGNORED_FIELDS, bump_plans_version, bump_user_document
+from .models import UserProfile
+from . import search
 
 User = get_user_model()
 
-# Cache keys
-TOTAL_USERS_CACHE_KEY = "dashboard_total_users"
-TOTAL_EARNINGS_CACHE_KEY = "dashboard_total_earnings"
-TOTAL_VERIFIED_CACHE_KEY = "dashboard_total_verified"
-TOTAL_UNVERIFIED_CACHE_KEY = "dashboard_total_unverified"
+# Fields whose transitions move the dashboard counters
+USER_TRACKED_FIELDS = ("is_verified",)
+SUBSCRIPTION_TRACKED_FIELDS = ("active", "plan_id")
+USER_PREVIOUS_FIELDS = USER_TRACKED_FIELDS + tuple(
+    f for f in AUTH_INVALIDATING_FIELDS if f not in USER_TRACKED_FIELDS
+)
 
-# Functions to update cache
-def update_total_users_cache():
-    cache.set(TOTAL_USERS_CACHE_KEY, User.objects.count(), 60)
 
-def update_total_earnings_cache():
-    total = UserSubscription.objects.filter(active=True).aggregate(total=models.Sum("plan__price"))["total"] or 0
-    cache.set(TOTAL_EARNINGS_CACHE_KEY, total, 60)
+# ---------------------------
+# Previous values
+# ---------------------------
+def _saved_fields(instance, fields, update_fields):
+    if update_fields is None:
+        return fields
+    saved = []
+    for attname in fields:
+        field = instance._meta.get_field(attname)
+        if field.name in update_fields or field.attname in update_fields:
+            saved.append(attname)
+    return tuple(saved)
 
-def update_total_verified_cache():
-    verified_count = User.objects.filter(is_verified=True).count()
-    cache.set(TOTAL_VERIFIED_CACHE_KEY, verified_count, 60)
-    unverified_count = User.objects.filter(is_verified=False).count()
-    cache.set(TOTAL_UNVERIFIED_CACHE_KEY, unverified_count, 60)
 
-# Signals
+def _load_previous(sender, instance, fields, update_fields):
+    """
+    Read the stored values of tracked fields about to be saved (one PK lookup).
+
+    Saves that don't touch tracked fields (last_activity, profile, ...) skip the
+    query. In-memory values are not trusted as "old" because another instance
+    of the same row may have saved in between.
+    """
+    instance._previous_values = {}
+    saved = _saved_fields(instance, fields, update_fields)
+    if instance.pk is None or not saved:
+        return
+    row = sender._base_manager.filter(pk=instance.pk).values(*saved).first()
+    instance._previous_values = row or {}
+
+
+def _changes(instance, fields, update_fields):
+    """Return {field: (old, new)} for saved tracked fields whose value changed."""
+    previous = getattr(instance, "_previous_values", {})
+    changes = {}
+    for f in _saved_fields(instance, fields, update_fields):
+        if f in previous and previous[f] != getattr(instance, f):
+            changes[f] = (previous[f], getattr(instance, f))
+    return changes
+
+
+# ---------------------------
+# User counters
+# ---------------------------
+def _verified_counter(is_verified):
+    return counters.TOTAL_VERIFIED if is_verified else counters.TOTAL_UNVERIFIED
+
+
+@receiver(pre_save, sender=User)
+def load_previous_user_values(sender, instance, update_fields=None, **kwargs):
+    _load_previous(sender, instance, USER_PREVIOUS_FIELDS, update_fields)
+
+
+@receiver(post_save, sender=User)
+def count_user_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        counters.apply_deltas({
+            counters.TOTAL_USERS: 1,
+            _verified_counter(instance.is_verified): 1,
+        })
+    else:
+        changes = _changes(instance, USER_TRACKED_FIELDS, update_fields)
+        if "is_verified" in changes:
+            old, new = changes["is_verified"]
+            counters.apply_deltas({_verified_counter(old): -1, _verified_counter(new): 1})
+
+
+@receiver(post_delete, sender=User)
+def count_user_delete(sender, instance, **kwargs):
+    counters.apply_deltas({
+        counters.TOTAL_USERS: -1,
+        _verified_counter(instance.is_verified): -1,
+    })
+
+
+# ---------------------------
+# Cached auth user
+# ---------------------------
+@receiver(post_save, sender=User)
+def invalidate_auth_user(sender, instance, created, update_fields=None, **kwargs):
+    if not created and _changes(instance, AUTH_INVALIDATING_FIELDS, update_fields):
+        user_id = instance.pk
+        transaction.on_commit(lambda: bump_auth_version(user_id))
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_auth_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: bump_auth_version(user_id))
+
+
+# ---------------------------
+# Presence
+# ---------------------------
 @receiver(post_save, sender=User)
+def invalidate_presence_display(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is None or set(update_fields) & set(DISPLAY_FIELDS):
+        user_id = instance.pk
+        transaction.on_commit(lambda: forget_display_row(user_id))
+
+
 @receiver(post_delete, sender=User)
-def refresh_user_caches(sender, instance, **kwargs):
-    update_total_users_cache()
-    update_total_verified_cache()
+def remove_deleted_presence(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: get_presence().remove(user_id))
+
+
+# ---------------------------
+# Cached user document
+# ---------------------------
+def _bump_document_on_commit(user_id):
+    transaction.on_commit(lambda: bump_user_document(user_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_document(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is None or set(update_fields) - set(USER_DOCUMENT_IGNORED_FIELDS):
+        _bump_document_on_commit(instance.pk)
 
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user_document(sender, instance, **kwargs):
+    _bump_document_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
 @receiver(post_save, sender=UserSubscription)
 @receiver(post_delete, sender=UserSubscription)
-def refresh_subscription_caches(sender, instance, **kwargs):
-    update_total_earnings_cache()
+def invalidate_owner_document(sender, instance, **kwargs):
+    _bump_document_on_commit(instance.user_id)
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+@receiver(post_delete, sender=SubscriptionPlan)
+def invalidate_all_documents(sender, instance, **kwargs):
+    transaction.on_commit(bump_plans_version)
+
+
+# ---------------------------
+# Admin search index
+# ---------------------------
+USER_SEARCH_FIELDS = tuple(f for f, _, _ in search.USER_FIELDS if "__" not in f)
+
+
+@receiver(post_save, sender=User)
+def index_user_for_search(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or set(update_fields) & set(USER_SEARCH_FIELDS):
+        search.schedule_user_index(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+def index_profile_for_search(sender, instance, **kwargs):
+    search.schedule_user_index(instance.user_id)
+
+
+@receiver(post_delete, sender=User)
+def unindex_deleted_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: search.remove(search.KIND_USER, [user_id]))
+
+
+# ---------------------------
+# Earnings counter
+# ---------------------------
+def _earnings_contribution(instance, active, plan_id) -> int:
+    """Cents an active subscription adds to total earnings."""
+    if not active or plan_id is None:
+        return 0
+    cached_plan = UserSubscription.plan.field.get_cached_value(instance, default=None)
+    if cached_plan is not None and cached_plan.pk == plan_id:
+        return counters.to_cents(cached_plan.price)
+    price = SubscriptionPlan.objects.filter(pk=plan_id).values_list("price", flat=True).first()
+    return counters.to_cents(price)
+
+
+@receiver(pre_save, sender=UserSubscription)
+def load_previous_subscription_values(sender, instance, update_fields=None, **kwargs):
+    _load_previous(sender, instance, SUBSCRIPTION_TRACKED_FIELDS, update_fields)
+
+
+@receiver(post_save, sender=UserSubscription)
+def count_subscription_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        delta = _earnings_contribution(instance, instance.active, instance.plan_id)
+    elif _changes(instance, SUBSCRIPTION_TRACKED_FIELDS, update_fields):
+        previous = instance._previous_values
+        old_active = previous.get("active", instance.active)
+        old_plan_id = previous.get("plan_id", instance.plan_id)
+        delta = (
+            _earnings_contribution(instance, instance.active, instance.plan_id)
+            - _earnings_contribution(instance, old_active, old_plan_id)
+        )
+    else:
+        delta = 0
+
+    counters.apply_deltas({counters.TOTAL_EARNINGS: delta})
+
+
+@receiver(post_delete, sender=UserSubscription)
+def count_subscription_delete(sender, instance, **kwargs):
+    delta = _earnings_contribution(instance, instance.active, instance.plan_id)
+    counters.apply_deltas({counters.TOTAL_EARNINGS: -delta})
@@ -0,0 +1,225 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+import messagebird
+import requests
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from messagebird.client import ENDPOINT, USER_AGENT
+from messagebird.http_client import HttpClient, ResponseFormat
+from messagebird.serde import json_serialize
+from requests.adapters import HTTPAdapter
+
+from .mailer import MAX_ATTEMPTS, RETRY_BASE_SECONDS
+from .models import OutboundSms
+
+logger = logging.getLogger(__name__)
+
+# MessageBird accepts up to 50 recipients per message
+MAX_RECIPIENTS_PER_MESSAGE = 50
+
+
+# ---------------------------
+# Transports
+# ---------------------------
+class PooledHttpClient(HttpClient):
+    """MessageBird HttpClient that reuses one keep-alive session and enforces timeouts."""
+
+    SUPPORTED_STATUS_CODES = (200, 201, 204, 401, 404, 405, 422)
+
+    def __init__(self, endpoint, access_key, user_agent, timeout=(3.05, 10), pool_size=4):
+        super().__init__(endpoint, access_key, user_agent)
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Authorization": "AccessKey " + access_key,
+            "User-Agent": user_agent,
+            "Content-Type": "application/json; charset=UTF-8",
+        })
+
+    def request(self, path, method="GET", params=None, format=ResponseFormat.text):
+        params = params or {}
+        url = self.endpoint.rstrip("/") + "/" + path.lstrip("/")
+        if method == "GET":
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        else:
+            response = self.session.request(
+                method, url, data=json_serialize(params), timeout=self.timeout
+            )
+
+        if response.status_code not in self.SUPPORTED_STATUS_CODES:
+            response.raise_for_status()
+        return response.content if format == ResponseFormat.binary else response.text
+
+
+class MessageBirdTransport:
+    """Sends through one long-lived MessageBird client per process."""
+
+    def __init__(self, access_key: str = None, originator: str = None):
+        access_key = access_key or settings.MESSAGEBIRD_API_KEY
+        if not access_key:
+            raise ImproperlyConfigured(
+                "MessageBird API key not configured. Set MESSAGEBIRD_API_KEY, or "
+                "SMS_TRANSPORT=account.sms.FakeTransport to send nothing."
+            )
+        self.originator = originator or settings.DEFAULT_FROM_NUMBER
+        self.client = messagebird.Client(
+            access_key, http_client=PooledHttpClient(ENDPOINT, access_key, USER_AGENT)
+        )
+
+    def send(self, recipients: List[str], body: str) -> str:
+        response = self.client.message_create(
+            originator=self.originator, recipients=recipients, body=body
+        )
+        return response.id
+
+
+class FakeTransport:
+    """Offline transport for tests and benchmarks; records calls, optional latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def send(self, recipients: List[str], body: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append((list(recipients), body))
+            return f"fake-{len(self.calls)}"
+
+
+# ---------------------------
+# Rate limiting
+# ---------------------------
+class TokenBucket:
+    """Blocking token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: int = None):
+        self.rate = rate
+        self.capacity = capacity or max(int(rate), 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# ---------------------------
+# Outbox
+# ---------------------------
+def enqueue_sms(phone: str, body: str) -> OutboundSms:
+    """Queue an SMS; it is sent by the outbox worker, never on the request path."""
+    return OutboundSms.objects.create(phone=phone, body=body)
+
+
+def _mark_failed_attempt(sms: OutboundSms, exc: Exception) -> None:
+    sms.attempts += 1
+    sms.last_error = str(exc)
+    if sms.attempts >= MAX_ATTEMPTS:
+        sms.status = OutboundSms.FAILED
+        logger.error("Giving up on SMS %s to %s: %s", sms.pk, sms.phone, exc)
+    else:
+        # Exponential backoff: 30s, 1m, 2m, 4m, ...
+        sms.next_attempt_at = timezone.now() + timedelta(
+            seconds=RETRY_BASE_SECONDS * 2 ** (sms.attempts - 1)
+        )
+    sms.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+
+
+class SmsDispatcher:
+    """
+    Drains the ``OutboundSms`` outbox.
+
+    Due messages that share a body are sent as one ``message_create`` call
+    (up to 50 recipients), and every provider call takes a token from the
+    rate limiter. A failed call is retried with backoff, like the e-mail outbox.
+    """
+
+    def __init__(self, transport, rate_per_second: float = 10, model=OutboundSms):
+        self.transport = transport
+        self.bucket = TokenBucket(rate_per_second)
+        # the outbox model; benchmarks pass a scratch copy of OutboundSms
+        self.model = model
+
+    def send_pending(self, batch_size: int = 500) -> Tuple[int, int]:
+        """Send one batch of due messages. Returns ``(sent, failed)``."""
+        sent = failed = 0
+        with transaction.atomic():
+            # other workers skip locked rows
+            batch = list(
+                self.model.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboundSms.PENDING, next_attempt_at__lte=timezone.now())
+                .order_by("next_attempt_at")[:batch_size]
+            )
+            by_body: "OrderedDict[str, OrderedDict[str, List[OutboundSms]]]" = OrderedDict()
+            for sms in batch:
+                by_body.setdefault(sms.body, OrderedDict()).setdefault(sms.phone, []).append(sms)
+
+            for body, by_phone in by_body.items():
+                phones = list(by_phone)
+                for i in range(0, len(phones), MAX_RECIPIENTS_PER_MESSAGE):
+                    chunk = phones[i:i + MAX_RECIPIENTS_PER_MESSAGE]
+                    messages = [sms for phone in chunk for sms in by_phone[phone]]
+                    self.bucket.acquire()
+                    try:
+                        message_id = self.transport.send(chunk, body)
+                    except messagebird.client.ErrorException as e:
+                        logger.error(f"MessageBird Error: {e.errors}")
+                        error = e
+                    except Exception as e:
+                        logger.error(f"Unexpected SMS send error for {chunk}: {e}")
+                        error = e
+                    else:
+                        logger.info(f"SMS sent to {len(chunk)} recipient(s): {message_id}")
+                        self.model.objects.filter(pk__in=[sms.pk for sms in messages]).update(
+                            status=OutboundSms.SENT, sent_at=timezone.now(),
+                            message_id=message_id, attempts=F("attempts") + 1,
+                        )
+                        sent += len(messages)
+                        continue
+                    for sms in messages:
+                        _mark_failed_attempt(sms, error)
+                    failed += len(messages)
+
+        if sent or failed:
+            logger.info("SMS outbox batch: %d sent, %d failed", sent, failed)
+        return sent, failed
+
+
+_dispatcher: Optional[SmsDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_sms_dispatcher() -> SmsDispatcher:
+    """Return the per-process dispatcher using the ``SMS_TRANSPORT`` class."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                transport_class = import_string(settings.SMS_TRANSPORT)
+                _dispatcher = SmsDispatcher(
+                    transport_class(), rate_per_second=settings.SMS_RATE_PER_SECOND
+                )
+    return _dispatcher
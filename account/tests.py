@@ -1,3 +1,1051 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+import jwt
+from asgiref.sync import sync_to_async
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from jwt.algorithms import RSAAlgorithm
+from PIL import Image
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account import counters, deletion, hashing, images, mailer, otp, search, sms
+from account.activity import LastActivityTracker, LocalActivityBuffer
+from account.analytics import ActivityAnalytics, HyperLogLog
+from account.authentication import CachedJWTAuthentication, bump_auth_version
+from account.deletion import run_account_deletion
+from account.documents import get_user_document
+from account.exports import claimable_exports, run_data_export
+from account.jwks import JWKSCache
+from account.managers import IDENTIFIER_EMAIL, IDENTIFIER_PHONE, IDENTIFIER_USERNAME, identifier_type
+from account.models import AccountDeletion, DashboardCounter, DataExport, OutboundEmail, OutboundSms, User, UserProfile
+from account.presence import Presence
+from account.providers import ProviderClient, get_provider_client
+from account.serializers import UpdateProfileSerializer, UserSerializer, save_profile
+from account.utils import send_otp_sms, validate_google
+from core.cache import CachedValue
+from core.pagination import EstimatedCountPaginator, KeysetPagination, estimated_count
+from privacy.models import ShareThoughts
+from subscription.models import SubscriptionPlan, UserSubscription
+from supplychain.models import Supplier
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class DashboardQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@example.com", password="pass12345", full_name="Admin", is_staff=True
+        )
+        basic = SubscriptionPlan.objects.create(name=SubscriptionPlan.BASIC, price="9.99")
+        pro = SubscriptionPlan.objects.create(name=SubscriptionPlan.PRO, price="19.99")
+        for i in range(30):
+            user = User.objects.create_user(
+                email=f"user{i}@example.com", password="pass12345", full_name=f"User {i}"
+            )
+            UserSubscription.objects.create(user=user, plan=basic, active=False)
+            UserSubscription.objects.create(user=user, plan=pro, active=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        # Warm the cached dashboard totals so only the page itself is measured
+        self.client.get("/v1/account/dashboard/", {"page_size": 1})
+
+    def _count_queries(self, page_size):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/v1/account/dashboard/", {"page_size": page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]["users"]), page_size)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        small = self._count_queries(5)
+        large = self._count_queries(25)
+        self.assertEqual(small, large)
+        # page + subscriptions with plans
+        self.assertEqual(large, 2)
+
+    def test_subscriptions_are_serialized_per_user(self):
+        response = self.client.get("/v1/account/dashboard/", {"page_size": 5})
+        for user in response.data["results"]["users"]:
+            if user["email"] == self.admin.email:
+                self.assertEqual(user["subscriptions"], [])
+            else:
+                self.assertEqual(
+                    [s["plan_name"] for s in user["subscriptions"]],
+                    [SubscriptionPlan.PRO, SubscriptionPlan.BASIC],
+                )
+
+
+class LastActivityTrackerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="active@example.com", password=None, full_name="Active")
+        self.tracker = LastActivityTracker(buffer=LocalActivityBuffer(), throttle_seconds=60, flush_interval=0)
+
+    def test_records_are_throttled_and_flushed_in_bulk(self):
+        self.assertTrue(self.tracker.record(self.user.pk))
+        self.assertFalse(self.tracker.record(self.user.pk))
+        self.assertEqual(self.tracker.flush(), 1)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_activity)
+        self.assertEqual(self.tracker.flush(), 0)
+
+    def test_exit_flush_skips_a_different_database(self):
+        self.tracker.record(self.user.pk)
+        self.tracker._database_name = "torn-down-test-database"
+        self.tracker._flush_at_exit()
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.last_activity)
+
+
+class DashboardCounterTests(TestCase):
+    def setUp(self):
+        self.plan = SubscriptionPlan.objects.create(name=SubscriptionPlan.PRO, price="19.99")
+
+    def test_saves_keep_counters_equal_to_a_recount(self):
+        user = User.objects.create_user(email="count@example.com", password=None, full_name="Count")
+        user.is_verified = True
+        user.save(update_fields=["is_verified"])
+        subscription = UserSubscription.objects.create(user=user, plan=self.plan, active=True)
+        self.assertEqual(counters.get_counters(), counters.compute_counters())
+        self.assertEqual(counters.get_counters()[counters.TOTAL_EARNINGS], 1999)
+
+        subscription.active = False
+        subscription.save()
+        user.delete()
+        self.assertEqual(counters.get_counters(), counters.compute_counters())
+
+    def test_reconcile_fixes_drift(self):
+        User.objects.create_user(email="drift@example.com", password=None, full_name="Drift")
+        DashboardCounter.objects.filter(name=counters.TOTAL_USERS).update(value=42)
+        drift = counters.reconcile()
+        self.assertEqual(drift[counters.TOTAL_USERS], {"before": 42, "after": 1})
+        self.assertEqual(counters.reconcile(), {})
+
+
+class CachedValueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = []
+        self.value = CachedValue("tests:cached", lambda: self.calls.append(1) or len(self.calls), soft_ttl=60)
+
+    def test_computes_once_and_serves_from_cache(self):
+        self.assertEqual(self.value.get(), 1)
+        self.assertEqual(self.value.get(), 1)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_lock_is_only_released_by_its_holder(self):
+        stale_token = self.value._acquire_lock()
+        self.assertIsNotNone(stale_token)
+        self.assertIsNone(self.value._acquire_lock())
+        # the first holder's lock expired and another worker took it
+        cache.delete(self.value.lock_key)
+        current_token = self.value._acquire_lock()
+        self.value._release_lock(stale_token)
+        self.assertEqual(cache.get(self.value.lock_key), current_token)
+        self.value._release_lock(current_token)
+        self.assertIsNone(cache.get(self.value.lock_key))
+
+
+class OTPStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.email = "otp@example.com"
+
+    def test_code_is_consumed_once(self):
+        code = otp.issue_otp(otp.PURPOSE_VERIFY_EMAIL, self.email)
+        self.assertTrue(otp.verify_otp(otp.PURPOSE_VERIFY_EMAIL, "OTP@example.com ", code))
+        self.assertFalse(otp.verify_otp(otp.PURPOSE_VERIFY_EMAIL, self.email, code))
+
+    def test_codes_are_scoped_by_purpose(self):
+        code = otp.issue_otp(otp.PURPOSE_RESET_PASSWORD, self.email)
+        self.assertFalse(otp.verify_otp(otp.PURPOSE_VERIFY_EMAIL, self.email, code))
+
+    def test_expired_code_is_rejected(self):
+        code = otp.issue_otp(otp.PURPOSE_VERIFY_EMAIL, self.email, expiry_minutes=0)
+        self.assertFalse(otp.verify_otp(otp.PURPOSE_VERIFY_EMAIL, self.email, code))
+
+    def test_too_many_wrong_guesses_revoke_the_code(self):
+        code = otp.issue_otp(otp.PURPOSE_VERIFY_EMAIL, self.email, code="123456")
+        for _ in range(otp.MAX_ATTEMPTS):
+            self.assertFalse(otp.verify_otp(otp.PURPOSE_VERIFY_EMAIL, self.email, "000000"))
+        self.assertFalse(otp.verify_otp(otp.PURPOSE_VERIFY_EMAIL, self.email, code))
+
+    def test_verify_endpoint_requires_the_email(self):
+        user = User.objects.create_user(email=self.email, password=None, full_name="OTP")
+        code = user.set_otp(otp.PURPOSE_VERIFY_EMAIL)
+        client = APIClient()
+        response = client.post("/v1/account/verify-otp/registration/", {"otp": code}, format="json")
+        self.assertEqual(response.status_code, 400)
+        response = client.post(
+            "/v1/account/verify-otp/registration/", {"otp": code, "email": self.email}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.is_verified)
+
+
+@override_settings(
+    EMAIL_OUTBOX_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    DEFAULT_FROM_EMAIL="noreply@example.com",
+)
+class EmailOutboxTests(TestCase):
+    def test_queued_email_is_sent_by_the_worker(self):
+        email = mailer.enqueue_email("Your code", "123456", "queued@example.com")
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(mailer.send_pending(), (1, 0))
+        self.assertEqual(mail.outbox[0].to, ["queued@example.com"])
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.SENT)
+        self.assertEqual(mailer.send_pending(), (0, 0))
+
+    def test_failed_send_is_retried_with_backoff(self):
+        email = mailer.enqueue_email("Your code", "123456", "retry@example.com")
+        with mock.patch.object(EmailBackend, "send_messages", side_effect=OSError("smtp down")):
+            self.assertEqual(mailer.send_pending(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("smtp down", email.last_error)
+        # not due again until the backoff has passed
+        self.assertEqual(mailer.send_pending(), (0, 0))
+
+        OutboundEmail.objects.filter(pk=email.pk).update(
+            attempts=mailer.MAX_ATTEMPTS - 1, next_attempt_at=timezone.now()
+        )
+        with mock.patch.object(EmailBackend, "send_messages", side_effect=OSError("smtp down")):
+            mailer.send_pending()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.FAILED)
+
+
+class SmsOutboxTests(TestCase):
+    def setUp(self):
+        self.transport = sms.FakeTransport()
+        self.dispatcher = sms.SmsDispatcher(self.transport, rate_per_second=1000)
+
+    def test_identical_bodies_share_one_provider_call(self):
+        for phone in ("+4520000001", "+4520000002", "+4520000002"):
+            self.assertTrue(send_otp_sms(phone, "Sale today"))
+        sms.enqueue_sms("+4520000003", "Your code is 123456")
+        self.assertEqual(self.transport.calls, [])
+
+        self.assertEqual(self.dispatcher.send_pending(), (4, 0))
+        self.assertEqual(self.transport.calls, [
+            (["+4520000001", "+4520000002"], "Sale today"),
+            (["+4520000003"], "Your code is 123456"),
+        ])
+        self.assertFalse(OutboundSms.objects.exclude(status=OutboundSms.SENT).exists())
+        self.assertEqual(self.dispatcher.send_pending(), (0, 0))
+
+    def test_failed_call_is_retried_with_backoff(self):
+        message = sms.enqueue_sms("+4520000001", "Your code is 123456")
+        with mock.patch.object(self.transport, "send", side_effect=OSError("provider down")):
+            self.assertEqual(self.dispatcher.send_pending(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboundSms.PENDING, 1))
+        self.assertGreater(message.next_attempt_at, message.created_at)
+        self.assertEqual(self.dispatcher.send_pending(), (0, 0))
+
+    @override_settings(MESSAGEBIRD_API_KEY=None, SMS_TRANSPORT="account.sms.MessageBirdTransport")
+    def test_missing_api_key_is_a_configuration_error(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "MESSAGEBIRD_API_KEY"):
+            sms.MessageBirdTransport()
+        with mock.patch.object(sms, "_dispatcher", None), \
+                self.assertRaisesMessage(CommandError, "MESSAGEBIRD_API_KEY"):
+            call_command("send_queued_sms", stdout=StringIO())
+
+
+class SmsBenchTests(TransactionTestCase):
+    def test_bench_leaves_queued_messages_alone(self):
+        queued = sms.enqueue_sms("+4520000001", "Your code is 123456")
+
+        out = StringIO()
+        call_command("bench_sms", messages=60, distinct_bodies=2, latency=0, rate=1000, stdout=out)
+
+        self.assertIn("provider calls:    2", out.getvalue())
+        self.assertEqual(list(OutboundSms.objects.values_list("pk", "status")), [(queued.pk, OutboundSms.PENDING)])
+        self.assertNotIn("bench_sms_outbox", connection.introspection.table_names())
+
+
+@override_settings(GOOGLE_CLIENT_IDS=["web-client"])
+class GoogleTokenTests(TestCase):
+    def setUp(self):
+        self.now = int(time.time())
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = RSAAlgorithm.to_jwk(self.private_key.public_key(), as_dict=True)
+        jwk["kid"] = "test-key"
+        self.fetches = []
+        jwks = JWKSCache(
+            "https://jwks.test/certs",
+            fetcher=lambda url: self.fetches.append(url) or ({"keys": [jwk]}, 3600),
+        )
+        patcher = mock.patch("account.jwks.google_jwks", jwks)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def token(self, kid="test-key", **claims):
+        payload = {
+            "iss": "https://accounts.google.com", "aud": "web-client", "email": "g@example.com",
+            "email_verified": True, "name": "G", "iat": self.now, "exp": self.now + 300,
+        }
+        payload.update(claims)
+        return jwt.encode(payload, self.private_key, algorithm="RS256", headers={"kid": kid})
+
+    def test_valid_token(self):
+        self.assertEqual(validate_google(self.token())["email"], "g@example.com")
+        self.assertEqual(len(self.fetches), 1)
+
+    def test_rejects_wrong_audience_expired_token_and_unknown_key(self):
+        self.assertIsNone(validate_google(self.token(aud="other-app")))
+        self.assertIsNone(validate_google(self.token(iat=self.now - 600, exp=self.now - 300)))
+        self.assertIsNone(validate_google(self.token(kid="forged")))
+        # the unknown kid triggered at most one refetch
+        self.assertEqual(len(self.fetches), 1)
+
+    def test_rejects_every_token_without_client_ids(self):
+        with override_settings(GOOGLE_CLIENT_IDS=[]):
+            self.assertIsNone(validate_google(self.token()))
+
+
+class _ProviderStub(BaseHTTPRequestHandler):
+    """Local stand-in for a social provider API: /slow stalls, /error fails."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.seen.append((self.path, self.headers.get("Authorization"), self.client_address[1]))
+        path = urlparse(self.path).path
+        if path == "/slow":
+            time.sleep(0.5)
+        status, body = (500, b'{"error": "boom"}') if path == "/error" else (200, b'{"id": "42"}')
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # the client gave up (timeout test)
+
+    def log_message(self, *args):
+        pass
+
+
+class ProviderClientTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ProviderStub)
+        cls.server.daemon_threads = True
+        cls.server.seen = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.server.seen.clear()
+        self.provider = ProviderClient(connect_timeout=1, read_timeout=0.2)
+        self.addCleanup(self.provider.session.close)
+
+    def test_requests_reuse_one_pooled_connection(self):
+        for _ in range(3):
+            self.assertEqual(self.provider.get_json("google", f"{self.base_url}/me", access_token="token"), {"id": "42"})
+        self.assertEqual(len(self.server.seen), 3)
+        self.assertEqual(len({port for _, _, port in self.server.seen}), 1)
+        self.assertEqual(self.server.seen[0][1], "Bearer token")
+
+        self.provider.get_json("facebook", f"{self.base_url}/me", access_token="token", token_param="access_token")
+        self.assertEqual(self.server.seen[-1][:2], ("/me?access_token=token", None))
+
+    def test_cached_response_skips_the_request_until_it_expires(self):
+        url = f"{self.base_url}/me"
+        self.assertEqual(self.provider.get_json("google", url, access_token="secret", cache_ttl=60), {"id": "42"})
+        self.assertEqual(self.provider.get_json("google", url, access_token="secret", cache_ttl=60), {"id": "42"})
+        self.assertEqual(len(self.server.seen), 1)
+        stats = self.provider.metrics.snapshot()["google"]
+        self.assertEqual((stats["requests"], stats["cache_hits"], stats["errors"]), (1, 1, 0))
+        self.assertFalse(any("secret" in key for key in cache._cache))
+
+        self.provider.get_json("google", url, access_token="other", cache_ttl=60)
+        self.assertEqual(len(self.server.seen), 2)
+
+        later = time.time() + 61
+        with mock.patch("django.core.cache.backends.locmem.time", SimpleNamespace(time=lambda: later)):
+            self.provider.get_json("google", url, access_token="secret", cache_ttl=60)
+        self.assertEqual(len(self.server.seen), 3)
+
+    def test_timeout_is_reported_as_a_failed_lookup(self):
+        with self.assertLogs("account.providers", "WARNING"):
+            self.assertIsNone(self.provider.get_json("apple", f"{self.base_url}/slow", access_token="token"))
+        stats = self.provider.metrics.snapshot()["apple"]
+        self.assertEqual((stats["requests"], stats["errors"]), (1, 1))
+        self.assertGreaterEqual(stats["max_ms"], 200)
+
+    def test_error_response_is_not_cached(self):
+        url = f"{self.base_url}/error"
+        for _ in range(2):
+            self.assertIsNone(self.provider.get_json("google", url, access_token="token", cache_ttl=60))
+        self.assertEqual(len(self.server.seen), 2)
+        stats = self.provider.metrics.snapshot()["google"]
+        self.assertEqual((stats["requests"], stats["errors"], stats["cache_hits"]), (2, 2, 0))
+
+
+class ProviderMetricsTests(TestCase):
+    def test_metrics_are_admin_only(self):
+        get_provider_client().metrics.observe("google", 0.05, ok=False)
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email="plain@example.com", password=None, full_name="Plain"))
+        self.assertEqual(client.get("/v1/account/stats/providers/").status_code, 403)
+
+        client.force_authenticate(
+            User.objects.create_user(email="staff@example.com", password=None, full_name="Staff", is_staff=True)
+        )
+        response = client.get("/v1/account/stats/providers/")
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(response.json()["google"]["errors"], 1)
+
+
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="auth@example.com", password=None, full_name="Auth")
+        self.token = AccessToken.for_user(self.user)
+        self.auth = CachedJWTAuthentication()
+
+    def test_repeat_requests_are_served_from_cache(self):
+        self.assertEqual(self.auth.get_user(self.token).pk, self.user.pk)
+        with self.assertNumQueries(0):
+            user = self.auth.get_user(self.token)
+        self.assertEqual(user.email, "auth@example.com")
+
+    def test_deactivating_a_user_invalidates_the_entry(self):
+        self.auth.get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    def test_bumped_version_reloads_changed_columns(self):
+        self.auth.get_user(self.token)
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        self.assertFalse(self.auth.get_user(self.token).is_staff)
+        bump_auth_version(self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(self.auth.get_user(self.token).is_staff)
+
+
+class IdentifierLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="Mixed.Case@Example.com", phone="+4520000001", username="MixedUser", password=None, full_name="Mixed"
+        )
+        cls.numeric = User.objects.create_user(username="123456789", password=None, full_name="Numeric")
+
+    def test_identifier_type(self):
+        self.assertEqual(identifier_type("a@example.com"), IDENTIFIER_EMAIL)
+        self.assertEqual(identifier_type("+4520000001"), IDENTIFIER_PHONE)
+        self.assertEqual(identifier_type("someone"), IDENTIFIER_USERNAME)
+
+    def test_each_kind_resolves_case_insensitively(self):
+        for identifier in ("mixed.case@example.com", " MIXED.CASE@EXAMPLE.COM ", "+4520000001", "mixeduser", "MIXEDUSER"):
+            with self.subTest(identifier=identifier):
+                self.assertEqual(User.objects.get_by_identifier(identifier), self.user)
+        # phone-shaped but no such phone: retried as a username
+        self.assertEqual(User.objects.get_by_identifier("123456789"), self.numeric)
+
+    def test_unknown_identifier_raises(self):
+        for identifier in ("nobody@example.com", "+4529999999", "nobody", "", None):
+            with self.subTest(identifier=identifier), self.assertRaises(User.DoesNotExist):
+                User.objects.get_by_identifier(identifier)
+        self.assertIsNone(authenticate(username="nobody@example.com", password="secret123"))
+
+    async def test_async_variant_matches(self):
+        for identifier in ("MIXED.case@example.com", "+4520000001", "mixeduser", "123456789"):
+            with self.subTest(identifier=identifier):
+                self.assertEqual(
+                    await User.objects.aget_by_identifier(identifier),
+                    await sync_to_async(User.objects.get_by_identifier)(identifier),
+                )
+        with self.assertRaises(User.DoesNotExist):
+            await User.objects.aget_by_identifier("nobody@example.com")
+
+    def test_lookups_use_the_lower_indexes(self):
+        constraints = connection.introspection.get_constraints(connection.cursor(), User._meta.db_table)
+        self.assertTrue({"user_email_lower_idx", "user_username_lower_idx"} <= set(constraints))
+        with CaptureQueriesContext(connection) as queries:
+            User.objects.get_by_identifier("MIXED.CASE@example.com")
+        self.assertEqual(len(queries), 1)
+        self.assertIn('LOWER("account_user"."email") = ', queries[0]["sql"].replace("'", '"'))
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        stamp = timezone.now()
+        for i in range(7):
+            User.objects.create_user(email=f"page{i}@example.com", password=None, full_name=f"Page {i}")
+        # ties on the sort key must be broken by the primary key
+        User.objects.filter(pk__in=list(User.objects.values_list("pk", flat=True)[:4])).update(created_at=stamp)
+        cls.admin = User.objects.create_user(
+            email="pager@example.com", password=None, full_name="Admin", is_staff=True
+        )
+
+    def paginate(self, url):
+        paginator = KeysetPagination()
+        rows = paginator.paginate_queryset(User.objects.all(), Request(APIRequestFactory().get(url)))
+        return [user.pk for user in rows], paginator
+
+    def test_pages_cover_every_row_once_in_both_directions(self):
+        expected = list(User.objects.order_by("-created_at", "-pk").values_list("pk", flat=True))
+        seen, pages, url = [], [], "/users/?page_size=3"
+        while url:
+            ids, paginator = self.paginate(url)
+            seen += ids
+            pages.append(ids)
+            url = paginator.get_next_link()
+        self.assertEqual(seen, expected)
+
+        ids, paginator = self.paginate(self.paginate("/users/?page_size=3")[1].get_next_link())
+        ids, paginator = self.paginate(paginator.get_previous_link())
+        self.assertEqual(ids, pages[0])
+        self.assertIsNone(paginator.get_previous_link())
+
+    def test_seek_bounds_the_leading_column(self):
+        after = KeysetPagination._after([timezone.now(), 5], ["-created_at", "-pk"])
+        query = str(User.objects.filter(after).query)
+        self.assertIn('"created_at" <=', query)
+
+    def test_tampered_cursor_is_a_404(self):
+        with self.assertRaises(NotFound):
+            self.paginate("/users/?cursor=not-a-cursor")
+
+        cursor = parse_qs(urlparse(self.paginate("/users/?page_size=3")[1].get_next_link()).query)["cursor"][0]
+        tampered = cursor[:-2] + ("AA" if cursor[-2:] != "AA" else "BB")
+        with self.assertRaises(NotFound):
+            self.paginate(f"/users/?cursor={tampered}")
+
+    def test_invalid_cursor_on_admin_lists_is_a_404_not_a_500(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        for url in ("/v1/account/dashboard/", "/v1/subscription/admin/earnings/"):
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url, {"cursor": "garbage"}).status_code, 404)
+
+
+class EstimatedCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="root@example.com", password=None, full_name="Root")
+        for i in range(3):
+            User.objects.create_user(email=f"count{i}@example.com", password=None, full_name=f"Count {i}")
+
+    def test_exact_count_without_a_planner_estimate(self):
+        # SQLite has no planner estimate
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(estimated_count(User.objects.all()), 4)
+        self.assertEqual(len(queries), 1)
+        self.assertIn("COUNT(", queries[0]["sql"].upper())
+
+    def test_estimate_only_for_large_unfiltered_tables(self):
+        with mock.patch("core.pagination._planner_estimate", return_value=50000) as planner:
+            self.assertEqual(estimated_count(User.objects.all(), threshold=10000), 50000)
+            self.assertEqual(estimated_count(User.objects.filter(is_staff=True), threshold=10000), 1)
+            self.assertEqual(estimated_count(User.objects.all(), threshold=100000), 4)
+        self.assertEqual(planner.call_count, 2)  # never consulted for the filtered queryset
+
+    def test_admin_changelist_uses_the_estimate(self):
+        self.client.force_login(self.admin)
+        with mock.patch("core.pagination._planner_estimate", return_value=50000):
+            response = self.client.get("/admin/account/user/")
+            filtered = self.client.get("/admin/account/user/", {"is_staff__exact": "1"})
+        self.assertEqual(response.status_code, 200)
+        changelist = response.context["cl"]
+        self.assertIsInstance(changelist.paginator, EstimatedCountPaginator)
+        self.assertEqual(changelist.result_count, 50000)
+        self.assertFalse(changelist.show_full_result_count)
+        self.assertEqual(filtered.context["cl"].result_count, 1)
+
+
+class ProfilePictureProcessingTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(email="pic@example.com", password=None, full_name="Pic")
+        self.source = self.upload(self.user, "profile/picture.jpg", "red")
+
+    @staticmethod
+    def upload(user, name, color):
+        image = Image.new("RGB", (400, 300), color)
+        exif = Image.Exif()
+        exif[0x010F] = "Test Camera"  # Make
+        out = BytesIO()
+        image.save(out, format="JPEG", exif=exif)
+        stored = default_storage.save(name, ContentFile(out.getvalue()))
+        User.objects.filter(pk=user.pk).update(profile_pic=stored, profile_pic_derivatives={})
+        return stored
+
+    @staticmethod
+    def pixel(name):
+        with default_storage.open(name) as f, Image.open(f) as img:
+            return img.convert("RGB").getpixel((10, 10))
+
+    def test_stripped_copy_replaces_the_original(self):
+        derivatives = images.process_profile_picture(self.user.pk)
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.profile_pic.name, self.source)
+        self.assertFalse(default_storage.exists(self.source))
+        with default_storage.open(self.user.profile_pic.name) as f, Image.open(f) as img:
+            self.assertNotIn(0x010F, img.getexif())
+        self.assertEqual(set(derivatives), {"avatar", "thumbnail"})
+        self.assertTrue(all(default_storage.exists(name) for name in derivatives.values()))
+
+    def test_same_upload_name_from_two_users_keeps_derivatives_apart(self):
+        other = User.objects.create_user(email="pic2@example.com", password=None, full_name="Other")
+        mine = images.process_profile_picture(self.user.pk)
+        # the first original was replaced by its stripped copy, so the name is free again
+        self.assertEqual(self.upload(other, "profile/picture.jpg", "blue"), self.source)
+        theirs = images.process_profile_picture(other.pk)
+
+        self.assertFalse(set(mine.values()) & set(theirs.values()))
+        red, blue = self.pixel(mine["avatar"]), self.pixel(theirs["avatar"])
+        self.assertGreater(red[0], red[2])
+        self.assertGreater(blue[2], blue[0])
+
+    def test_reprocessing_removes_only_the_previous_derivatives(self):
+        first = images.process_profile_picture(self.user.pk)
+        unrelated = default_storage.save(f"{images.DERIVATIVE_DIR}/unrelated.webp", ContentFile(b"x"))
+        second = images.process_profile_picture(self.user.pk)
+
+        self.assertFalse(any(default_storage.exists(name) for name in first.values()))
+        self.assertTrue(all(default_storage.exists(name) for name in second.values()))
+        self.assertTrue(default_storage.exists(unrelated))
+
+    def test_replaced_picture_is_left_alone(self):
+        render = images.render_derivatives
+
+        def replace_then_render(data):
+            User.objects.filter(pk=self.user.pk).update(profile_pic="profile/newer.jpg")
+            return render(data)
+
+        with mock.patch.object(images, "render_derivatives", side_effect=replace_then_render):
+            self.assertEqual(images.process_profile_picture(self.user.pk), {})
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_pic.name, "profile/newer.jpg")
+        self.assertTrue(default_storage.exists(self.source))
+        self.assertEqual(default_storage.listdir("profile")[1], ["picture.jpg"])
+        self.assertEqual(default_storage.listdir(images.DERIVATIVE_DIR)[1], [])
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class AsyncAuthViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_signup_then_login(self):
+        response = self.client.post("/v1/account/signup/", {
+            "full_name": "New", "email": "new@example.com", "password": "secret123", "confirm_password": "secret123",
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(email="new@example.com").check_password("secret123"))
+
+        response = self.client.post("/v1/account/login/", {"email": "NEW@example.com", "password": "secret123"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()["data"]
+        self.assertEqual(body["user"]["email"], "new@example.com")
+        self.assertIn("access", body["tokens"])
+
+        response = self.client.post("/v1/account/login/", {"email": "new@example.com", "password": "wrong123"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_reset_password_requires_a_token_and_rehashes(self):
+        user = User.objects.create_user(email="reset@example.com", password="old-secret", full_name="Reset")
+        payload = {"new_password": "new-secret", "confirm_password": "new-secret"}
+        self.assertEqual(self.client.post("/v1/account/reset-password/", payload, format="json").status_code, 401)
+
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.post("/v1/account/reset-password/", payload, format="json").status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password("new-secret"))
+
+    def test_full_hashing_pool_answers_503(self):
+        User.objects.create_user(email="busy@example.com", password="secret123", full_name="Busy")
+        with mock.patch.object(hashing, "_pool", hashing.PasswordHasherPool(workers=1, max_pending=0)), \
+                self.assertLogs("django.request", "ERROR"):
+            response = self.client.post("/v1/account/login/", {"email": "busy@example.com", "password": "secret123"}, format="json")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn(hashing.HashingBusy.default_detail, response.content.decode())
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class UserImportExportTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = lambda name: os.path.join(directory, name)
+
+    def import_users(self, path):
+        out = StringIO()
+        call_command("import_users", path, workers=1, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_export_then_import_round_trip(self):
+        user = User.objects.create_user(
+            email="round@example.com", phone="+4520000001", username="round", full_name="Round Trip",
+            is_verified=True,
+        )
+        UserProfile.objects.create(user=user, bio="Roofer", company_name="Round ApS")
+        User.objects.create_user(email="second@example.com", password=None, full_name="Second")
+        exported = list(User.objects.order_by("pk").values("email", "phone", "username", "full_name", "is_verified", "created_at"))
+
+        call_command("export_users", self.path("users.csv"), stderr=StringIO())
+        User.objects.all().delete()
+        self.assertIn("Imported 2, skipped 0 existing, 0 invalid", self.import_users(self.path("users.csv")))
+
+        imported = list(User.objects.order_by("email").values("email", "phone", "username", "full_name", "is_verified", "created_at"))
+        self.assertEqual(imported, sorted(exported, key=lambda row: row["email"]))
+        profile = UserProfile.objects.get(user__email="round@example.com")
+        self.assertEqual((profile.bio, profile.company_name), ("Roofer", "Round ApS"))
+        self.assertFalse(User.objects.get(email="round@example.com").has_usable_password())
+
+    def test_duplicates_invalid_rows_and_passwords(self):
+        User.objects.create_user(email="taken@example.com", username="Taken", password=None, full_name="Taken")
+        rows = [
+            {"email": "TAKEN@example.com"},
+            {"username": "taken"},
+            {"email": "new@example.com", "password": "secret123"},
+            {"email": "New@Example.com"},
+            {"phone": "123"},
+            {"full_name": "No identifier"},
+            {"username": "hashed", "password_hash": make_password("from-elsewhere")},
+        ]
+        with open(self.path("users.ndjson"), "w") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+
+        self.assertIn("Imported 2, skipped 3 existing, 2 invalid", self.import_users(self.path("users.ndjson")))
+        self.assertEqual(User.objects.filter(email__iexact="taken@example.com").count(), 1)
+        self.assertEqual(User.objects.filter(email__iexact="new@example.com").count(), 1)
+        self.assertTrue(User.objects.get(email="new@example.com").check_password("secret123"))
+        self.assertTrue(User.objects.get(username="hashed").check_password("from-elsewhere"))
+        # bulk_create skips the counter signals; the command reconciles at the end
+        self.assertEqual(counters.get_counters(), counters.compute_counters())
+        self.assertEqual(counters.get_counters()[counters.TOTAL_USERS], 3)
+
+
+class ActivityAnalyticsTests(TestCase):
+    def test_sketch_estimate_is_close_and_ignores_repeats(self):
+        sketch = HyperLogLog()
+        for _ in range(2):
+            for user_id in range(20000):
+                sketch.add(user_id)
+        self.assertLess(abs(sketch.count() - 20000), 20000 * 0.03)
+
+    def test_stats_windows(self):
+        now = datetime(2026, 10, 18, 12, 0, tzinfo=dt_timezone.utc)
+        analytics = ActivityAnalytics()
+        analytics.record(1, now - timedelta(minutes=1))
+        analytics.record(1, now)
+        analytics.record(2, now - timedelta(minutes=10))
+        analytics.record(3, now - timedelta(days=3))
+        analytics.record(4, now - timedelta(days=20))
+        analytics.record(5, now - timedelta(days=40))
+        self.assertEqual(analytics.stats(now), {
+            "online_now": 1,
+            "daily_active_users": 2,
+            "weekly_active_users": 3,
+            "monthly_active_users": 4,
+        })
+
+    def test_store_errors_do_not_break_requests(self):
+        store = mock.Mock()
+        store.add.side_effect = ConnectionError("redis down")
+        ActivityAnalytics(store=store).record(1)
+
+
+class OnlineUsersTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.presence = Presence(retention_seconds=3600)
+        patcher = mock.patch("account.views.get_presence", return_value=self.presence)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = time.time()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(email="ops@example.com", password=None, full_name="Ops", is_staff=True)
+        )
+
+    def test_lists_recent_users_newest_first(self):
+        recent = User.objects.create_user(email="recent@example.com", password=None, full_name="Recent")
+        earlier = User.objects.create_user(email="earlier@example.com", password=None, full_name="Earlier")
+        gone = User.objects.create_user(email="gone@example.com", password=None, full_name="Gone")
+        self.presence.touch(recent.pk, self.now - 10)
+        self.presence.touch(earlier.pk, self.now - 60)
+        self.presence.touch(gone.pk, self.now - 600)
+
+        response = self.client.get("/v1/account/online-users/", {"minutes": 5})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["count"], 2)
+        self.assertEqual([row["email"] for row in body["results"]], ["recent@example.com", "earlier@example.com"])
+
+    def test_rejects_invalid_minutes(self):
+        for minutes in ("abc", "nan", "inf", "-inf", "0", "-5"):
+            response = self.client.get("/v1/account/online-users/", {"minutes": minutes})
+            self.assertEqual(response.status_code, 400, minutes)
+
+
+class AccountDeletionTests(TestCase):
+    def setUp(self):
+        self.executor = mock.Mock()
+        patcher = mock.patch("account.deletion._get_executor", return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(email="leaving@example.com", password=None, full_name="Leaving")
+        for i in range(3):
+            ShareThoughts.objects.create(user=self.user, thoughts=f"thought {i}")
+        Supplier.objects.create(supervisor=self.user, supplier_name="Supplier", supplier_email="s@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(email="root@example.com", password=None, full_name="Root", is_staff=True)
+        )
+
+    def test_request_deactivates_now_and_deletes_in_the_background(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/v1/account/users/{self.user.pk}/")
+        self.assertEqual(response.status_code, 202)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        job_id = response.json()["job_id"]
+        self.executor.submit.assert_called_once()
+
+        job = run_account_deletion(job_id, batch_size=2)
+        self.assertEqual(job.status, AccountDeletion.DONE)
+        self.assertEqual(job.progress, {"suppliers": 1, "share_thoughts": 3, "user": 1})
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(ShareThoughts.objects.exists())
+        # a finished job is not claimed again
+        self.assertIsNone(run_account_deletion(job_id))
+
+    def test_failed_job_keeps_its_progress_and_can_be_retried(self):
+        job = deletion.request_account_deletion(self.user)
+        self.assertEqual(deletion.request_account_deletion(self.user).pk, job.pk)
+
+        with mock.patch.object(deletion, "_delete_batch", side_effect=RuntimeError("lock timeout")):
+            with self.assertRaises(RuntimeError):
+                deletion.run_account_deletion(job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_error), (AccountDeletion.FAILED, "lock timeout"))
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+
+        job = deletion.run_account_deletion(job.pk)
+        self.assertEqual((job.status, job.attempts), (AccountDeletion.DONE, 2))
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+
+
+class DataExportTests(TestCase):
+    def setUp(self):
+        export_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, export_root)
+        settings_override = override_settings(DATA_EXPORT_ROOT=export_root, DATA_EXPORT_LEASE_MINUTES=30)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        patcher = mock.patch("account.exports._get_executor")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(email="export@example.com", password=None, full_name="Export")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_export_is_built_and_downloadable(self):
+        response = self.client.post("/v1/account/data-export/", {}, format="json")
+        self.assertEqual(response.status_code, 202)
+        export = run_data_export(response.json()["job_id"])
+        self.assertEqual(export.row_counts["profile.ndjson"], 1)
+
+        status_body = self.client.get(f"/v1/account/data-export/{export.pk}/").json()
+        download = APIClient().get(status_body["download_url"])
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download["Content-Type"], "application/zip")
+        download.close()
+
+    def test_user_id_is_validated(self):
+        self.assertEqual(self.client.post("/v1/account/data-export/", {"user_id": "abc"}, format="json").status_code, 400)
+        self.assertEqual(self.client.post("/v1/account/data-export/", {"user_id": 1.5}, format="json").status_code, 400)
+        self.assertEqual(self.client.post("/v1/account/data-export/", {"user_id": 99999}, format="json").status_code, 403)
+
+        self.client.force_authenticate(
+            User.objects.create_user(email="dpo@example.com", password=None, full_name="DPO", is_staff=True)
+        )
+        self.assertEqual(self.client.post("/v1/account/data-export/", {"user_id": 99999}, format="json").status_code, 404)
+        response = self.client.post("/v1/account/data-export/", {"user_id": self.user.pk}, format="json")
+        self.assertEqual((response.status_code, response.json()["user_id"]), (202, self.user.pk))
+
+    def test_running_export_is_reclaimed_after_its_lease(self):
+        export = DataExport.objects.create(
+            user_id=self.user.pk, token="t", status=DataExport.RUNNING, started_at=timezone.now()
+        )
+        self.assertIsNone(run_data_export(export.pk))
+        self.assertFalse(claimable_exports().exists())
+
+        DataExport.objects.filter(pk=export.pk).update(started_at=timezone.now() - timedelta(minutes=31))
+        self.assertEqual(run_data_export(export.pk).status, DataExport.DONE)
+
+
+class UserProfileSplitTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="profile@example.com", password=None, full_name="Profile")
+
+    def test_user_without_profile_reads_empty_fields(self):
+        data = UserSerializer(self.user).data
+        self.assertIsNone(data["company_name"])
+        self.assertIsNone(data["hourly_rate"])
+        self.assertEqual(data["email"], "profile@example.com")
+
+    def test_update_writes_through_to_the_profile_row(self):
+        serializer = UpdateProfileSerializer(
+            self.user, data={"full_name": "Renamed", "company_name": "ACME", "hourly_rate": "450.00"}, partial=True
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual((profile.company_name, str(profile.hourly_rate)), ("ACME", "450.00"))
+        serializer = UpdateProfileSerializer(User.objects.get(pk=self.user.pk), data={"bio": "Hi"}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        self.assertEqual(UserProfile.objects.count(), 1)
+
+        user = User.objects.select_related("profile").get(pk=self.user.pk)
+        data = UserSerializer(user).data
+        self.assertEqual(
+            (data["full_name"], data["company_name"], data["bio"], data["hourly_rate"]),
+            ("Renamed", "ACME", "Hi", "450.00"),
+        )
+
+    def test_user_only_update_creates_no_profile(self):
+        serializer = UpdateProfileSerializer(self.user, data={"full_name": "Plain"}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        self.assertFalse(UserProfile.objects.exists())
+
+
+class UserDocumentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="doc@example.com", password=None, full_name="Doc")
+        self.plan = SubscriptionPlan.objects.create(name=SubscriptionPlan.BASIC, price="9.99")
+        UserSubscription.objects.create(user=self.user, plan=self.plan, active=True)
+
+    def document(self):
+        return json.loads(get_user_document(self.user).content)
+
+    def test_hit_needs_no_queries(self):
+        self.document()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.document()["email"], "doc@example.com")
+
+    def test_user_profile_and_plan_saves_invalidate(self):
+        self.document()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.full_name = "Renamed"
+            self.user.save()
+        self.assertEqual(self.document()["full_name"], "Renamed")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            save_profile(self.user, {"company_name": "ACME"})
+        self.assertEqual(self.document()["company_name"], "ACME")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plan.price = "12.50"
+            self.plan.save()
+        self.assertEqual(self.document()["subscriptions"][0]["price"], 12.5)
+
+    def test_last_login_save_keeps_the_entry(self):
+        self.document()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.last_login = timezone.now()
+            self.user.save(update_fields=["last_login"])
+        with self.assertNumQueries(0):
+            self.document()
+
+
+class AdminSearchTests(TestCase):
+    def setUp(self):
+        self.john = User.objects.create_user(
+            email="John.Smith@Example.com", password=None, full_name="John Smith", phone="+4512345678"
+        )
+        self.jane = User.objects.create_user(email="jane@other.org", password=None, full_name="Jane Johnson")
+        search.index_users([self.john.pk, self.jane.pk])
+
+    def ids(self, query):
+        return [int(object_id) for object_id, _ in search.search_ids(search.KIND_USER, query)]
+
+    def test_query_terms(self):
+        terms = search.query_terms
+        self.assertEqual(terms("  John  SMITH "), ["john", "smith"])
+        self.assertEqual(terms("john@exa"), ["john@exa"])
+        self.assertEqual(terms("@Example.com"), ["example.com"])
+        self.assertEqual(terms("example.com"), ["example.com"])
+        self.assertEqual(terms("+45 1234"), ["451234"])
+        self.assertEqual(terms("j"), [])
+        self.assertEqual(terms("@"), [])
+
+    def test_email_prefixes_and_domains(self):
+        for query in ("john.smith@", "john.smith@exa", "John.Smith@example.com", "@example.com", "example.com", "john.smith"):
+            self.assertEqual(self.ids(query), [self.john.pk], query)
+        self.assertEqual(self.ids("other.org"), [self.jane.pk])
+        self.assertEqual(self.ids("nobody@example.com"), [])
+
+    def test_words_phone_and_ranking(self):
+        # "john" is John's whole first name but only a prefix of Johnson
+        self.assertEqual(self.ids("john"), [self.john.pk, self.jane.pk])
+        self.assertEqual(self.ids("jo sm"), [self.john.pk])
+        self.assertEqual(self.ids("+45 1234"), [self.john.pk])
+
+    def test_reindex_drops_deleted_users(self):
+        jane_id = self.jane.pk
+        self.jane.delete()
+        search.index_users([jane_id])
+        self.assertEqual(self.ids("jane"), [])
@@ -1,29 +1,44 @@
 from django.urls import path
-from .views import (RegisterAPIView, VerifyOTPAPIView, ResendVerifyOTPAPIView, 
-                    LoginView, ForgetPasswordView, 
-                    VerifyForgetPasswordOTPView, ResetPasswordView, 
+from .views import (AsyncRegisterAPIView, VerifyOTPAPIView, ResendVerifyOTPAPIView, 
+                    AsyncLoginView, ForgetPasswordView, 
+                    VerifyForgetPasswordOTPView, AsyncResetPasswordView, 
                     UpdateProfileView, DashboardAPIView, UserDetailAPIView,
-                    GoogleLoginView, MicrosoftLoginView, AppleLoginView, SimpleStatsAPIView)
+                    GoogleLoginView, MicrosoftLoginView, AppleLoginView, SimpleStatsAPIView,
+                    ActivityStatsAPIView, ProviderMetricsAPIView, OnlineUsersAPIView,
+                    AccountDeletionStatusAPIView, DataExportAPIView, DataExportStatusAPIView,
+                    DataExportDownloadView, AdminSearchAPIView)
 
 urlpatterns = [
-    path("signup/", RegisterAPIView.as_view(), name="user-register"),
+    path("signup/", AsyncRegisterAPIView.as_view(), name="user-register"),
     path("verify-otp/registration/", VerifyOTPAPIView.as_view(), name="verify-otp"),
     path("resend-otp/", ResendVerifyOTPAPIView.as_view(), name="resend-otp"),
-    path('login/', LoginView.as_view(), name="login"),
+    path('login/', AsyncLoginView.as_view(), name="login"),
     path("forget-password/", ForgetPasswordView.as_view(), name="forget-password"),
     path("password/verify-otp/", VerifyForgetPasswordOTPView.as_view(), name="verify-otp"),
-    path("reset-password/", ResetPasswordView.as_view(), name="reset-password"),
+    path("reset-password/", AsyncResetPasswordView.as_view(), name="reset-password"),
     
     # Update Profile
     path("update-profile/", UpdateProfileView.as_view(), name="update-profile"),
     
     # get a user by id
     path("users/<int:user_id>/", UserDetailAPIView.as_view(), name="user-detail"),
+    path("account-deletions/<int:job_id>/", AccountDeletionStatusAPIView.as_view(), name="account-deletion-status"),
+
+    # personal-data export
+    path("data-export/", DataExportAPIView.as_view(), name="data-export"),
+    path("data-export/<int:job_id>/", DataExportStatusAPIView.as_view(), name="data-export-status"),
+    path("data-export/download/<str:token>/", DataExportDownloadView.as_view(), name="data-export-download"),
     # Dashboard
     path("dashboard/", DashboardAPIView.as_view(), name="dashboard-api"),
     
     # stats
     path("stats/", SimpleStatsAPIView.as_view(), name="simple-stats"),
+    path("stats/activity/", ActivityStatsAPIView.as_view(), name="activity-stats"),
+    path("stats/providers/", ProviderMetricsAPIView.as_view(), name="provider-metrics"),
+    path("online-users/", OnlineUsersAPIView.as_view(), name="online-users"),
+
+    # admin search over users and offers
+    path("admin/search/", AdminSearchAPIView.as_view(), name="admin-search"),
     
     # social auth
     path("social/google/", GoogleLoginView.as_view(), name="google-login"),
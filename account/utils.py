@@ -7,7 +7,6 @@ import requests
 from PIL import Image
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, ValidationError
-from django.core.mail import send_mail, BadHeaderError
 from django.utils import timezone
 
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -35,61 +34,36 @@ def get_otp_expiry(minutes: int = 30):
 
 
 def send_otp_email(recipient_email: str, otp: str) -> None:
-    """Send an OTP to the user's email."""
-    from_email = getattr(settings, "EMAIL_HOST_USER", None) or getattr(
-        settings, "DEFAULT_FROM_EMAIL", None
-    )
-    if not from_email:
-        raise ImproperlyConfigured(
-            "Sender email not configured. Set EMAIL_HOST_USER or DEFAULT_FROM_EMAIL in settings."
-        )
+    """Queue an OTP email for the outbox worker (``manage.py send_queued_emails``)."""
+    from .mailer import enqueue_email
 
     subject = "Verify Your Email"
     message = f"Your One-Time Password (OTP) is: {otp}"
 
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=from_email,
-            recipient_list=[recipient_email],
-            fail_silently=False,
-        )
-        logger.info(f"OTP email sent to {recipient_email}")
-    except BadHeaderError:
-        logger.error("Invalid header found while sending email.")
+        enqueue_email(subject=subject, body=message, to=recipient_email)
+        logger.info(f"OTP email queued for {recipient_email}")
+    except ImproperlyConfigured:
+        raise
     except Exception as e:
-        logger.exception(f"Error sending OTP email to {recipient_email}: {e}")
+        logger.exception(f"Error queueing OTP email to {recipient_email}: {e}")
         
 
 # ---------------------------      
 # MessageBird SMS Utility
 # ---------------------------
 
-import logging
-import messagebird
-from django.conf import settings
-
-logger = logging.getLogger(__name__)
-
 def send_otp_sms(phone: str, message: str) -> bool:
     """
-    Sends SMS using MessageBird API.
+    Queues an SMS in the outbox; ``manage.py send_queued_sms`` sends it (see account.sms).
     """
+    from .sms import enqueue_sms
+
     try:
-        client = messagebird.Client(settings.MESSAGEBIRD_API_KEY)
-        response = client.message_create(
-            originator=settings.DEFAULT_FROM_NUMBER,
-            recipients=[phone],
-            body=message
-        )
-        logger.info(f"MessageBird SMS sent to {phone}: {response.id}")
+        enqueue_sms(phone, message)
         return True
-    except messagebird.client.ErrorException as e:
-        logger.error(f"MessageBird Error: {e.errors}")
-        return False
     except Exception as e:
-        logger.error(f"Unexpected SMS send error for {phone}: {e}")
+        logger.error(f"Unexpected SMS queue error for {phone}: {e}")
         return False
 
 
@@ -107,18 +81,23 @@ def generate_tokens_for_user(user) -> Dict[str, str]:
 # Image Utilities
 # ---------------------------
 def validate_image(image) -> None:
-    """Validate image size and format."""
+    """Validate image size, dimensions and format from the file header only."""
     if image:
         max_size = 3 * 1024 * 1024  # 3MB
+        max_pixels = 40_000_000  # guards against decompression bombs
         allowed_formats = ["JPEG", "PNG", "GIF"]
         if image.size > max_size:
             raise ValidationError("Image file too large (max 3MB).")
+        # Image.open parses the header; pixel data is never decoded here
         img = Image.open(image)
         if img.format not in allowed_formats:
             raise ValidationError(
                 f"Unsupported image format: {img.format}. "
                 f"Allowed formats: {allowed_formats}"
             )
+        if img.width * img.height > max_pixels:
+            raise ValidationError("Image dimensions too large.")
+        image.seek(0)
 
 
 # ---------------------------
@@ -136,33 +115,35 @@ def generate_username(email: str) -> str:
 # ---------------------------
 def validate_facebook_token(access_token: str) -> Optional[Dict[str, Any]]:
     """Validate Facebook access token and return user info."""
-    try:
-        url = f"https://graph.facebook.com/me?fields=id,name,email&access_token={access_token}"
-        response = requests.get(url)
-        data = response.json()
-        print("Facebook response:", data)
-        if "error" in data:
-            return None
-        return data
-    except Exception as e:
-        print("Facebook token validation failed:", str(e))
+    from .providers import get_provider_client
+
+    data = get_provider_client().get_json(
+        "facebook",
+        f"{settings.FACEBOOK_GRAPH_URL}/me",
+        access_token=access_token,
+        token_param="access_token",
+        params={"fields": "id,name,email"},
+        cache_ttl=settings.SOCIAL_PROFILE_CACHE_TTL,
+    )
+    if not data or "error" in data:
         return None
+    return data
 
 
 def validate_google_token(id_token: str) -> Optional[Dict[str, Any]]:
     """Validate Google ID token and return user info."""
-    try:
-        response = requests.get(
-            f"https://www.googleapis.com/oauth2/v3/tokeninfo?id_token={id_token}"
-        )
-        data = response.json()
-        print("Google response:", data)
-        if "error_description" in data or "email" not in data:
-            return None
-        return data
-    except Exception as e:
-        print("Google token validation failed:", str(e))
+    from .providers import get_provider_client
+
+    data = get_provider_client().get_json(
+        "google",
+        "https://www.googleapis.com/oauth2/v3/tokeninfo",
+        access_token=id_token,
+        token_param="id_token",
+        cache_ttl=settings.SOCIAL_PROFILE_CACHE_TTL,
+    )
+    if not data or "error_description" in data or "email" not in data:
         return None
+    return data
 
 
 
@@ -172,44 +153,70 @@ import jwt
 from typing import Optional, Dict
 
 
+def _audience_options(setting_name: str) -> Dict[str, Any]:
+    # Without configured client IDs a token issued to any other app would be
+    # accepted, so every token is rejected instead.
+    audiences = getattr(settings, setting_name, None)
+    if not audiences:
+        logger.error(f"{setting_name} is not configured; rejecting the token")
+        raise jwt.InvalidAudienceError(f"{setting_name} is not configured")
+    return {"audience": list(audiences)}
+
+
 def validate_google(id_token: str) -> Optional[Dict]:
-    """Validate Google token and return minimal user info."""
+    """Verify a Google ID token locally against Google's JWKS and return minimal user info."""
+    from .jwks import google_jwks, GOOGLE_ISSUERS
+
     try:
-        res = requests.get(f"https://www.googleapis.com/oauth2/v3/tokeninfo?id_token={id_token}").json()
-        if "email" not in res:
+        claims = google_jwks.decode(
+            id_token,
+            issuer=GOOGLE_ISSUERS,
+            **_audience_options("GOOGLE_CLIENT_IDS"),
+        )
+        if "email" not in claims or claims.get("email_verified") is False:
             return None
         return {
-            "email": res.get("email"),
-            "full_name": res.get("name"),
-            "profile_pic_url": res.get("picture")
+            "email": claims.get("email"),
+            "full_name": claims.get("name"),
+            "profile_pic_url": claims.get("picture")
         }
-    except Exception:
+    except Exception as e:
+        logger.info(f"Google token rejected: {e}")
         return None
 
 
 def validate_microsoft(access_token: str) -> Optional[Dict]:
     """Validate Microsoft token and return minimal user info."""
-    try:
-        res = requests.get(
-            "https://graph.microsoft.com/v1.0/me",
-            headers={"Authorization": f"Bearer {access_token}"}
-        ).json()
-        email = res.get("mail") or res.get("userPrincipalName")
-        if not email:
-            return None
-        return {
-            "email": email,
-            "full_name": res.get("displayName"),
-            "profile_pic_url": None  # Microsoft profile picture requires extra API call
-        }
-    except Exception:
+    from .providers import get_provider_client
+
+    res = get_provider_client().get_json(
+        "microsoft",
+        f"{settings.MICROSOFT_GRAPH_URL}/me",
+        access_token=access_token,
+        cache_ttl=settings.SOCIAL_PROFILE_CACHE_TTL,
+    )
+    if not res:
         return None
+    email = res.get("mail") or res.get("userPrincipalName")
+    if not email:
+        return None
+    return {
+        "email": email,
+        "full_name": res.get("displayName"),
+        "profile_pic_url": None  # Microsoft profile picture requires extra API call
+    }
 
 
 def validate_apple(identity_token: str) -> Optional[Dict]:
-    """Decode Apple JWT identity token and return minimal user info."""
+    """Verify an Apple identity token locally against Apple's JWKS and return minimal user info."""
+    from .jwks import apple_jwks, APPLE_ISSUER
+
     try:
-        decoded = jwt.decode(identity_token, options={"verify_signature": False})
+        decoded = apple_jwks.decode(
+            identity_token,
+            issuer=APPLE_ISSUER,
+            **_audience_options("APPLE_CLIENT_IDS"),
+        )
         email = decoded.get("email")
         if not email:
             return None
@@ -218,5 +225,6 @@ def validate_apple(identity_token: str) -> Optional[Dict]:
             "full_name": decoded.get("name") or email.split("@")[0],
             "profile_pic_url": None  # Apple does not provide picture
         }
-    except Exception:
+    except Exception as e:
+        logger.info(f"Apple token rejected: {e}")
         return None
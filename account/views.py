@@ -9,29 +9,10 @@ from core.utils import ResponseHandler
 from rest_framework.permissions import IsAuthenticated
 from account.utils import generate_tokens_for_user
 from account.serializers import UserSerializer
+from account.documents import get_user_document
 from django.conf import settings
 
 # Create your views here.
-class RegisterAPIView(APIView):
-
-    permission_classes = [AllowAny]
-
-    def post(self, request):
-        serializer = SignupSerialzier(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        return ResponseHandler.created(
-            message="Registration successful. OTP sent via SMS.",
-            data={
-                "user_id": user.user_id,
-                "email": user.email,
-                "phone": user.phone,
-                "is_verified": user.is_verified
-            }
-        )
-
-
-
 class VerifyOTPAPIView(APIView):
     permission_classes = [AllowAny]
 
@@ -56,26 +37,6 @@ class ResendVerifyOTPAPIView(APIView):
         )
 
 
-class LoginView(APIView):
-    permission_classes = [AllowAny]
-    
-    def post(self, request):
-        serializer = LoginSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        user = serializer.validated_data['user']
-        tokens = generate_tokens_for_user(user)
-
-        user_data = UserSerializer(user).data
-
-        return ResponseHandler.success(
-            message="Login successful",
-            data={
-                "user": user_data,
-                "tokens": tokens
-            }
-        )
-
         
 from django.db import transaction
 
@@ -115,24 +76,69 @@ class VerifyForgetPasswordOTPView(APIView):
         )
 
 
-class ResetPasswordView(APIView):
+# Async auth views: password hashing runs on the bounded pool in
+# account.hashing, so login bursts don't tie up request threads.
+from asgiref.sync import sync_to_async
+from core.views import AsyncAPIView
+from .hashing import amake_password
+
+
+class AsyncRegisterAPIView(AsyncAPIView):
+    permission_classes = [AllowAny]
+
+    async def post(self, request):
+        serializer = SignupSerialzier(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        password_hash = await amake_password(serializer.validated_data["password"])
+        user = await sync_to_async(serializer.save)(password_hash=password_hash)
+        return ResponseHandler.created(
+            message="Registration successful. OTP sent via SMS.",
+            data={
+                "user_id": user.user_id,
+                "email": user.email,
+                "phone": user.phone,
+                "is_verified": user.is_verified
+            }
+        )
+
+
+class AsyncLoginView(AsyncAPIView):
+    permission_classes = [AllowAny]
+
+    async def post(self, request):
+        serializer = LoginSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = await serializer.aauthenticate()
+        tokens = generate_tokens_for_user(user)
+
+        user_data = await sync_to_async(get_user_document)(user)
+
+        return ResponseHandler.success(
+            message="Login successful",
+            data={
+                "user": user_data,
+                "tokens": tokens
+            }
+        )
+
+
+class AsyncResetPasswordView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         """Reset password after verifying OTP (requires token)."""
         serializer = ResetPasswordSerializer(
             data=request.data, context={'request': request}
         )
-        if serializer.is_valid(raise_exception=True):
-            serializer.save()
-            return ResponseHandler.success(
-                message="Password reset successfully."
-            )
-        return ResponseHandler.bad_request(
-            message="Password reset failed.",
-            errors=serializer.errors
+        serializer.is_valid(raise_exception=True)
+        password_hash = await amake_password(serializer.validated_data["new_password"])
+        await sync_to_async(serializer.save)(password_hash=password_hash)
+        return ResponseHandler.success(
+            message="Password reset successfully."
         )
 
+
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 
@@ -143,10 +149,9 @@ class UpdateProfileView(APIView):
     
     
     def get(self, request):
-        serializer = UserSerializer(request.user)
         return ResponseHandler.success(
             message="User profile fetched successfully.",
-            data={"user": serializer.data}
+            data={"user": get_user_document(request.user)}
         )
 
     def patch(self, request):
@@ -161,7 +166,7 @@ class UpdateProfileView(APIView):
 
             return ResponseHandler.success(
                 message="Profile updated successfully.",
-                data={"user": UserSerializer(user).data}
+                data={"user": get_user_document(user)}
             )
 
         except Exception as exc:
@@ -184,9 +189,10 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
 from rest_framework import status
-from .serializers import DashboardSerializer, UserSerializer
+from rest_framework.exceptions import APIException
+from .serializers import DashboardSerializer, UserSerializer, subscriptions_prefetch
 from .services import DashboardService
-from .pagination import StandardResultsSetPagination
+from core.pagination import KeysetPagination
 
 logger = logging.getLogger(__name__)
 
@@ -195,27 +201,25 @@ class DashboardAPIView(APIView):
 
     def get(self, request):
         try:
-            queryset = (
-                DashboardService.get_users_queryset()
-                .prefetch_related("subscriptions__plan")
-            )
+            # UserSerializer(many=True) loads the page's subscriptions in one query
+            queryset = DashboardService.get_users_queryset()
 
-            paginator = StandardResultsSetPagination()
+            paginator = KeysetPagination()
             paginated_users = paginator.paginate_queryset(queryset, request)
 
             users_serializer = UserSerializer(paginated_users, many=True)
 
             data = {
-                "total_users": DashboardService.get_total_users(),
-                "total_verified": DashboardService.get_total_verified(),
-                "total_unverified": DashboardService.get_total_unverified(),
-                "total_earnings": DashboardService.get_total_earnings(),
+                **DashboardService.get_totals(),
                 "users": users_serializer.data,
             }
 
             serializer = DashboardSerializer(instance=data)
             return paginator.get_paginated_response(serializer.data)
 
+        except APIException:
+            # e.g. an invalid pagination cursor (404)
+            raise
         except Exception as e:
             logger.exception("Error fetching dashboard data")
             return Response(
@@ -232,7 +236,7 @@ class UserDetailAPIView(APIView):
     def get(self, request, user_id):
         try:
             from account.models import User
-            user = User.objects.prefetch_related("subscriptions__plan").filter(user_id=user_id).first()
+            user = User.objects.select_related("profile").prefetch_related(subscriptions_prefetch()).filter(user_id=user_id).first()
             if not user:
                 return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -242,6 +246,45 @@ class UserDetailAPIView(APIView):
         except Exception as e:
             logger.exception(f"Error fetching user {user_id}")
             return Response({"detail": "Error fetching user data"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def delete(self, request, user_id):
+        """Deactivate the user now and delete their data in the background."""
+        from account.models import User
+        from .deletion import request_account_deletion
+
+        user = User.objects.filter(user_id=user_id).first()
+        if not user:
+            return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+        if user.pk == request.user.pk:
+            return Response({"detail": "You cannot delete your own account here"}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = request_account_deletion(user, requested_by=request.user)
+        return Response(_deletion_payload(job), status=status.HTTP_202_ACCEPTED)
+
+
+def _deletion_payload(job):
+    return {
+        "job_id": job.pk,
+        "user_id": job.user_id,
+        "status": job.status,
+        "progress": job.progress,
+        "rows_deleted": job.rows_deleted,
+        "last_error": job.last_error,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class AccountDeletionStatusAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, job_id):
+        from .models import AccountDeletion
+
+        job = AccountDeletion.objects.filter(pk=job_id).first()
+        if not job:
+            return Response({"detail": "Deletion job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_deletion_payload(job))
         
         
         
@@ -269,7 +312,7 @@ class GoogleLoginView(APIView):
             return ResponseHandler.success(
                 message="Google login successful.",
                 data={
-                    "user": UserSerializer(user).data,
+                    "user": get_user_document(user),
                     "tokens": tokens
                 }
             )
@@ -295,7 +338,7 @@ class MicrosoftLoginView(APIView):
             return ResponseHandler.success(
                 message="Microsoft login successful.",
                 data={
-                    "user": UserSerializer(user).data,
+                    "user": get_user_document(user),
                     "tokens": tokens
                 }
             )
@@ -321,7 +364,7 @@ class AppleLoginView(APIView):
             return ResponseHandler.success(
                 message="Apple login successful.",
                 data={
-                    "user": UserSerializer(user).data,
+                    "user": get_user_document(user),
                     "tokens": tokens
                 }
             )
@@ -332,21 +375,147 @@ class AppleLoginView(APIView):
 
 
 # user stats
-from django.utils import timezone
-from datetime import timedelta
-from account.models import User
-from supplychain.models import Task
 class SimpleStatsAPIView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        now = timezone.now()
-        online_threshold = now - timedelta(minutes=5)
+        return Response(DashboardService.get_simple_stats())
+
+class ActivityStatsAPIView(APIView):
+    """Approximate online-now / DAU / WAU / MAU from the activity sketches (no SQL)."""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response(DashboardService.get_activity_stats())
+
+
+class ProviderMetricsAPIView(APIView):
+    """Social login provider request counts and latency, for the worker process that answers."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        from .providers import get_provider_metrics
+
+        return Response(get_provider_metrics())
 
-        data = {
-            "active_users": User.objects.filter(is_active=True).count(),
-            "offers_created": Task.objects.count(),
-            "online_users": User.objects.filter(last_activity__gte=online_threshold).count(),
-        }
 
-        return Response(data)
\ No newline at end of file
+import math
+from rest_framework.pagination import LimitOffsetPagination
+from .presence import get_presence
+
+
+class OnlineUsersPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
+
+
+class OnlineUsersAPIView(APIView):
+    """Users seen in the last ``?minutes=`` (default 5), most recent first, from the presence index."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            minutes = float(request.query_params.get("minutes", 5))
+        except ValueError:
+            return Response({"detail": "minutes must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        if not math.isfinite(minutes) or minutes <= 0:
+            return Response({"detail": "minutes must be a positive number"}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = OnlineUsersPagination()
+        page = paginator.paginate_queryset(get_presence().online(minutes), request, view=self)
+        return paginator.get_paginated_response(page)
+
+
+# Personal-data export
+from django.http import FileResponse
+from django.urls import reverse
+from .models import DataExport, User
+from .serializers import DataExportRequestSerializer
+from . import exports
+
+
+def _export_payload(request, export):
+    data = {
+        "job_id": export.pk,
+        "user_id": export.user_id,
+        "status": export.status,
+        "row_counts": export.row_counts,
+        "file_size": export.file_size,
+        "last_error": export.last_error,
+        "created_at": export.created_at,
+        "expires_at": export.expires_at,
+    }
+    if export.status == DataExport.DONE:
+        data["download_url"] = request.build_absolute_uri(
+            reverse("data-export-download", kwargs={"token": export.token})
+        )
+    return data
+
+
+class DataExportAPIView(APIView):
+    """Queue an export of the caller's data (admins may pass ``user_id``)."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = DataExportRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        user_id = request.user.pk
+        if serializer.validated_data.get("user_id") is not None:
+            if not request.user.is_staff:
+                return Response({"detail": "Only admins can export other accounts"}, status=status.HTTP_403_FORBIDDEN)
+            user_id = serializer.validated_data["user_id"]
+            if not User.objects.filter(pk=user_id).exists():
+                return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        export = exports.request_data_export(user_id, requested_by=request.user)
+        return Response(_export_payload(request, export), status=status.HTTP_202_ACCEPTED)
+
+
+class DataExportStatusAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        export = DataExport.objects.filter(pk=job_id).first()
+        if not export or (export.user_id != request.user.pk and not request.user.is_staff):
+            return Response({"detail": "Export not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_export_payload(request, export))
+
+
+class DataExportDownloadView(APIView):
+    """Stream a finished archive; the unguessable token is the credential."""
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request, token):
+        export = exports.get_downloadable(token)
+        if export is None:
+            return Response({"detail": "Export not found or expired"}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(
+            open(exports.export_path(export), "rb"),
+            as_attachment=True,
+            filename=f"account-data-{export.user_id}.zip",
+            content_type="application/zip",
+        )
+
+
+# Admin search
+from . import search
+
+
+class AdminSearchAPIView(APIView):
+    """Users and offers matching ``?q=``, ranked, from the search index."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            return Response({"detail": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        if limit <= 0:
+            return Response({"detail": "limit must be positive"}, status=status.HTTP_400_BAD_REQUEST)
+        if not search.query_terms(query):
+            return Response({"users": [], "offers": []}, status=status.HTTP_200_OK)
+        return Response(search.search(query, limit), status=status.HTTP_200_OK)
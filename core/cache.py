@@ -0,0 +1,118 @@
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Compare-and-delete, so a lock is only released by the worker holding it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Shared by every CachedValue; refreshes are short and rare.
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+
+class CachedValue:
+    """
+    A cached, stampede-safe computed value.
+
+    - Entries are stored as ``(value, fresh_until)`` so falsy values (0, [], None)
+      are cached like any other.
+    - Before ``soft_ttl`` the cached value is returned as is. Between ``soft_ttl``
+      and ``hard_ttl`` the stale value is returned while a single worker refreshes
+      it in the background.
+    - On a miss only the worker holding the lock recomputes; the others wait for
+      its result (up to ``wait_timeout``) instead of all hitting the database.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        soft_ttl: int = 60,
+        hard_ttl: int = 600,
+        lock_timeout: int = 30,
+        wait_timeout: float = 5.0,
+    ):
+        self.key = key
+        self.lock_key = f"{key}:lock"
+        self.compute = compute
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(hard_ttl, soft_ttl)
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+
+    def get(self) -> Any:
+        entry = cache.get(self.key)
+        if entry is not None:
+            value, fresh_until = entry
+            if time.time() >= fresh_until:
+                token = self._acquire_lock()
+                if token is not None:
+                    _refresh_executor.submit(self._background_refresh, token)
+            return value
+
+        token = self._acquire_lock()
+        if token is not None:
+            try:
+                return self.refresh()
+            finally:
+                self._release_lock(token)
+        return self._wait_for_value()
+
+    def refresh(self) -> Any:
+        """Recompute and store the value unconditionally."""
+        value = self.compute()
+        cache.set(self.key, (value, time.time() + self.soft_ttl), self.hard_ttl)
+        return value
+
+    def invalidate(self) -> None:
+        cache.delete(self.key)
+
+    # Internals
+    def _acquire_lock(self) -> Optional[str]:
+        """Take the refresh lock; returns the token proving ownership, or None."""
+        token = uuid.uuid4().hex
+        return token if cache.add(self.lock_key, token, self.lock_timeout) else None
+
+    def _release_lock(self, token: str) -> None:
+        # Only delete our own lock: if the refresh outlived lock_timeout the
+        # key may now belong to another worker.
+        client = get_redis_client()
+        if client is not None:
+            client.eval(RELEASE_LOCK_SCRIPT, 1, cache.make_key(self.lock_key), cache.client.encode(token))
+        elif cache.get(self.lock_key) == token:
+            # in-process caches (dev, tests) aren't shared, so get-then-delete is safe
+            cache.delete(self.lock_key)
+
+    def _background_refresh(self, token: str) -> None:
+        close_old_connections()
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Background refresh failed for %s", self.key)
+        finally:
+            self._release_lock(token)
+            close_old_connections()
+
+    def _wait_for_value(self) -> Any:
+        deadline = time.time() + self.wait_timeout
+        while time.time() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(self.key)
+            if entry is not None:
+                return entry[0]
+        # The lock holder is stuck or died: compute without caching rather than fail.
+        logger.warning("Timed out waiting for %s, computing directly", self.key)
+        return self.compute()
@@ -0,0 +1,230 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.conf import settings
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+CURSOR_SALT = "core.pagination.keyset"
+
+
+def _planner_estimate(queryset) -> Optional[int]:
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 until the table has been vacuumed/analyzed
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def estimated_count(queryset, threshold: int = None) -> int:
+    """
+    Row count for pagination without a full COUNT(*) on big tables.
+
+    Unfiltered querysets on PostgreSQL use the planner's row estimate
+    (``pg_class.reltuples``); estimates below ``threshold`` fall back to an
+    exact count, as do filtered querysets and other databases.
+    """
+    if threshold is None:
+        threshold = settings.PAGINATION_EXACT_COUNT_THRESHOLD
+    if not queryset.query.where and not queryset.query.distinct:
+        estimate = _planner_estimate(queryset)
+        if estimate is not None and estimate >= threshold:
+            return estimate
+    return queryset.count()
+
+
+class EstimatedCountPaginator(Paginator):
+    """Django Paginator whose ``count`` comes from ``estimated_count``."""
+
+    @cached_property
+    def count(self):
+        if hasattr(self.object_list, "query"):
+            return estimated_count(self.object_list)
+        return super().count
+
+
+class EstimatedCountAdminMixin:
+    """
+    ModelAdmin mixin for large tables: estimated changelist counts and no
+    extra full-table count for the "N total" link.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over ``(sort key, primary key)``.
+
+    Each page is one query that seeks past the last row's ``(sort key, pk)``
+    through an index range on the ordering columns (see ``_after``), so
+    page N costs the same as page 1. Cursors are opaque and signed; the
+    total count is only computed when asked for with ``?with_count=true``
+    and may be a planner estimate on large unfiltered tables (see
+    ``estimated_count``).
+
+    ``ordering`` must end with a unique field (normally the primary key).
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+    ordering: Sequence[str] = ("-created_at", "-pk")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None) -> List[Any]:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_count(queryset) if self.wants_count(request) else None
+
+        position, reverse = self.decode_cursor(queryset, request)
+        ordering = self._reversed_ordering() if reverse else list(self.ordering)
+
+        qs = queryset.order_by(*ordering)
+        if position is not None:
+            qs = qs.filter(self._after(position, ordering))
+        rows = list(qs[:self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Going forward there is a previous page whenever we came from a cursor;
+        # going backward there is always a next page (the one we came from).
+        self.has_next = has_more if not reverse else True
+        self.has_previous = (position is not None) if not reverse else has_more
+        self.first_position = self._position(rows[0]) if rows else None
+        self.last_position = self._position(rows[-1]) if rows else None
+        self.page = rows
+        return rows
+
+    def get_paginated_payload(self, data) -> Dict[str, Any]:
+        payload = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["results"] = data
+        return payload
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(self.get_paginated_payload(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer"},
+                "results": schema,
+            },
+        }
+
+    # Page size / count
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def wants_count(self, request) -> bool:
+        return request.query_params.get(self.count_query_param, "").lower() in ("1", "true", "yes")
+
+    def get_count(self, queryset) -> int:
+        return estimated_count(queryset)
+
+    # Links
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or self.last_position is None:
+            return None
+        return self._link(self.last_position, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self._link(self.first_position, reverse=True)
+
+    def _link(self, position, reverse: bool) -> str:
+        cursor = signing.dumps({"p": position, "r": reverse}, salt=CURSOR_SALT, compress=True)
+        url = replace_query_param(self.base_url, self.cursor_query_param, cursor)
+        return remove_query_param(url, self.count_query_param)
+
+    # Cursors
+    def decode_cursor(self, queryset, request):
+        """Return ``(position, reverse)``; position is None on the first page."""
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None, False
+        try:
+            payload = signing.loads(raw, salt=CURSOR_SALT)
+            fields = [self._field(queryset.model, name) for name in self.ordering]
+            values = payload["p"]
+            if len(values) != len(fields):
+                raise ValueError("cursor does not match ordering")
+            position = [
+                None if value is None else field.to_python(value)
+                for field, value in zip(fields, values)
+            ]
+            return position, bool(payload.get("r"))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _position(self, obj) -> List[Any]:
+        values = []
+        for name in self.ordering:
+            value = getattr(obj, name.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return values
+
+    # Query building
+    @staticmethod
+    def _field(model, name):
+        name = name.lstrip("-")
+        return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+    def _reversed_ordering(self) -> List[str]:
+        return [name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering]
+
+    @staticmethod
+    def _after(position, ordering) -> Q:
+        """
+        Rows strictly after ``position`` in ``ordering``.
+
+        The expanded row comparison ``a > x OR (a = x AND b > y)``, plus the
+        redundant bound ``a >= x`` on the leading column (``<=`` when
+        descending). The OR alone is applied row by row; the bound gives the
+        planner an index range to start from.
+        """
+        condition = Q()
+        for i, name in enumerate(ordering):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            term = Q(**{f"{field}__{lookup}": position[i]})
+            for prev_name, prev_value in zip(ordering[:i], position[:i]):
+                term &= Q(**{prev_name.lstrip("-"): prev_value})
+            condition |= term
+        leading = ordering[0]
+        bound = "lte" if leading.startswith("-") else "gte"
+        return Q(**{f"{leading.lstrip('-')}__{bound}": position[0]}) & condition
@@ -0,0 +1,18 @@
+from typing import Any, Optional
+
+from django.conf import settings
+
+
+def get_redis_client() -> Optional[Any]:
+    """
+    Return the shared Redis connection used by the cache, or None.
+
+    Subsystems that need native Redis structures (hashes, sorted sets, ...)
+    call this and fall back to an in-process stand-in when Redis is not
+    configured (local development, tests).
+    """
+    if not getattr(settings, "REDIS_URL", None):
+        return None
+
+    from django_redis import get_redis_connection
+    return get_redis_connection("default")
@@ -0,0 +1,53 @@
+import re
+import secrets
+from functools import partial
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class RawJSON:
+    """Already-rendered JSON (bytes) to embed as-is in response data."""
+
+    __slots__ = ("content",)
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+class _SplicingEncoder(JSONEncoder):
+    def __init__(self, *args, placeholders=None, prefix="", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.placeholders = placeholders
+        self.prefix = prefix
+
+    def default(self, obj):
+        if isinstance(obj, RawJSON):
+            token = f"{self.prefix}{len(self.placeholders)}"
+            self.placeholders[token] = obj.content
+            return token
+        return super().default(obj)
+
+
+class SplicingJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that writes ``RawJSON`` values verbatim.
+
+    Each ``RawJSON`` is encoded as a unique placeholder string, which is then
+    replaced by the stored bytes, so cached documents are never parsed or
+    re-serialized.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        self._placeholders = {}
+        self._prefix = f"__raw_json_{secrets.token_hex(8)}_"
+        body = super().render(data, accepted_media_type, renderer_context)
+        if not self._placeholders:
+            return body
+        # one pass over the body however many documents are embedded
+        pattern = re.compile(rb'"(' + re.escape(self._prefix.encode()) + rb'\d+)"')
+        return pattern.sub(lambda match: self._placeholders[match.group(1).decode()], body)
+
+    @property
+    def encoder_class(self):
+        return partial(_SplicingEncoder, placeholders=self._placeholders, prefix=self._prefix)
@@ -164,6 +164,9 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+
+# Background threads generating profile picture derivatives (account.images)
+IMAGE_PROCESSING_WORKERS = env.int("IMAGE_PROCESSING_WORKERS", default=2)
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -175,11 +178,16 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "account.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # Writes cached pre-rendered documents (core.renderers.RawJSON) verbatim
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.SplicingJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     'EXCEPTION_HANDLER': 'core.utils.custom_exception_handler', # Custom exception handler
 }
 
@@ -193,9 +201,37 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Below this many rows list counts are exact; above it unfiltered lists use
+# the PostgreSQL planner estimate (core.pagination.estimated_count)
+PAGINATION_EXACT_COUNT_THRESHOLD = env.int("PAGINATION_EXACT_COUNT_THRESHOLD", default=10000)
+
+# Password hashing pool used by the async auth views (account.hashing):
+# concurrent hashes, and queued hashes before requests get a 503
+PASSWORD_HASHING_WORKERS = env.int("PASSWORD_HASHING_WORKERS", default=2)
+PASSWORD_HASHING_MAX_PENDING = env.int("PASSWORD_HASHING_MAX_PENDING", default=64)
+
+# Seconds an authenticated user's cached auth fields live (account.authentication)
+AUTH_USER_CACHE_TTL = env.int("AUTH_USER_CACHE_TTL", default=300)
+
+# Seconds a pre-rendered UserSerializer document lives (account.documents)
+USER_DOCUMENT_CACHE_TTL = env.int("USER_DOCUMENT_CACHE_TTL", default=3600)
+
 
 
 
+# Social login: accepted "aud" values for locally verified identity tokens.
+# Google/Apple sign-in rejects every token until these are set.
+GOOGLE_CLIENT_IDS = env.list("GOOGLE_CLIENT_IDS", default=[])
+APPLE_CLIENT_IDS = env.list("APPLE_CLIENT_IDS", default=[])
+
+# Social login: shared provider HTTP client (account.providers)
+MICROSOFT_GRAPH_URL = env("MICROSOFT_GRAPH_URL", default="https://graph.microsoft.com/v1.0")
+FACEBOOK_GRAPH_URL = env("FACEBOOK_GRAPH_URL", default="https://graph.facebook.com")
+SOCIAL_PROVIDER_CONNECT_TIMEOUT = env.float("SOCIAL_PROVIDER_CONNECT_TIMEOUT", default=3.05)
+SOCIAL_PROVIDER_READ_TIMEOUT = env.float("SOCIAL_PROVIDER_READ_TIMEOUT", default=5)
+SOCIAL_PROFILE_CACHE_TTL = env.int("SOCIAL_PROFILE_CACHE_TTL", default=300)
+
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = True
 # CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS", default=[])
@@ -287,6 +323,56 @@ LOGGING = {
 }
 
 
+# Cache / Redis
+REDIS_URL = env("REDIS_URL", default=None)
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            },
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
+# Last activity tracking
+LAST_ACTIVITY_THROTTLE_SECONDS = env.int("LAST_ACTIVITY_THROTTLE_SECONDS", default=60)
+LAST_ACTIVITY_FLUSH_INTERVAL = env.int("LAST_ACTIVITY_FLUSH_INTERVAL", default=30)
+
+# Presence (who is online)
+PRESENCE_RETENTION_SECONDS = env.int("PRESENCE_RETENTION_SECONDS", default=3600)
+PRESENCE_DISPLAY_CACHE_TTL = env.int("PRESENCE_DISPLAY_CACHE_TTL", default=600)
+
+# Background account deletion: dependent rows removed per transaction (account.deletion)
+ACCOUNT_DELETION_BATCH_SIZE = env.int("ACCOUNT_DELETION_BATCH_SIZE", default=1000)
+
+# Personal-data exports (account.exports); kept outside MEDIA_ROOT, served by token only
+DATA_EXPORT_ROOT = env("DATA_EXPORT_ROOT", default=str(BASE_DIR / "exports"))
+DATA_EXPORT_TTL_HOURS = env.int("DATA_EXPORT_TTL_HOURS", default=48)
+# A running export not finished within the lease is assumed dead (worker
+# recycled mid-run) and claimed again by the next run
+DATA_EXPORT_LEASE_MINUTES = env.int("DATA_EXPORT_LEASE_MINUTES", default=60)
+
+# Offers change feed (supplychain.changefeed). updated_at is set when a write
+# starts, not when it commits: rows younger than the settle window wait for
+# the next poll, and every poll re-reads rows stamped within the overlap of
+# now (even behind its watermark), so transactions committing up to that much
+# later are still picked up.
+OFFER_FEED_BATCH_SIZE = env.int("OFFER_FEED_BATCH_SIZE", default=500)
+OFFER_FEED_SETTLE_SECONDS = env.int("OFFER_FEED_SETTLE_SECONDS", default=2)
+OFFER_FEED_OVERLAP_SECONDS = env.int("OFFER_FEED_OVERLAP_SECONDS", default=300)
+OFFER_FEED_POLL_INTERVAL = env.int("OFFER_FEED_POLL_INTERVAL", default=5)
+
+
 # Email Configuration
 EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = env('EMAIL_HOST', default='smtp.gmail.com')
@@ -296,13 +382,22 @@ EMAIL_HOST_USER = env('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Backend used by the outbox worker (send_queued_emails). Use
+# django.core.mail.backends.console.EmailBackend / filebased.EmailBackend locally.
+EMAIL_OUTBOX_BACKEND = env('EMAIL_OUTBOX_BACKEND', default=EMAIL_BACKEND)
+
 
 
 # Messagebird
 # settings.py
 
-# MESSAGEBIRD_API_KEY = env("MESSAGEBIRD_API_KEY")
-# DEFAULT_FROM_NUMBER = env("MESSAGEBIRD_SENDER", default="account")
+MESSAGEBIRD_API_KEY = env("MESSAGEBIRD_API_KEY", default=None)
+DEFAULT_FROM_NUMBER = env("MESSAGEBIRD_SENDER", default="account")
+
+# SMS dispatcher (account.sms). MessageBirdTransport refuses to start without
+# MESSAGEBIRD_API_KEY; use account.sms.FakeTransport offline
+SMS_TRANSPORT = env("SMS_TRANSPORT", default="account.sms.MessageBirdTransport")
+SMS_RATE_PER_SECOND = env.float("SMS_RATE_PER_SECOND", default=10)
 
 import os
 
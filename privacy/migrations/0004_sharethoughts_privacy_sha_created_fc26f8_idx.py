@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('privacy', '0003_sharethoughts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sharethoughts',
+            index=models.Index(fields=['created_at', 'id'], name='privacy_sha_created_fc26f8_idx'),
+        ),
+    ]
@@ -40,7 +40,12 @@ class ShareThoughts(models.Model):
     thoughts = models.TextField()
     
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.thoughts[:30]}"
     
@@ -150,16 +150,21 @@ class SubmitQuerryDetailView(APIView):
         )
 
 from rest_framework.permissions import IsAuthenticated
+from core.pagination import KeysetPagination
 
 class ShareThoughtsView(APIView):
     permission_classes = [IsAuthenticated]  # only logged-in users can post/get
 
     def get(self, request):
-        thoughts = ShareThoughts.objects.select_related('user').only('id', 'thoughts', 'created_at', 'user__username').order_by('-created_at')
+        paginator = KeysetPagination()
+        thoughts = paginator.paginate_queryset(
+            ShareThoughts.objects.select_related('user').only('id', 'thoughts', 'created_at', 'user__username'),
+            request,
+        )
         serializer = ShareThoughtsSerializer(thoughts, many=True)
         return ResponseHandler.success(
             message="Retrived successfully!",
-            data= serializer.data
+            data=paginator.get_paginated_payload(serializer.data)
         )
 
     def post(self, request):
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from core.pagination import EstimatedCountAdminMixin
 from .models import SubscriptionPlan, UserSubscription
 
 @admin.register(SubscriptionPlan)
@@ -10,7 +11,7 @@ class SubscriptionPlanAdmin(admin.ModelAdmin):
 
 
 @admin.register(UserSubscription)
-class UserSubscriptionAdmin(admin.ModelAdmin):
+class UserSubscriptionAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ("user", "plan", "active", "start_date", "end_date", "stripe_subscription_id")
     list_filter = ("active", "plan")
     search_fields = ("user__email", "stripe_subscription_id")
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscription', '0003_alter_usersubscription_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usersubscription',
+            index=models.Index(fields=['active', 'start_date', 'id'], name='subscriptio_active_d5c84b_idx'),
+        ),
+    ]
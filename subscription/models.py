@@ -44,6 +44,7 @@ class UserSubscription(models.Model):
         indexes = [
             models.Index(fields=["user", "active"]),
             models.Index(fields=["stripe_subscription_id"]),
+            models.Index(fields=["active", "start_date", "id"]),
         ]
         ordering = ["-start_date"]
 
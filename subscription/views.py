@@ -1,8 +1,10 @@
 import logging
 from django.db import transaction
+from django.db.models import Sum
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from rest_framework import status
+from rest_framework.exceptions import APIException
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
@@ -15,6 +17,8 @@ from .serializers import (
     UserSubscriptionSerializer, EarnListSerializer, SubscriptionPlanUpdateSerializer
 )
 from .services import StripeService
+from account import counters
+from core.pagination import KeysetPagination
 
 logger = logging.getLogger(__name__)
 
@@ -241,10 +245,14 @@ class StripeWebhookAPIView(APIView):
         stripe_customer_id = data.get("customer")
 
         # Deactivate any previous active subscription
-        UserSubscription.objects.filter(user_id=user_id, active=True).update(
+        # (queryset.update skips signals, so adjust the earnings counter here)
+        previous = UserSubscription.objects.filter(user_id=user_id, active=True)
+        previous_total = previous.aggregate(total=Sum("plan__price"))["total"]
+        previous.update(
             active=False,
             end_date=timezone.now()
         )
+        counters.apply_deltas({counters.TOTAL_EARNINGS: -counters.to_cents(previous_total)})
 
         # Create or update subscription
         sub, created = UserSubscription.objects.update_or_create(
@@ -289,10 +297,8 @@ class StripeWebhookAPIView(APIView):
 
 
 
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 20
-    page_size_query_param = "page_size"
-    max_page_size = 100
+class EarnListPagination(KeysetPagination):
+    ordering = ("-start_date", "-id")
 
 
 from rest_framework.permissions import IsAdminUser
@@ -307,12 +313,15 @@ class EarnListAPIView(APIView):
                 .order_by("-start_date")
             )
 
-            paginator = StandardResultsSetPagination()
+            paginator = EarnListPagination()
             page = paginator.paginate_queryset(qs, request)
 
             serializer = EarnListSerializer(page, many=True)
             return paginator.get_paginated_response(serializer.data)
 
+        except APIException:
+            # e.g. an invalid pagination cursor (404)
+            raise
         except Exception as e:
             logger.error(f"EarnList API error: {str(e)}")
             return Response(
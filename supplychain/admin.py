@@ -1,5 +1,8 @@
 # admin.py
 from django.contrib import admin
+from core.pagination import EstimatedCountAdminMixin
+from account.models import SearchToken
+from account.search import IndexedSearchAdminMixin
 from .models import Supplier, Resource, Task, Notification
 
 @admin.register(Supplier)
@@ -11,10 +14,12 @@ class ResourceAdmin(admin.ModelAdmin):
     list_display = ['name', 'role', 'email', 'phone_number', 'start_time', 'end_time']
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(IndexedSearchAdminMixin, EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ['customer_name', 'status', 'time', 'resource', 'materials_ordered']
+    search_fields = ['customer_name', 'phone_number', 'address']
+    search_kind = SearchToken.KIND_OFFER
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ['message', 'created_at', 'read']
     list_filter = ['read', 'created_at']
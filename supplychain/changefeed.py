@@ -0,0 +1,176 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from account.search import index_offer_rows
+from account.services import simple_stats
+
+from .models import FeedCursor, Notification, Task
+from .projections import SOURCE_FIELDS, project_rows
+
+logger = logging.getLogger(__name__)
+
+OFFERS_FEED = "offers"
+
+# handler(rows, since): rows are ``offers`` values (SOURCE_FIELDS) in
+# (updated_at, id) order; ``since`` is the updated_at the poll started
+# reading from (the watermark, or the overlap start before it), None on the
+# very first poll
+Handler = Callable[[List[dict], Optional[datetime]], None]
+
+_handlers: Dict[str, Handler] = {}
+
+# Rows already handed to the handlers inside the overlap window, per feed:
+# {offer id: updated_at}. Saves re-running handlers on rows the overlap
+# reads again; after a restart they run once more, which is harmless.
+_handled: Dict[str, Dict] = {}
+
+
+def register(name: str):
+    """Decorator adding an in-process handler to the offers feed."""
+    def decorator(func: Handler) -> Handler:
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def fetch_changes(after: tuple, until: datetime, limit: int, source=Task) -> List[dict]:
+    """
+    Up to ``limit`` rows past the ``(updated_at, id)`` position ``after``
+    (an id of None means past every row at that ``updated_at``).
+
+    A keyset range on the (updated_at, id) index, so the cost depends on
+    ``limit``, not on the size of ``offers``.
+    """
+    queryset = source.objects.filter(updated_at__lte=until)
+    updated_at, last_id = after
+    if updated_at is not None and last_id is None:
+        queryset = queryset.filter(updated_at__gt=updated_at)
+    elif updated_at is not None:
+        queryset = queryset.filter(updated_at__gte=updated_at).filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id)
+        )
+    return list(queryset.order_by("updated_at", "id").values(*SOURCE_FIELDS)[:limit])
+
+
+def poll(
+    name: str = OFFERS_FEED,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    handlers: Optional[Dict[str, Handler]] = None,
+    source=Task,
+) -> Dict[str, int]:
+    """
+    Hand every offer changed since the stored watermark to the handlers.
+
+    ``updated_at`` is stamped when a write starts, not when it commits, so a
+    slow transaction can commit a row older than the watermark. Each poll
+    therefore re-reads rows stamped within ``OFFER_FEED_OVERLAP_SECONDS`` of
+    now, even behind the watermark; rows already handled there are skipped,
+    late ones are handled. A transaction open longer than the overlap can
+    still be missed (the nightly ``sync_offer_summaries --full`` repairs the
+    projection).
+
+    Each batch runs in one transaction with the cursor row locked: handlers
+    run, then the watermark moves forward to the batch's last row. A failing
+    handler rolls the batch back, so handlers may see a batch again and must
+    be idempotent. ``source`` is the model read (benchmarks pass a scratch
+    copy of ``offers``). Returns ``{"rows": ..., "batches": ...}``.
+    """
+    batch_size = batch_size or settings.OFFER_FEED_BATCH_SIZE
+    handlers = _handlers if handlers is None else handlers
+    until = timezone.now() - timedelta(seconds=settings.OFFER_FEED_SETTLE_SECONDS)
+    cursor, _ = FeedCursor.objects.get_or_create(name=name)
+
+    # Only rows stamped within the overlap of now can still be committing;
+    # an older watermark is read from exactly where it stopped.
+    overlap_start = until - timedelta(seconds=settings.OFFER_FEED_OVERLAP_SECONDS)
+    if cursor.last_updated_at is None:
+        since, position = None, (None, None)
+    elif overlap_start < cursor.last_updated_at:
+        since, position = overlap_start, (overlap_start, None)
+    else:
+        since, position = cursor.last_updated_at, (cursor.last_updated_at, cursor.last_id)
+    handled = _handled.setdefault(name, {})
+    for offer_id in [offer_id for offer_id, updated_at in handled.items() if since is None or updated_at <= since]:
+        del handled[offer_id]
+
+    rows_seen = batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            cursor = FeedCursor.objects.select_for_update().get(name=name)
+            rows = fetch_changes(position, until, batch_size, source)
+            if not rows:
+                break
+            fresh = [row for row in rows if handled.get(row["id"]) != row["updated_at"]]
+            if fresh:
+                for handler_name, handler in handlers.items():
+                    try:
+                        handler(fresh, since)
+                    except Exception:
+                        logger.exception("Offer feed handler %s failed", handler_name)
+                        raise
+            last = (rows[-1]["updated_at"], rows[-1]["id"])
+            if cursor.last_updated_at is None or last > (cursor.last_updated_at, cursor.last_id):
+                cursor.last_updated_at, cursor.last_id = last
+            cursor.rows_processed += len(fresh)
+            cursor.polled_at = timezone.now()
+            cursor.save()
+        handled.update((row["id"], row["updated_at"]) for row in fresh)
+        position = last
+        rows_seen += len(fresh)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+    return {"rows": rows_seen, "batches": batches}
+
+
+def seek(name: str = OFFERS_FEED, to_end: bool = False, source=Task) -> FeedCursor:
+    """Move a cursor to the start of ``offers`` (replay everything) or past its newest row."""
+    cursor, _ = FeedCursor.objects.get_or_create(name=name)
+    newest = source.objects.order_by("-updated_at", "-id").values("updated_at", "id").first() if to_end else None
+    cursor.last_updated_at = newest["updated_at"] if newest else None
+    cursor.last_id = newest["id"] if newest else None
+    cursor.save(update_fields=["last_updated_at", "last_id"])
+    return cursor
+
+
+def _is_new(row: dict, since: Optional[datetime]) -> bool:
+    return since is not None and row["created_at"] > since
+
+
+# ---------------------------
+# Handlers
+# ---------------------------
+@register("notifications")
+def notify_new_offers(rows, since):
+    # The first poll replays the whole table; that history isn't news.
+    # One notification per offer, however often the overlap re-reads it.
+    Notification.objects.bulk_create(
+        [
+            Notification(offer_id=row["id"], message=f"New Task created for customer: {row['customer_name']}"[:255])
+            for row in rows if _is_new(row, since)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+@register("projections")
+def project_offers(rows, since):
+    project_rows(rows)
+
+
+@register("search")
+def index_offers(rows, since):
+    index_offer_rows(rows)
+
+
+@register("cache")
+def invalidate_offer_stats(rows, since):
+    if since is None or any(_is_new(row, since) for row in rows):
+        simple_stats.invalidate()
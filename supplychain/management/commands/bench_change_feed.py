@@ -0,0 +1,111 @@
+import json
+import time
+import uuid
+from datetime import timedelta
+
+from django.apps.registry import Apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, models
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from supplychain import changefeed
+from supplychain.models import FeedCursor, Task
+
+BENCH_FEED = "bench"
+BENCH_TABLE = "bench_change_feed_offers"
+
+
+def _scratch_model():
+    """A copy of ``Task`` on its own table, registered outside the project's app registry."""
+    attrs = {field.name: field.clone() for field in Task._meta.local_fields}
+    attrs["__module__"] = __name__
+    attrs["Meta"] = type("Meta", (), {
+        "app_label": "supplychain",
+        "db_table": BENCH_TABLE,
+        "apps": Apps(),
+        "indexes": [models.Index(fields=["updated_at", "id"], name=f"{BENCH_TABLE}_feed_idx")],
+    })
+    return type("BenchOffer", (models.Model,), attrs)
+
+
+def _rescan(model, seen):
+    """What consumers did before the feed: read the whole table, diff updated_at."""
+    changed = []
+    for row in model.objects.values_list("id", "updated_at").iterator(chunk_size=5000):
+        if seen.get(row[0]) != row[1]:
+            changed.append(row[0])
+            seen[row[0]] = row[1]
+    return changed
+
+
+class Command(BaseCommand):
+    help = (
+        "Grow a scratch copy of the offers table step by step and, at each size, change "
+        "a fixed number of rows and time one change-feed poll against a full-table "
+        "rescan. The poll should stay flat while the rescan grows with the table. The "
+        "real offers table, its consumers and the real feed cursor are never touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10000,50000,200000", help="Comma-separated table sizes.")
+        parser.add_argument("--changes", type=int, default=200, help="Rows changed before each poll.")
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+        changes = options["changes"]
+        # handlers are replaced by a counter
+        handled = []
+        handlers = {"count": lambda rows, since: handled.append(len(rows))}
+        model = _scratch_model()
+
+        if BENCH_TABLE in connection.introspection.table_names():
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        try:
+            seen = {}
+            self.stdout.write(f"{'rows':>9} {'feed ms':>9} {'queries':>8} {'rescan ms':>10}")
+            for size in sizes:
+                self._seed(model, size - model.objects.count())
+                changefeed.seek(BENCH_FEED, to_end=True, source=model)
+                _rescan(model, seen)
+
+                # changed rows must be older than the settle window to be picked up
+                stamp = timezone.now() - timedelta(seconds=settings.OFFER_FEED_SETTLE_SECONDS + 1)
+                sample = model.objects.order_by("?").values_list("id", flat=True)[:changes]
+                model.objects.filter(pk__in=list(sample)).update(updated_at=stamp, status="Accepted")
+
+                handled.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    changefeed.poll(BENCH_FEED, batch_size=changes, handlers=handlers, source=model)
+                    feed_ms = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                rescanned = _rescan(model, seen)
+                rescan_ms = (time.perf_counter() - start) * 1000
+
+                assert sum(handled) == changes == len(rescanned), (handled, len(rescanned))
+                self.stdout.write(f"{size:>9} {feed_ms:>9.1f} {len(queries):>8} {rescan_ms:>10.1f}")
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
+            FeedCursor.objects.filter(name=BENCH_FEED).delete()
+
+    def _seed(self, model, count):
+        base = timezone.now() - timedelta(days=30)
+        price = json.dumps({"Total": 1000})
+        for start in range(0, count, 5000):
+            model.objects.bulk_create([
+                model(
+                    id=uuid.uuid4(), customer_name="Bench Offer", phone_number="12345678",
+                    address="Bench street 1", task_description="bench", bill_of_materials="[]",
+                    time=base, resource="bench", status="Pending", price=price, user_id=0,
+                    materials_ordered=False, project_start=base.date(),
+                    created_at=base, updated_at=base + timedelta(microseconds=start + i),
+                )
+                for i in range(min(5000, count - start))
+            ])
@@ -0,0 +1,37 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from supplychain import changefeed
+
+
+class Command(BaseCommand):
+    help = (
+        "Poll the offers table for new and changed rows and hand them to the change "
+        "feed handlers (notifications, projection, search index, caches). Runs until "
+        "stopped unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain pending changes and exit.")
+        parser.add_argument("--interval", type=float, default=settings.OFFER_FEED_POLL_INTERVAL)
+        parser.add_argument("--batch-size", type=int, default=settings.OFFER_FEED_BATCH_SIZE)
+        seek = parser.add_mutually_exclusive_group()
+        seek.add_argument("--from-start", action="store_true", help="Reset the watermark and replay every offer.")
+        seek.add_argument("--from-now", action="store_true", help="Skip existing offers; only follow new changes.")
+
+    def handle(self, *args, **options):
+        if options["from_start"] or options["from_now"]:
+            cursor = changefeed.seek(to_end=options["from_now"])
+            self.stdout.write(f"Watermark set to {cursor.last_updated_at} / {cursor.last_id}")
+
+        while True:
+            close_old_connections()
+            result = changefeed.poll(batch_size=options["batch_size"])
+            if result["rows"]:
+                self.stdout.write(f"Handled {result['rows']} changed offers in {result['batches']} batches")
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
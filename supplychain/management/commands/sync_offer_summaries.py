@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from supplychain.projections import sync_offer_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Project new and changed offers into OfferSummary. The offers change feed "
+        "(poll_offer_changes) keeps it current; use --full to rebuild it and to drop "
+        "offers deleted by other writers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Re-project every offer and remove deleted ones.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        result = sync_offer_summaries(full=options["full"], batch_size=options["batch_size"])
+        self.stdout.write(f"Projected {result['projected']} offers, removed {result['removed']}")
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supplychain', '0002_notification_supplychain_created_93db81_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferSummary',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('user_id', models.BigIntegerField()),
+                ('customer_name', models.CharField(max_length=255)),
+                ('phone_number', models.CharField(max_length=50)),
+                ('address', models.TextField()),
+                ('task_description', models.TextField()),
+                ('resource', models.CharField(max_length=255)),
+                ('status', models.CharField(max_length=50)),
+                ('materials_ordered', models.BooleanField()),
+                ('time', models.DateTimeField()),
+                ('project_start', models.DateField()),
+                ('total_price', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('material_lines', models.PositiveIntegerField(default=0)),
+                ('price_json', models.TextField(default='{}')),
+                ('bill_of_materials_json', models.TextField(default='[]')),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('projected_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user_id', 'status', 'created_at'], name='offer_summary_user_status_idx'), models.Index(fields=['user_id', 'created_at'], name='offer_summary_user_created_idx'), models.Index(fields=['updated_at'], name='offer_summary_updated_idx')],
+            },
+        ),
+    ]
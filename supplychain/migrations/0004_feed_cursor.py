@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:57
+
+from django.db import migrations, models
+
+OFFERS_INDEX = "offers_updated_at_id_idx"
+
+
+def _concurrently(connection) -> str:
+    # A plain CREATE INDEX blocks writes to offers (owned by another service)
+    # for the whole build; PostgreSQL can build it without that lock, outside
+    # a transaction. A failed concurrent build leaves an INVALID index that
+    # IF NOT EXISTS would keep: drop it and migrate again.
+    return " CONCURRENTLY" if connection.vendor == "postgresql" else ""
+
+
+def create_offers_index(apps, schema_editor):
+    # offers is not managed by Django (it may be missing, e.g. in test
+    # databases); the change feed reads it in (updated_at, id) order
+    connection = schema_editor.connection
+    if "offers" in connection.introspection.table_names():
+        schema_editor.execute(
+            f"CREATE INDEX{_concurrently(connection)} IF NOT EXISTS {OFFERS_INDEX} ON offers (updated_at, id)"
+        )
+
+
+def drop_offers_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX{_concurrently(schema_editor.connection)} IF EXISTS {OFFERS_INDEX}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('supplychain', '0003_offer_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('last_id', models.UUIDField(blank=True, null=True)),
+                ('rows_processed', models.BigIntegerField(default=0)),
+                ('polled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(create_offers_index, drop_offers_index),
+    ]
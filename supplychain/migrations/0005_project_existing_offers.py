@@ -0,0 +1,91 @@
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations
+from django.db.models import Q
+
+# Frozen copy of supplychain.projections as of this migration
+COPIED_FIELDS = (
+    "user_id", "customer_name", "phone_number", "address", "task_description", "resource",
+    "status", "materials_ordered", "time", "project_start", "created_at", "updated_at",
+)
+SOURCE_FIELDS = ("id",) + COPIED_FIELDS + ("price", "bill_of_materials")
+BATCH_SIZE = 2000
+CENTS = Decimal("0.01")
+
+
+def _load(text, expected_type, default):
+    try:
+        value = json.loads(text)
+    except (TypeError, ValueError):
+        return default
+    return value if isinstance(value, expected_type) else default
+
+
+def _total(price):
+    value = price.get("Total", 0)
+    if isinstance(value, bool):
+        return Decimal(0)
+    try:
+        total = Decimal(str(value))
+    except InvalidOperation:
+        return Decimal(0)
+    return total.quantize(CENTS) if total.is_finite() else Decimal(0)
+
+
+def project_existing_offers(apps, schema_editor):
+    """Project every row already in ``offers``; the change feed keeps them current afterwards."""
+    # offers is not managed by Django and is missing e.g. in test databases
+    connection = schema_editor.connection
+    if "offers" not in connection.introspection.table_names():
+        return
+    Task = apps.get_model("supplychain", "Task")
+    OfferSummary = apps.get_model("supplychain", "OfferSummary")
+
+    rows = Task.objects.order_by("updated_at", "id").values(*SOURCE_FIELDS)
+    after = None
+    while True:
+        page = rows
+        if after is not None:
+            page = page.filter(updated_at__gte=after[0]).filter(
+                Q(updated_at__gt=after[0]) | Q(updated_at=after[0], id__gt=after[1])
+            )
+        batch = list(page[:BATCH_SIZE])
+        if not batch:
+            return
+        summaries = []
+        for row in batch:
+            price = _load(row["price"], dict, {})
+            materials = _load(row["bill_of_materials"], list, [])
+            summaries.append(OfferSummary(
+                id=row["id"],
+                **{field: row[field] for field in COPIED_FIELDS},
+                total_price=_total(price),
+                material_lines=len(materials),
+                price_json=json.dumps(price, separators=(",", ":")),
+                bill_of_materials_json=json.dumps(materials, separators=(",", ":")),
+            ))
+        OfferSummary.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=[
+                *COPIED_FIELDS, "total_price", "material_lines", "price_json",
+                "bill_of_materials_json", "projected_at",
+            ],
+        )
+        after = (batch[-1]["updated_at"], batch[-1]["id"])
+
+
+class Migration(migrations.Migration):
+    # each batch commits on its own, so a large offers table does not hold
+    # one long transaction
+    atomic = False
+
+    dependencies = [
+        ('supplychain', '0004_feed_cursor'),
+    ]
+
+    operations = [
+        migrations.RunPython(project_existing_offers, migrations.RunPython.noop),
+    ]
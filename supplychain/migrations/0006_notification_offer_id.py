@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supplychain', '0005_project_existing_offers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='offer_id',
+            field=models.UUIDField(blank=True, null=True, unique=True),
+        ),
+    ]
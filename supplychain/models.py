@@ -77,12 +77,70 @@ class Task(models.Model):
         managed = False
 
 
+class OfferSummary(models.Model):
+    """
+    Read model of ``offers`` (see ``supplychain.projections``).
+
+    ``price.Total`` and the material line count are parsed once when an offer
+    is projected, and the JSON documents are kept normalized so the API can
+    embed them without parsing.
+    """
+    id = models.UUIDField(primary_key=True, editable=False)  # same as Task.id
+    user_id = models.BigIntegerField()
+    customer_name = models.CharField(max_length=255)
+    phone_number = models.CharField(max_length=50)
+    address = models.TextField()
+    task_description = models.TextField()
+    resource = models.CharField(max_length=255)
+    status = models.CharField(max_length=50)
+    materials_ordered = models.BooleanField()
+    time = models.DateTimeField()
+    project_start = models.DateField()
+
+    total_price = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    material_lines = models.PositiveIntegerField(default=0)
+    price_json = models.TextField(default="{}")
+    bill_of_materials_json = models.TextField(default="[]")
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()  # of the source row
+    projected_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user_id", "status", "created_at"], name="offer_summary_user_status_idx"),
+            models.Index(fields=["user_id", "created_at"], name="offer_summary_user_created_idx"),
+            models.Index(fields=["updated_at"], name="offer_summary_updated_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.customer_name} ({self.status})"
+
+
+
+class FeedCursor(models.Model):
+    """Persisted position of a change feed: the (updated_at, id) of the last row handled."""
+    name = models.CharField(max_length=50, unique=True)
+    last_updated_at = models.DateTimeField(null=True, blank=True)
+    last_id = models.UUIDField(null=True, blank=True)
+    rows_processed = models.BigIntegerField(default=0)
+    polled_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_updated_at}"
+
 
 # Notification
 class Notification(models.Model):
+    offer_id = models.UUIDField(null=True, blank=True, unique=True)  # set for "new offer" notifications
     message = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+        ]
+
     def __str__(self):
         return self.message
@@ -0,0 +1,128 @@
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List
+
+from django.db.models import Max, Q
+
+from .models import OfferSummary, Task
+
+# Copied from ``offers`` unchanged
+COPIED_FIELDS = (
+    "user_id", "customer_name", "phone_number", "address", "task_description", "resource",
+    "status", "materials_ordered", "time", "project_start", "created_at", "updated_at",
+)
+SOURCE_FIELDS = ("id",) + COPIED_FIELDS + ("price", "bill_of_materials")
+UPDATE_FIELDS = COPIED_FIELDS + (
+    "total_price", "material_lines", "price_json", "bill_of_materials_json", "projected_at",
+)
+
+CENTS = Decimal("0.01")
+
+
+# ---------------------------
+# Parsing (once per offer version)
+# ---------------------------
+def _load(text, expected_type, default):
+    try:
+        value = json.loads(text)
+    except (TypeError, ValueError):
+        return default
+    return value if isinstance(value, expected_type) else default
+
+
+def _total(price: dict) -> Decimal:
+    value = price.get("Total", 0)
+    if isinstance(value, bool):
+        return Decimal(0)
+    try:
+        total = Decimal(str(value))
+    except InvalidOperation:
+        return Decimal(0)
+    return total.quantize(CENTS) if total.is_finite() else Decimal(0)
+
+
+def summarize(row: Dict) -> OfferSummary:
+    """Build the projection of one ``offers`` row (a ``values(*SOURCE_FIELDS)`` dict)."""
+    price = _load(row["price"], dict, {})
+    materials = _load(row["bill_of_materials"], list, [])
+    return OfferSummary(
+        id=row["id"],
+        **{field: row[field] for field in COPIED_FIELDS},
+        total_price=_total(price),
+        material_lines=len(materials),
+        price_json=json.dumps(price, separators=(",", ":")),
+        bill_of_materials_json=json.dumps(materials, separators=(",", ":")),
+    )
+
+
+# ---------------------------
+# Syncing
+# ---------------------------
+def project_rows(rows: Iterable[Dict], batch_size: int = 1000) -> List:
+    """Upsert the projections of ``rows``. Returns their ids."""
+    summaries = [summarize(row) for row in rows]
+    OfferSummary.objects.bulk_create(
+        summaries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=UPDATE_FIELDS,
+    )
+    return [summary.id for summary in summaries]
+
+
+def project_offers(offer_ids: Iterable) -> int:
+    """Re-project the given offers; ids no longer in ``offers`` are dropped."""
+    offer_ids = [str(pk) for pk in offer_ids]
+    projected = project_rows(Task.objects.filter(pk__in=offer_ids).values(*SOURCE_FIELDS))
+    gone = set(offer_ids) - {str(pk) for pk in projected}
+    if gone:
+        OfferSummary.objects.filter(pk__in=gone).delete()
+    return len(projected)
+
+
+def _batches(queryset, batch_size: int):
+    """``offers`` rows in (updated_at, id) order, one keyset query per batch."""
+    queryset = queryset.order_by("updated_at", "id").values(*SOURCE_FIELDS)
+    after = None
+    while True:
+        page = queryset
+        if after is not None:
+            page = page.filter(Q(updated_at__gt=after[0]) | Q(updated_at=after[0], id__gt=after[1]))
+        rows = list(page[:batch_size])
+        if not rows:
+            return
+        yield rows
+        after = (rows[-1]["updated_at"], rows[-1]["id"])
+
+
+def sync_offer_summaries(full: bool = False, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Bring ``OfferSummary`` up to date with ``offers``.
+
+    By default only rows updated since the newest projected ``updated_at``
+    are read. ``full`` re-projects every offer and also drops projections of
+    offers deleted from the source table, which an incremental pass can't see.
+    """
+    queryset = Task.objects.all()
+    if not full:
+        newest = OfferSummary.objects.aggregate(newest=Max("updated_at"))["newest"]
+        if newest is not None:
+            # >= rather than >: rows sharing the newest timestamp may have
+            # been written after the last pass
+            queryset = queryset.filter(updated_at__gte=newest)
+
+    projected = 0
+    seen = set()
+    for rows in _batches(queryset, batch_size):
+        ids = project_rows(rows, batch_size)
+        projected += len(ids)
+        if full:
+            seen.update(str(pk) for pk in ids)
+
+    removed = 0
+    if full:
+        stale = [pk for pk in OfferSummary.objects.values_list("pk", flat=True) if str(pk) not in seen]
+        for start in range(0, len(stale), batch_size):
+            removed += OfferSummary.objects.filter(pk__in=stale[start:start + batch_size]).delete()[0]
+    return {"projected": projected, "removed": removed}
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Supplier, Resource, Task, Notification
+from .models import Supplier, Resource, Task, Notification, OfferSummary
+from core.renderers import RawJSON
 
 
 class SupplierSerializer(serializers.ModelSerializer):
@@ -64,6 +65,29 @@ class TaskSerializer(serializers.ModelSerializer):
 
 
 
+class OfferSummarySerializer(serializers.ModelSerializer):
+    """TaskSerializer's payload from the projection; the stored JSON is embedded as-is."""
+    id = serializers.CharField()
+    user_id = serializers.CharField()
+    bill_of_materials = serializers.SerializerMethodField()
+    price = serializers.SerializerMethodField()
+
+    class Meta:
+        model = OfferSummary
+        fields = [
+            "id", "user_id", "customer_name", "phone_number", "address",
+            "task_description", "bill_of_materials", "time", "resource",
+            "status", "materials_ordered", "price", "total_price", "material_lines",
+            "project_start", "created_at", "updated_at"
+        ]
+
+    def get_bill_of_materials(self, obj):
+        return RawJSON(obj.bill_of_materials_json.encode())
+
+    def get_price(self, obj):
+        return RawJSON(obj.price_json.encode())
+
+
 # Notification
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
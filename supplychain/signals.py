@@ -1,7 +1,10 @@
 # signals.py
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Supplier, Resource, Task, Notification
+from account.models import SearchToken
+from account.search import remove
+from .models import Supplier, Resource, Task, Notification, OfferSummary
 
 @receiver(post_save, sender=Supplier)
 def notify_admin_supplier(sender, instance, created, **kwargs):
@@ -13,7 +16,11 @@ def notify_admin_resource(sender, instance, created, **kwargs):
     if created:
         Notification.objects.create(message=f"New Resource created: {instance.name}")
 
-@receiver(post_save, sender=Task)
-def notify_admin_task(sender, instance, created, **kwargs):
-    if created:
-        Notification.objects.create(message=f"New Task created for customer: {instance.customer_name}")
+# Offer inserts and updates (from any writer) reach notifications, the
+# projection and the search index through supplychain.changefeed; deletes
+# don't show up in the feed and are handled here
+@receiver(post_delete, sender=Task)
+def drop_task_projection(sender, instance, **kwargs):
+    OfferSummary.objects.filter(pk=instance.pk).delete()
+    offer_id = instance.pk
+    transaction.on_commit(lambda: remove(SearchToken.KIND_OFFER, [offer_id]))
@@ -1,3 +1,177 @@
-from django.test import TestCase
+import importlib
+import json
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from account.models import User
+from supplychain import changefeed
+from supplychain.management.commands.bench_change_feed import BENCH_TABLE, _scratch_model
+from supplychain.models import FeedCursor, Notification, OfferSummary, Task
+from supplychain.projections import sync_offer_summaries
+
+# migration modules start with a digit, so they can't be named in an import statement
+project_existing_offers_migration = importlib.import_module("supplychain.migrations.0005_project_existing_offers")
+
+
+class OffersTableTestCase(TestCase):
+    """``offers`` is not managed by Django, so test databases lack it; create it per class."""
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            editor.create_model(Task)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(Task)
+
+    @staticmethod
+    def make_offer(user_id, **values):
+        now = timezone.now()
+        fields = {
+            "id": uuid.uuid4(), "customer_name": "Customer", "phone_number": "12345678",
+            "address": "Main street 1", "task_description": "Roof", "bill_of_materials": "[]",
+            "time": now, "resource": "Crew", "status": "Pending", "price": json.dumps({"Total": 100}),
+            "user_id": user_id, "materials_ordered": False, "project_start": now.date(),
+            "created_at": now, "updated_at": now,
+        }
+        fields.update(values)
+        return Task.objects.create(**fields)
+
+
+class ProjectExistingOffersMigrationTests(OffersTableTestCase):
+    def test_existing_offers_are_projected(self):
+        offer = self.make_offer(1, price=json.dumps({"Total": "1234.5"}), bill_of_materials='[{"a": 1}, {"b": 2}]')
+        broken = self.make_offer(1, price="not json")
+
+        project_existing_offers_migration.project_existing_offers(apps, SimpleNamespace(connection=connection))
+
+        summary = OfferSummary.objects.get(pk=offer.pk)
+        self.assertEqual((str(summary.total_price), summary.material_lines), ("1234.50", 2))
+        self.assertEqual(OfferSummary.objects.get(pk=broken.pk).total_price, 0)
+
+
+class OfferEndpointScopingTests(OffersTableTestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="owner@example.com", password=None, full_name="Owner")
+        self.other = User.objects.create_user(email="other@example.com", password=None, full_name="Other")
+        self.mine = self.make_offer(self.owner.pk, customer_name="Mine", status="Accepted")
+        self.make_offer(self.owner.pk, customer_name="Mine too", created_at=timezone.now() - timedelta(days=1))
+        self.theirs = self.make_offer(self.other.pk, customer_name="Theirs", status="Accepted")
+        sync_offer_summaries(full=True)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_list_only_returns_own_offers(self):
+        response = self.client.get("/v1/supplychain/tasks/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task["customer_name"] for task in response.json()], ["Mine", "Mine too"])
+
+    def test_detail_of_another_users_offer_is_a_404(self):
+        self.assertEqual(self.client.get(f"/v1/supplychain/tasks/{self.mine.pk}/").status_code, 200)
+        self.assertEqual(self.client.get(f"/v1/supplychain/tasks/{self.theirs.pk}/").status_code, 404)
+        self.assertEqual(self.client.get("/v1/supplychain/tasks/not-a-uuid/").status_code, 404)
+
+    def test_status_totals_only_count_own_offers(self):
+        response = self.client.get("/v1/supplychain/task/status/", {"status": "Accepted"})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["total_offers"], float(body["total_price"])), (1, 100.0))
+        self.assertEqual(self.client.get("/v1/supplychain/task/status/", {"month": "13"}).status_code, 400)
+
+
+@override_settings(OFFER_FEED_SETTLE_SECONDS=0, OFFER_FEED_OVERLAP_SECONDS=300)
+class ChangeFeedTests(OffersTableTestCase):
+    def setUp(self):
+        changefeed._handled.clear()
+        self.addCleanup(changefeed._handled.clear)
+        self.calls = []
+        self.handlers = {
+            "record": lambda rows, since: self.calls.append(([row["id"] for row in rows], since)),
+            "notifications": changefeed.notify_new_offers,
+            "projections": changefeed.project_offers,
+        }
+
+    def poll(self):
+        self.calls.clear()
+        return changefeed.poll("test", batch_size=2, handlers=self.handlers)
+
+    def ago(self, **delta):
+        return timezone.now() - timedelta(**delta)
+
+    def test_first_poll_replays_everything_without_notifying(self):
+        offers = [self.make_offer(1, updated_at=self.ago(minutes=minutes)) for minutes in (30, 20, 10)]
+
+        self.assertEqual(self.poll(), {"rows": 3, "batches": 2})
+
+        self.assertEqual([pk for ids, _ in self.calls for pk in ids], [offer.pk for offer in offers])
+        self.assertEqual({since for _, since in self.calls}, {None})
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(OfferSummary.objects.count(), 3)
+        cursor = FeedCursor.objects.get(name="test")
+        self.assertEqual((cursor.last_id, cursor.rows_processed), (offers[-1].pk, 3))
+
+    def test_changed_and_new_offers_are_handled_once(self):
+        stamp = self.ago(minutes=20)
+        old = self.make_offer(1, updated_at=stamp, created_at=stamp)
+        self.poll()
+
+        Task.objects.filter(pk=old.pk).update(status="Accepted", updated_at=self.ago(seconds=30))
+        new = self.make_offer(1, customer_name="Fresh", updated_at=self.ago(seconds=20), created_at=self.ago(seconds=20))
+        self.assertEqual(self.poll()["rows"], 2)
+        self.assertEqual(OfferSummary.objects.get(pk=old.pk).status, "Accepted")
+        self.assertEqual(list(Notification.objects.values_list("offer_id", flat=True)), [new.pk])
+
+        # the overlap reads both again, but they were already handled
+        self.assertEqual(self.poll(), {"rows": 0, "batches": 1})
+        self.assertEqual(self.calls, [])
+
+    def test_late_commit_behind_the_watermark_is_picked_up(self):
+        self.make_offer(1, updated_at=self.ago(seconds=10))
+        self.poll()
+
+        # stamped before the watermark, committed after the last poll
+        late = self.make_offer(1, updated_at=self.ago(seconds=60), created_at=self.ago(seconds=60))
+        self.assertEqual(self.poll()["rows"], 1)
+        self.assertEqual(self.calls[0][0], [late.pk])
+        self.assertTrue(OfferSummary.objects.filter(pk=late.pk).exists())
+        self.assertEqual(Notification.objects.get().offer_id, late.pk)
+
+    def test_replay_after_restart_does_not_duplicate_notifications(self):
+        self.make_offer(1, updated_at=self.ago(minutes=20))
+        self.poll()
+        self.make_offer(1, updated_at=self.ago(seconds=20), created_at=self.ago(seconds=20))
+        self.poll()
+
+        changefeed._handled.clear()
+        self.assertEqual(self.poll()["rows"], 1)
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_old_watermark_is_not_re_read(self):
+        self.make_offer(1, updated_at=self.ago(days=1))
+        watermark = changefeed.seek("test", to_end=True).last_updated_at
+
+        self.assertEqual(self.poll()["rows"], 0)
+        offer = self.make_offer(1, updated_at=self.ago(hours=1))
+        self.assertEqual(self.poll()["rows"], 1)
+        self.assertEqual(self.calls, [([offer.pk], watermark)])
+
+    def test_bench_uses_a_scratch_table(self):
+        model = _scratch_model()
+        self.assertEqual(model._meta.db_table, BENCH_TABLE)
+        self.assertNotEqual(model._meta.db_table, Task._meta.db_table)
+        self.assertEqual(
+            {field.name for field in model._meta.local_fields},
+            {field.name for field in Task._meta.local_fields},
+        )
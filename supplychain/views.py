@@ -112,23 +112,27 @@ class ResourceDetailAPI(APIView):
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Task
-from .serializers import TaskSerializer
+import uuid
+from .models import OfferSummary
+from .serializers import OfferSummarySerializer
+
+# Offers are read from the OfferSummary projection (supplychain.projections),
+# scoped to the requesting user
 
 class TaskListAPIView(APIView):
     def get(self, request):
-        tasks = Task.objects.all()
-        serializer = TaskSerializer(tasks, many=True)
+        tasks = OfferSummary.objects.filter(user_id=request.user.pk).order_by("-created_at")
+        serializer = OfferSummarySerializer(tasks, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 class TaskDetailAPIView(APIView):
     def get(self, request, pk):
         try:
-            task = Task.objects.get(id=str(pk))  # Convert pk to string
-        except Task.DoesNotExist:
+            task = OfferSummary.objects.get(id=uuid.UUID(str(pk)), user_id=request.user.pk)
+        except (ValueError, OfferSummary.DoesNotExist):
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = TaskSerializer(task)
+        serializer = OfferSummarySerializer(task)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
 
@@ -191,13 +195,18 @@ import json
 #         })
 
 
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+from django.db.models import Count, Sum
 from django.utils import timezone
 from django.utils.dateparse import parse_date
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-import json
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
 
 class TaskByStatusView(APIView):
 
@@ -211,7 +220,7 @@ class TaskByStatusView(APIView):
         month = request.query_params.get("month")
         date_str = request.query_params.get("date")
 
-        tasks = Task.objects.all()
+        tasks = OfferSummary.objects.filter(user_id=request.user.pk)
 
         # -------------------------
         # Status filter
@@ -227,8 +236,11 @@ class TaskByStatusView(APIView):
         # -------------------------
         # Date-based filtering priority
         # date > period > year/month
+        # Dates become created_at ranges so the (user_id, status, created_at)
+        # index applies
         # -------------------------
         now = timezone.localdate()
+        start = end = None
 
         if date_str:
             parsed_date = parse_date(date_str)
@@ -237,7 +249,7 @@ class TaskByStatusView(APIView):
                     {"error": "Invalid date format. Use YYYY-MM-DD"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            tasks = tasks.filter(created_at__date=parsed_date)
+            start, end = parsed_date, parsed_date + timedelta(days=1)
 
         elif period:
             if period not in self.ALLOWED_PERIODS:
@@ -247,48 +259,53 @@ class TaskByStatusView(APIView):
                 )
 
             if period == "today":
-                tasks = tasks.filter(created_at__date=now)
+                start, end = now, now + timedelta(days=1)
 
             elif period == "week":
-                start_of_week = now - timedelta(days=now.weekday())
-                end_of_week = start_of_week + timedelta(days=6)
-                tasks = tasks.filter(
-                    created_at__date__range=(start_of_week, end_of_week)
-                )
+                start = now - timedelta(days=now.weekday())
+                end = start + timedelta(days=7)
 
             elif period == "month":
-                tasks = tasks.filter(
-                    created_at__year=now.year,
-                    created_at__month=now.month,
+                start = now.replace(day=1)
+                end = (start + timedelta(days=32)).replace(day=1)
+
+        elif year or month:
+            try:
+                year = int(year) if year else None
+                month = int(month) if month else None
+                if month is not None and not 1 <= month <= 12:
+                    raise ValueError(month)
+                if year and month:
+                    start = now.replace(year=year, month=month, day=1)
+                    end = (start + timedelta(days=32)).replace(day=1)
+                elif year:
+                    start = now.replace(year=year, month=1, day=1)
+                    end = start.replace(year=year + 1)
+                else:
+                    # that month of every year
+                    tasks = tasks.filter(created_at__month=month)
+            except ValueError:
+                return Response(
+                    {"error": "Invalid year or month"},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        else:
-            if year:
-                tasks = tasks.filter(created_at__year=int(year))
-            if month:
-                tasks = tasks.filter(created_at__month=int(month))
+        if start is not None:
+            tasks = tasks.filter(created_at__gte=_day_start(start), created_at__lt=_day_start(end))
 
         # -------------------------
         # Serialize
         # -------------------------
-        serializer = TaskSerializer(tasks, many=True)
-
-        # -------------------------
-        # Total price calculation
-        # -------------------------
-        total_price = 0
-        for task in tasks.only("price"):
-            try:
-                total_price += json.loads(task.price).get("Total", 0)
-            except (TypeError, ValueError):
-                continue
+        tasks = tasks.order_by("-created_at")
+        serializer = OfferSummarySerializer(tasks, many=True)
+        totals = tasks.aggregate(total_offers=Count("id"), total_price=Sum("total_price"))
 
         return Response(
             {
                 "status": status_filter or "All",
                 "period": period,
-                "total_offers": tasks.count(),
-                "total_price": total_price,
+                "total_offers": totals["total_offers"],
+                "total_price": totals["total_price"] or 0,
                 "tasks": serializer.data,
             },
             status=status.HTTP_200_OK,
@@ -301,8 +318,11 @@ from rest_framework.response import Response
 from .models import Notification
 from .serializers import NotificationSerializer
 
+from core.pagination import KeysetPagination
+
 class NotificationListView(APIView):
     def get(self, request):
-        notifications = Notification.objects.all().order_by('-created_at')
+        paginator = KeysetPagination()
+        notifications = paginator.paginate_queryset(Notification.objects.all(), request)
         serializer = NotificationSerializer(notifications, many=True)
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)